@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from auth import auth_handler, crud as auth_crud
 from database import models as db_models
 from database.database_setup import SessionLocal
-from services import bibliometric_service, bibliometric_schemas as b_schemas # Aliased to avoid conflict
+from services import bibliometric_service, bibliometric_crud, bibliometric_timeseries, bibliometric_schemas as b_schemas # Aliased to avoid conflict
 from config import OPENALEX_POLITE_EMAIL
 
 bibliometric_router = APIRouter(prefix="/api/bibliometrics", tags=["Bibliometrics"])
@@ -54,3 +54,38 @@ async def get_my_bibliometric_summary(
     # The summary_model is an SQLAlchemy model instance.
     # Pydantic's from_attributes (orm_mode) will handle the conversion.
     return summary_model
+
+@bibliometric_router.get("/researchers/{researcher_id}/timeseries", response_model=b_schemas.BibliometricTimeSeriesPublic)
+async def get_researcher_bibliometric_timeseries(
+    researcher_id: int,
+    db: Session = Depends(get_db),
+    current_user: db_models.User = Depends(auth_handler.get_current_active_user)
+):
+    # Served from the stored arrays; they are only built here the first time a researcher's series is asked for
+    timeseries = bibliometric_crud.get_bibliometric_timeseries(db, researcher_id)
+    if timeseries is None:
+        researcher = auth_crud.get_researcher_by_id(db, researcher_id=researcher_id)
+        if not researcher:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Researcher profile with ID {researcher_id} not found."
+            )
+        if not researcher.openalex_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="OpenAlex ID not set for this researcher profile. Cannot generate bibliometric time series."
+            )
+        timeseries = await bibliometric_service.generate_researcher_bibliometric_timeseries(
+            db=db, researcher=researcher, openalex_email=OPENALEX_POLITE_EMAIL
+        )
+        if not timeseries:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Could not generate bibliometric time series for the researcher."
+            )
+
+    return {
+        'researcher_id': timeseries.researcher_id,
+        'generated_at': timeseries.generated_at,
+        **bibliometric_timeseries.series_from_row(timeseries),
+    }
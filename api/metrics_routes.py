@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services import cache_crud, metrics
+
+metrics_router = APIRouter(tags=["Monitoring"])
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Cache and OpenAlex client metrics of this process, in the Prometheus text format.
+    """
+    metrics.memory_cache_bytes.set(cache_crud.memory_cache.total_bytes)
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,43 @@
+# Time to compute bibliometric indicators for a department of researchers: the per-researcher
+# functions in services/bibliometric_utils.py versus one batch (services/bibliometric_batch.py).
+# Run from the repository root:
+#
+#   python -m benchmarks.bench_batch_metrics --researchers 5000 --works 200
+import argparse
+import random
+import time
+
+from services import bibliometric_batch, bibliometric_utils
+
+def make_department(researchers: int, works: int, seed: int = 7) -> list[list[int]]:
+    rng = random.Random(seed)
+    # Long-tailed citation counts and varying list lengths, roughly as in OpenAlex
+    return [
+        [int(rng.paretovariate(1.2)) - 1 for _ in range(rng.randint(1, 2 * works))]
+        for _ in range(researchers)
+    ]
+
+def measure(label: str, compute, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        compute()
+        timings.append(time.perf_counter() - started)
+    print(f"{label:<40} best {min(timings) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-researcher vs batch bibliometric indicators.")
+    parser.add_argument("--researchers", type=int, default=5000)
+    parser.add_argument("--works", type=int, default=200, help="Mean works per researcher")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    department = make_department(args.researchers, args.works)
+    print(f"{args.researchers} researchers, {sum(map(len, department))} works")
+    measure("per researcher (h, i10, total)", lambda: [
+        (bibliometric_utils.calculate_h_index(counts), bibliometric_utils.calculate_i10_index(counts), sum(counts))
+        for counts in department
+    ], args.repeats)
+    measure("batch, from lists (h, i10, g, m, total)", lambda: bibliometric_batch.indicators_per_researcher(department), args.repeats)
+    batch = bibliometric_batch.CitationBatch.from_lists(department)
+    measure("batch, kernel only", lambda: bibliometric_batch.compute_batch_metrics(batch), args.repeats)
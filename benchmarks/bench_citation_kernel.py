@@ -0,0 +1,57 @@
+# Single-researcher citation metrics on large inputs: the counting kernel in
+# services/bibliometric_utils.py versus sorting the list for each index. Run from the repository root:
+#
+#   python -m benchmarks.bench_citation_kernel --publications 100000
+import argparse
+import math
+import random
+import time
+
+from services.bibliometric_utils import calculate_citation_metrics
+
+def sort_based_metrics(citation_counts: list[int]) -> dict:
+    # The previous approach: sort once, then walk the sorted list for each index
+    ordered = sorted(citation_counts, reverse=True)
+    h_index = 0
+    for rank, count in enumerate(ordered, 1):
+        if count < rank:
+            break
+        h_index = rank
+    g_index, running_total = 0, 0
+    for rank, count in enumerate(ordered, 1):
+        running_total += count
+        if running_total < rank * rank:
+            break
+        g_index = rank
+    return {
+        'h_index': h_index,
+        'i10_index': sum(1 for count in citation_counts if count >= 10),
+        'g_index': g_index,
+        'e_index': math.sqrt(sum(ordered[:h_index]) - h_index * h_index),
+        'total_citations': sum(citation_counts),
+    }
+
+def measure(label: str, compute, citation_counts: list[int], repeats: int):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        metrics = compute(citation_counts)
+        timings.append(time.perf_counter() - started)
+    print(f"{label:<14} best {min(timings) * 1000:8.1f} ms   h={metrics['h_index']} g={metrics['g_index']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the counting citation kernel against sorting.")
+    parser.add_argument("--publications", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    inputs = {
+        "long-tailed": [int(rng.paretovariate(1.1)) - 1 for _ in range(args.publications)],
+        "uniform 0-1000": [rng.randint(0, 1000) for _ in range(args.publications)],
+    }
+    for name, citation_counts in inputs.items():
+        assert calculate_citation_metrics(citation_counts) == sort_based_metrics(citation_counts)
+        print(f"{args.publications} publications, {name}")
+        measure("sort-based", sort_based_metrics, citation_counts, args.repeats)
+        measure("counting", calculate_citation_metrics, citation_counts, args.repeats)
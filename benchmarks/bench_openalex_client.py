@@ -0,0 +1,153 @@
+# Requests/s of the OpenAlex HttpBackend against the local stand-in served over real sockets,
+# for a few connection-pool settings. Run from the repository root:
+#
+#   python -m benchmarks.bench_openalex_client --requests 2000 --concurrency 64 --latency-ms 5
+#
+# The stand-in is served over TLS by hypercorn with a throwaway self-signed certificate, so, as
+# against the live API, HTTP/2 is negotiated through ALPN when the client enables it. Each run
+# reports the protocol the responses actually came back with.
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from services.openalex_backends import HttpBackend, http2_available
+from services.openalex_standin import create_standin_app
+
+POOL_CONFIGURATIONS = [
+    ("defaults (OPENALEX_* config)", {}),
+    ("HTTP/1.1, no keep-alive", {"http2": False, "max_connections": 100, "max_keepalive_connections": 0}),
+    ("HTTP/1.1, pool 10", {"http2": False, "max_connections": 10, "max_keepalive_connections": 10}),
+    ("HTTP/1.1, pool 100 / ka 20", {"http2": False, "max_connections": 100, "max_keepalive_connections": 20}),
+    ("HTTP/1.1, pool 100 / ka 100", {"http2": False, "max_connections": 100, "max_keepalive_connections": 100}),
+    ("HTTP/2, pool 10", {"http2": True, "max_connections": 10, "max_keepalive_connections": 10}),
+    ("HTTP/2, pool 100 / ka 20", {"http2": True, "max_connections": 100, "max_keepalive_connections": 20}),
+]
+
+def write_self_signed_certificate(directory: str) -> tuple[str, str]:
+    """
+    Writes a certificate and key for 127.0.0.1, valid for a day; returns their paths.
+    """
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "openalex-standin")])
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=5)).not_valid_after(now + timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    certfile, keyfile = os.path.join(directory, "standin.crt"), os.path.join(directory, "standin.key")
+    with open(certfile, "wb") as certificate_file:
+        certificate_file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, "wb") as key_file:
+        key_file.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+    return certfile, keyfile
+
+def write_fixtures(fixtures_dir: str, works_count: int):
+    with open(os.path.join(fixtures_dir, "authors.jsonl"), "w") as authors_file:
+        authors_file.write(json.dumps({"id": "https://openalex.org/A1", "works_count": works_count}) + "\n")
+    with open(os.path.join(fixtures_dir, "works.jsonl"), "w") as works_file:
+        for i in range(works_count):
+            works_file.write(json.dumps({
+                "id": f"https://openalex.org/W{i}",
+                "cited_by_count": i % 97,
+                "authorships": [{"author": {"id": "https://openalex.org/A1"}}]
+            }) + "\n")
+
+def start_standin_server(fixtures_dir: str, latency_ms: float, certfile: str, keyfile: str) -> tuple[subprocess.Popen, int]:
+    """
+    Serves the stand-in over HTTPS from a separate process, so it does not compete with the client for the GIL.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen([
+        sys.executable, "-m", "services.openalex_standin",
+        "--fixtures-dir", fixtures_dir, "--port", str(port), "--latency-ms", str(latency_ms),
+        "--certfile", certfile, "--keyfile", keyfile
+    ])
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server, port
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Stand-in server did not start")
+
+async def run_configuration(
+    port: int, requests: int, concurrency: int, pool_settings: dict, ssl_context: ssl.SSLContext
+) -> tuple[float, Counter]:
+    """
+    Returns requests/s and how many responses came back over each HTTP version.
+    """
+    backend = HttpBackend(base_url=f"https://127.0.0.1:{port}", verify=ssl_context, **pool_settings)
+    semaphore = asyncio.Semaphore(concurrency)
+    http_versions = Counter()
+
+    async def one_request(i: int):
+        async with semaphore:
+            response = await backend.get("/works", params={
+                "filter": "author.id:A1", "per_page": 25, "page": i % 20 + 1, "select": "id,cited_by_count"
+            })
+            response.raise_for_status()
+            http_versions[response.http_version] += 1
+
+    try:
+        await one_request(0) # Warm-up
+        http_versions.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request(i) for i in range(requests)))
+        return requests / (time.perf_counter() - started), http_versions
+    finally:
+        await backend.aclose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OpenAlex client pool settings against the local stand-in.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--works", type=int, default=500)
+    args = parser.parse_args()
+
+    if not http2_available():
+        print("h2 is not installed (pip install httpx[http2]); the HTTP/2 rows will fall back to HTTP/1.1")
+    with tempfile.TemporaryDirectory() as fixtures_dir:
+        write_fixtures(fixtures_dir, args.works)
+        certfile, keyfile = write_self_signed_certificate(fixtures_dir)
+        ssl_context = ssl.create_default_context(cafile=certfile)
+        server, port = start_standin_server(fixtures_dir, args.latency_ms, certfile, keyfile)
+        try:
+            print(f"{args.requests} requests, concurrency {args.concurrency}, {args.latency_ms} ms server latency, TLS")
+            for label, pool_settings in POOL_CONFIGURATIONS:
+                rate, http_versions = asyncio.run(
+                    run_configuration(port, args.requests, args.concurrency, pool_settings, ssl_context)
+                )
+                protocols = ", ".join(sorted(http_versions))
+                print(f"  {label:<30} {rate:8.1f} req/s  ({protocols})")
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Decode time and peak memory of a large works list as plain dicts (json.loads) versus WorkRecords
+# (services/openalex_records.py), for full OpenAlex work objects. Run from the repository root:
+#
+#   python -m benchmarks.bench_work_records --works 10000
+#
+# The record path uses msgspec when it is installed and the json module otherwise.
+import argparse
+import json
+import time
+import tracemalloc
+
+from services import openalex_records
+
+def make_work(index: int) -> dict:
+    # Roughly the shape and size of a full OpenAlex work object
+    return {
+        "id": f"https://openalex.org/W{index}",
+        "doi": f"https://doi.org/10.1234/example.{index}",
+        "title": f"A study of topic {index}",
+        "publication_year": 2000 + index % 24,
+        "cited_by_count": index % 211,
+        "authorships": [
+            {
+                "author_position": "first" if position == 0 else "middle",
+                "author": {"id": f"https://openalex.org/A{index + position}", "display_name": f"Author {position}"},
+                "institutions": [{"id": "https://openalex.org/I1", "display_name": "Example University"}],
+            }
+            for position in range(4)
+        ],
+        "concepts": [
+            {"id": f"https://openalex.org/C{concept}", "display_name": f"Concept {concept}", "level": 1, "score": 0.5}
+            for concept in range(6)
+        ],
+        "counts_by_year": [{"year": 2024 - year, "cited_by_count": year} for year in range(5)],
+    }
+
+def measure(label: str, decode, payload_text: str, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        decode(payload_text)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    works = decode(payload_text)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = sum(work.cited_by_count if isinstance(work, openalex_records.WorkRecord) else work["cited_by_count"] for work in works)
+    print(f"{label:<32} best {min(timings) * 1000:8.1f} ms   peak {peak_bytes / 1e6:8.1f} MB   (citations {total})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark decoding a works list into dicts vs records.")
+    parser.add_argument("--works", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    payload_text = json.dumps([make_work(i) for i in range(args.works)])
+    print(f"{args.works} works, {len(payload_text) / 1e6:.1f} MB of JSON")
+    measure("json.loads -> dicts", json.loads, payload_text, args.repeats)
+    decoder_name = "msgspec" if openalex_records.msgspec is not None else "json fallback"
+    measure(f"decode_works ({decoder_name})", openalex_records.decode_works, payload_text, args.repeats)
@@ -4,6 +4,60 @@ import os
 OPENALEX_API_BASE_URL = "https://api.openalex.org"
 # It's good practice to use environment variables for sensitive or deployment-specific info
 OPENALEX_POLITE_EMAIL = os.getenv("OPENALEX_POLITE_EMAIL", "default.email@example.com") # Provide a default or ensure it's set in the env
+# Upper bound on how many pages of a paginated OpenAlex listing are requested at the same time
+OPENALEX_MAX_CONCURRENT_PAGES = int(os.getenv("OPENALEX_MAX_CONCURRENT_PAGES", "5"))
+# Number of author IDs combined into one OR-filter (openalex_id:A1|A2|...) request; OpenAlex allows up to 100
+OPENALEX_AUTHOR_BATCH_SIZE = int(os.getenv("OPENALEX_AUTHOR_BATCH_SIZE", "50"))
+# Process-wide request budget for OpenAlex (the polite pool allows 10 requests per second)
+OPENALEX_RATE_LIMIT_PER_SECOND = float(os.getenv("OPENALEX_RATE_LIMIT_PER_SECOND", "10"))
+OPENALEX_RATE_LIMIT_BURST = float(os.getenv("OPENALEX_RATE_LIMIT_BURST", "10"))
+# Retries for 429 / 502-504 responses and transport errors, with jittered exponential backoff
+OPENALEX_MAX_RETRIES = int(os.getenv("OPENALEX_MAX_RETRIES", "4"))
+OPENALEX_RETRY_BACKOFF_BASE_SECONDS = float(os.getenv("OPENALEX_RETRY_BACKOFF_BASE_SECONDS", "0.5"))
+OPENALEX_RETRY_BACKOFF_MAX_SECONDS = float(os.getenv("OPENALEX_RETRY_BACKOFF_MAX_SECONDS", "30"))
+# HTTP client tuning for OpenAlex. HTTP/2 multiplexes concurrent requests over one connection
+# and is used when the h2 package is installed (httpx[http2]).
+OPENALEX_HTTP2 = os.getenv("OPENALEX_HTTP2", "true").lower() in ("1", "true", "yes")
+OPENALEX_TIMEOUT_SECONDS = float(os.getenv("OPENALEX_TIMEOUT_SECONDS", "10"))
+OPENALEX_MAX_CONNECTIONS = int(os.getenv("OPENALEX_MAX_CONNECTIONS", "20"))
+OPENALEX_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENALEX_MAX_KEEPALIVE_CONNECTIONS", "10"))
+OPENALEX_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("OPENALEX_KEEPALIVE_EXPIRY_SECONDS", "30"))
+# Size budget of the in-process tier of parsed OpenAlex cache payloads (0 disables it)
+OPENALEX_MEMORY_CACHE_MAX_BYTES = int(os.getenv("OPENALEX_MEMORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Stale-while-revalidate: an expired cache entry is still served (and refreshed in the background)
+# until it is older than OPENALEX_MAX_STALENESS_SECONDS past its expiry
+OPENALEX_STALE_WHILE_REVALIDATE = os.getenv("OPENALEX_STALE_WHILE_REVALIDATE", "true").lower() in ("1", "true", "yes")
+OPENALEX_MAX_STALENESS_SECONDS = int(os.getenv("OPENALEX_MAX_STALENESS_SECONDS", str(7 * 86400)))
+# Freshness of cached OpenAlex data: OPENALEX_CACHE_TTL_SECONDS unless OPENALEX_CACHE_TTL_BY_TYPE overrides it
+# ("author_profile=604800,author_works:summary=43200"). With OPENALEX_ADAPTIVE_TTL the TTL grows for researchers
+# whose data keeps coming back unchanged and shrinks for those whose data keeps changing (see services/ttl_policy.py)
+OPENALEX_CACHE_TTL_SECONDS = int(os.getenv("OPENALEX_CACHE_TTL_SECONDS", "86400"))
+OPENALEX_CACHE_TTL_BY_TYPE = os.getenv("OPENALEX_CACHE_TTL_BY_TYPE", "")
+OPENALEX_ADAPTIVE_TTL = os.getenv("OPENALEX_ADAPTIVE_TTL", "true").lower() in ("1", "true", "yes")
+OPENALEX_ADAPTIVE_TTL_MIN_SECONDS = int(os.getenv("OPENALEX_ADAPTIVE_TTL_MIN_SECONDS", "3600"))
+OPENALEX_ADAPTIVE_TTL_MAX_SECONDS = int(os.getenv("OPENALEX_ADAPTIVE_TTL_MAX_SECONDS", str(14 * 86400)))
+OPENALEX_ADAPTIVE_TTL_STABLE_AFTER = int(os.getenv("OPENALEX_ADAPTIVE_TTL_STABLE_AFTER", "2"))
+OPENALEX_ADAPTIVE_TTL_FACTOR = float(os.getenv("OPENALEX_ADAPTIVE_TTL_FACTOR", "2"))
+# Cache retention: the sweeper runs every OPENALEX_CACHE_SWEEP_INTERVAL_SECONDS (0 disables it) and deletes
+# entries expired for longer than the grace period (by default, as long as they may still be served stale).
+# With a non-zero OPENALEX_CACHE_MAX_BYTES it also evicts least recently accessed entries beyond that size.
+OPENALEX_CACHE_SWEEP_INTERVAL_SECONDS = int(os.getenv("OPENALEX_CACHE_SWEEP_INTERVAL_SECONDS", "3600"))
+OPENALEX_CACHE_SWEEP_GRACE_SECONDS = int(os.getenv("OPENALEX_CACHE_SWEEP_GRACE_SECONDS", str(OPENALEX_MAX_STALENESS_SECONDS)))
+OPENALEX_CACHE_SWEEP_BATCH_SIZE = int(os.getenv("OPENALEX_CACHE_SWEEP_BATCH_SIZE", "200"))
+OPENALEX_CACHE_MAX_BYTES = int(os.getenv("OPENALEX_CACHE_MAX_BYTES", "0"))
+# Cache warming: every OPENALEX_WARM_INTERVAL_SECONDS (0 disables it), one worker refreshes up to
+# OPENALEX_WARM_MAX_PER_PASS entries that expire within the horizon and were read within the access window
+OPENALEX_WARM_INTERVAL_SECONDS = int(os.getenv("OPENALEX_WARM_INTERVAL_SECONDS", "300"))
+OPENALEX_WARM_HORIZON_SECONDS = int(os.getenv("OPENALEX_WARM_HORIZON_SECONDS", "900"))
+OPENALEX_WARM_ACCESS_WINDOW_SECONDS = int(os.getenv("OPENALEX_WARM_ACCESS_WINDOW_SECONDS", str(2 * 86400)))
+OPENALEX_WARM_MAX_PER_PASS = int(os.getenv("OPENALEX_WARM_MAX_PER_PASS", "100"))
+# Where OpenAlex requests go: "live" (the real API), "record" (live, saving responses to the
+# cassette directory), "replay" (served from the cassette directory only) or "standin"
+# (the local fixture-backed app in services/openalex_standin.py)
+OPENALEX_BACKEND = os.getenv("OPENALEX_BACKEND", "live")
+OPENALEX_CASSETTE_DIR = os.getenv("OPENALEX_CASSETTE_DIR", "./openalex_cassettes")
+OPENALEX_STANDIN_FIXTURES_DIR = os.getenv("OPENALEX_STANDIN_FIXTURES_DIR", "./openalex_fixtures")
+OPENALEX_STANDIN_LATENCY_SECONDS = float(os.getenv("OPENALEX_STANDIN_LATENCY_SECONDS", "0"))
 
 # JWT Secret Key - loading from existing auth/security.py for consistency if needed elsewhere,
 # or can be defined directly here if preferred.
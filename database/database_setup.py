@@ -18,4 +18,6 @@ def init_db():
     # they will be registered properly on the metadata. Otherwise
     # you will have to import them first before calling init_db()
     from . import models # Import models from the same directory
+    from .migrations import run_migrations
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine) # Upgrade tables created by earlier versions in place
@@ -0,0 +1,139 @@
+from sqlalchemy import LargeBinary, inspect, text
+from sqlalchemy.engine import Engine
+
+# Rows rewritten per transaction when compressing legacy cache payloads
+MIGRATION_BATCH_SIZE = 200
+
+def _columns(engine: Engine, table_name: str) -> dict:
+    """
+    Maps column name to reflected SQLAlchemy type; empty if the table does not exist.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        return {}
+    return {column["name"]: column["type"] for column in inspector.get_columns(table_name)}
+
+def _add_missing_columns(engine: Engine, table_name: str, column_ddl: dict[str, str]):
+    """
+    Adds each column named in column_ddl (name -> type and constraints) that the table lacks.
+    """
+    columns = _columns(engine, table_name)
+    with engine.begin() as connection:
+        for name, ddl in column_ddl.items():
+            if name not in columns:
+                connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {ddl}"))
+
+def migrate_openalex_cache_compression(engine: Engine):
+    """
+    Brings openalex_data_cache rows written as plain JSON TEXT up to the compressed format:
+    adds the payload_codec column if missing, then compresses every "identity" row in place,
+    in small batches. Safe to run repeatedly; already-compressed rows are left alone.
+    """
+    columns = _columns(engine, "openalex_data_cache")
+    if not columns:
+        return # Table is created fresh by create_all with the current schema
+
+    from services.payload_codec import encode_payload
+
+    _add_missing_columns(engine, "openalex_data_cache", {"payload_codec": "VARCHAR NOT NULL DEFAULT 'identity'"})
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql" and not isinstance(columns["openalex_json_data"], LargeBinary):
+            # SQLite stores BLOBs in the existing TEXT column as-is; PostgreSQL needs the type changed
+            connection.execute(text(
+                "ALTER TABLE openalex_data_cache ALTER COLUMN openalex_json_data TYPE BYTEA "
+                "USING convert_to(openalex_json_data::text, 'UTF8')"
+            ))
+
+    last_id = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(text(
+                "SELECT id, openalex_json_data FROM openalex_data_cache "
+                "WHERE payload_codec = 'identity' AND id > :last_id ORDER BY id LIMIT :batch_size"
+            ), {"last_id": last_id, "batch_size": MIGRATION_BATCH_SIZE}).fetchall()
+            if not rows:
+                return
+            for row_id, stored in rows:
+                data, codec = encode_payload(stored)
+                connection.execute(text(
+                    "UPDATE openalex_data_cache SET openalex_json_data = :data, payload_codec = :codec WHERE id = :id"
+                ), {"data": data, "codec": codec, "id": row_id})
+            last_id = rows[-1][0]
+
+def migrate_openalex_cache_retention(engine: Engine):
+    """
+    Adds the payload_size and last_accessed_at columns used by the cache sweeper
+    and fills payload_size for rows written before it existed.
+    """
+    if not _columns(engine, "openalex_data_cache"):
+        return
+    _add_missing_columns(engine, "openalex_data_cache", {
+        "payload_size": "INTEGER",
+        "last_accessed_at": "TIMESTAMP",
+    })
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_openalex_data_cache_last_accessed_at ON openalex_data_cache (last_accessed_at)"
+        ))
+        connection.execute(text(
+            "UPDATE openalex_data_cache SET payload_size = length(openalex_json_data) WHERE payload_size IS NULL"
+        ))
+
+def migrate_openalex_work_sizes(engine: Engine):
+    """
+    Adds payload_size to the shared works, which the cache size budget counts, and fills it
+    for works written before it existed.
+    """
+    if not _columns(engine, "openalex_works"):
+        return
+    _add_missing_columns(engine, "openalex_works", {"payload_size": "INTEGER"})
+    with engine.begin() as connection:
+        connection.execute(text(
+            "UPDATE openalex_works SET payload_size = length(openalex_json_data) WHERE payload_size IS NULL"
+        ))
+
+def migrate_openalex_cache_ttl_tracking(engine: Engine):
+    """
+    Adds the payload_hash and refresh_streak columns used by the adaptive TTL policy.
+    Existing rows start without a hash, so their next refresh counts as a first fetch.
+    """
+    if not _columns(engine, "openalex_data_cache"):
+        return
+    _add_missing_columns(engine, "openalex_data_cache", {
+        "payload_hash": "VARCHAR",
+        "refresh_streak": "INTEGER NOT NULL DEFAULT 0",
+    })
+
+def migrate_bibliometric_summary_indicators(engine: Engine):
+    """
+    Adds the g_index, m_quotient and citation_index columns; existing summaries get them when next recomputed.
+    """
+    if not _columns(engine, "bibliometric_summaries"):
+        return
+    _add_missing_columns(engine, "bibliometric_summaries", {
+        "g_index": "INTEGER",
+        "m_quotient": "FLOAT",
+        "citation_index": "BYTEA" if engine.dialect.name == "postgresql" else "BLOB",
+    })
+
+def enable_sqlite_incremental_vacuum(engine: Engine):
+    """
+    Switches a SQLite database to auto_vacuum=INCREMENTAL so the cache sweeper can hand freed
+    pages back to the file system with PRAGMA incremental_vacuum. An existing database needs
+    one full VACUUM for the mode change to take effect; that happens once, here.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if connection.execute(text("PRAGMA auto_vacuum")).scalar() == 2: # 2 = INCREMENTAL
+            return
+        connection.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        connection.execute(text("VACUUM"))
+
+def run_migrations(engine: Engine):
+    migrate_openalex_cache_compression(engine)
+    migrate_openalex_cache_retention(engine)
+    migrate_openalex_work_sizes(engine)
+    migrate_openalex_cache_ttl_tracking(engine)
+    migrate_bibliometric_summary_indicators(engine)
+    enable_sqlite_incremental_vacuum(engine)
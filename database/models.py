@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, LargeBinary, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database_setup import Base
@@ -29,6 +29,7 @@ class Researcher(Base):
     user = relationship("User", back_populates="researcher")
     caches = relationship("OpenAlexDataCache", back_populates="researcher_profile", cascade="all, delete-orphan")
     summary = relationship("BibliometricSummary", back_populates="researcher", uselist=False, cascade="all, delete-orphan") # Added this line
+    timeseries = relationship("BibliometricTimeSeries", back_populates="researcher", uselist=False, cascade="all, delete-orphan")
 
     __table_args__ = (UniqueConstraint('user_id', name='_user_researcher_uc'),)
 
@@ -37,15 +38,40 @@ class OpenAlexDataCache(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     researcher_id = Column(Integer, ForeignKey("researchers.id"), nullable=False)
-    data_type = Column(String, nullable=False) # E.g., "author_profile", "author_works"
-    openalex_json_data = Column(String, nullable=False) # Storing the JSON response as TEXT
+    data_type = Column(String, nullable=False) # E.g., "author_profile", "author_works" (lists of openalex_works IDs)
+    openalex_json_data = Column(LargeBinary, nullable=False) # JSON response, compressed as named by payload_codec
+    payload_codec = Column(String, nullable=False, default="identity", server_default="identity") # See services/payload_codec.py
     fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
+    payload_size = Column(Integer, nullable=True) # Stored (compressed) size in bytes, for the cache size budget
+    last_accessed_at = Column(DateTime(timezone=True), nullable=True, index=True) # Last read, coarse; NULL until first read. See cache_crud.touch_cache_entries
+    payload_hash = Column(String, nullable=True) # Hash of the data as fetched (for works lists, of the works themselves)
+    refresh_streak = Column(Integer, nullable=False, default=0, server_default="0") # See ttl_policy.next_refresh_streak
 
     researcher_profile = relationship("Researcher", back_populates="caches")
 
     __table_args__ = (UniqueConstraint('researcher_id', 'data_type', name='uq_researcher_data_type'),)
 
+class OpenAlexWork(Base):
+    __tablename__ = "openalex_works"
+
+    id = Column(Integer, primary_key=True, index=True)
+    work_id = Column(String, nullable=False) # OpenAlex work ID as returned, e.g. "https://openalex.org/W123"
+    projection = Column(String, nullable=False) # "full", or the PROJECTION_PROFILES entry the work was fetched with
+    openalex_json_data = Column(LargeBinary, nullable=False) # Work object, compressed as named by payload_codec
+    payload_codec = Column(String, nullable=False, default="identity", server_default="identity")
+    payload_size = Column(Integer, nullable=True) # Stored (compressed) size in bytes, for the cache size budget
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (UniqueConstraint('work_id', 'projection', name='uq_work_projection'),)
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True) # The background job the lease is for, e.g. "cache_warming"
+    holder = Column(String, nullable=False) # Process currently allowed to run it
+    expires_at = Column(DateTime(timezone=True), nullable=False) # Others may take over after this
+
 class BibliometricSummary(Base):
     __tablename__ = "bibliometric_summaries"
 
@@ -53,6 +79,9 @@ class BibliometricSummary(Base):
     researcher_id = Column(Integer, ForeignKey("researchers.id"), unique=True, nullable=False, index=True)
     h_index = Column(Integer, nullable=True) # Nullable if calculation is not possible
     i10_index = Column(Integer, nullable=True)
+    g_index = Column(Integer, nullable=True)
+    m_quotient = Column(Float, nullable=True) # h-index per career year; null when the first publication year is unknown
+    citation_index = Column(LargeBinary, nullable=True) # Serialized services.citation_index.CitationIndex of the summary works; built by the first incremental refresh
     total_publications = Column(Integer, nullable=True)
     total_citations = Column(Integer, nullable=True)
     summary_generated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -61,6 +90,20 @@ class BibliometricSummary(Base):
     researcher = relationship("Researcher", back_populates="summary") # Corrected back_populates
     # cache_entry = relationship("OpenAlexDataCache") # Relationship to the specific cache entry used
 
+class BibliometricTimeSeries(Base):
+    __tablename__ = "bibliometric_timeseries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    researcher_id = Column(Integer, ForeignKey("researchers.id"), unique=True, nullable=False, index=True)
+    first_year = Column(Integer, nullable=True) # Year of the first value in every series; null when there are none
+    works_by_year = Column(LargeBinary, nullable=False) # Packed arrays, one value per year (see services/bibliometric_timeseries.py)
+    citations_by_year = Column(LargeBinary, nullable=False)
+    h_index_by_year = Column(LargeBinary, nullable=False)
+    generated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    last_updated_from_cache_id = Column(Integer, ForeignKey("openalex_data_cache.id"), nullable=True)
+
+    researcher = relationship("Researcher", back_populates="timeseries")
+
 # New Models for Collaboration and Topics
 
 class ResearchTopic(Base):
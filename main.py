@@ -1,15 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
 # Importing database initialization function and router
 from database.database_setup import init_db
+from services import openalex_service, cache_maintenance, cache_warming, unit_of_work
+from config import OPENALEX_CACHE_SWEEP_INTERVAL_SECONDS, OPENALEX_WARM_INTERVAL_SECONDS
 from api import auth_routes # Assuming your router is named 'router' in auth_routes.py
 
-app = FastAPI()
-
-# Event handler for application startup
-@app.on_event("startup")
-async def startup_event():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     init_db() # Create database tables
+    await openalex_service.open_client() # Pooled OpenAlex connections for the app's lifetime
+    background_tasks = []
+    if OPENALEX_CACHE_SWEEP_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(cache_maintenance.run_periodic_sweeper())) # Deletes expired cache rows
+    if OPENALEX_WARM_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(cache_warming.run_warming_scheduler())) # Refreshes entries before expiry
+    yield
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await openalex_service.close_client()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def openalex_unit_of_work(request, call_next):
+    with unit_of_work.unit_of_work(): # Each cached OpenAlex payload is read and parsed once per request
+        return await call_next(request)
 
 # Include the authentication routes
 app.include_router(auth_routes.router, prefix="/api", tags=["Authentication"]) # Added a prefix for API versioning
@@ -34,6 +55,10 @@ app.include_router(collaboration_routes.collaboration_router) # Default prefix f
 from api import analysis_routes # New import
 app.include_router(analysis_routes.analysis_router) # Default prefix from the router itself (/api/analysis)
 
+# Importing and including the metrics route (Prometheus scrape target at /metrics)
+from api import metrics_routes
+app.include_router(metrics_routes.metrics_router)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Research Information System API"}
@@ -3,13 +3,15 @@ from sqlalchemy.orm import Session
 from database import models as db_models # Renamed to avoid conflict
 from services import (
     openalex_service, 
-    analysis_crud
+    analysis_crud,
+    unit_of_work
     # No direct need for openalex_schemas here unless we re-validate OpenAlex data
 )
 from config import OPENALEX_POLITE_EMAIL
 # Import the Pydantic models for structuring the result_data
 from .analysis_schemas import ConceptSummaryData, ResearcherConceptSummaryResult
 
+@unit_of_work.in_unit_of_work
 async def generate_researcher_concept_summary(
     db: Session, 
     researcher: db_models.Researcher, 
@@ -26,11 +28,11 @@ async def generate_researcher_concept_summary(
     email_for_api = openalex_email or OPENALEX_POLITE_EMAIL
 
     # 1. Fetch OpenAlex author profile data (this handles caching)
-    author_profile_dict = await openalex_service.fetch_and_cache_researcher_openalex_profile(
-        db=db, researcher=researcher, email=email_for_api
+    author_profile = await openalex_service.fetch_and_cache_researcher_openalex_profile(
+        db=db, researcher=researcher, email=email_for_api, projection="concepts" # An AuthorRecord; only x_concepts is used
     )
 
-    if not author_profile_dict or 'x_concepts' not in author_profile_dict:
+    if not author_profile or author_profile.x_concepts is None:
         print(f"No concepts found in OpenAlex profile for researcher {researcher.id}.")
         # Optionally, store an empty result or a specific marker if needed
         # For now, return None if no concepts to process
@@ -38,14 +40,14 @@ async def generate_researcher_concept_summary(
 
     # 2. Transform x_concepts data
     concepts_data_list = []
-    openalex_concepts = author_profile_dict.get('x_concepts', [])
+    openalex_concepts = author_profile.x_concepts
 
     for concept in openalex_concepts:
-        # Using .get() for safety, though OpenAlex schema is usually consistent
-        concept_id_url = concept.get('id')
-        display_name = concept.get('display_name')
-        level = concept.get('level')
-        score = concept.get('score')
+        # Fields missing from the OpenAlex payload are None on the record
+        concept_id_url = concept.id
+        display_name = concept.display_name
+        level = concept.level
+        score = concept.score
 
         if concept_id_url and display_name is not None and level is not None and score is not None:
             concepts_data_list.append(
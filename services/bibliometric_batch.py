@@ -0,0 +1,118 @@
+# Bibliometric indicators for many researchers at once. Citation counts of all researchers are held
+# in one ragged structure (a flat array plus offsets), and every indicator is computed with a few
+# vectorized passes over it instead of a Python loop per researcher.
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import chain
+
+import numpy as np
+
+from .bibliometric_utils import I10_THRESHOLD
+
+@dataclass(frozen=True)
+class CitationBatch:
+    """
+    Citation counts of many researchers: those of researcher i are values[offsets[i]:offsets[i + 1]].
+    """
+    values: np.ndarray # int64, concatenated per researcher
+    offsets: np.ndarray # int64, length len(self) + 1
+
+    @classmethod
+    def from_lists(cls, citation_lists: list[list[int | None]]) -> "CitationBatch":
+        """
+        Builds a batch from one list per researcher. Works without a citation count (None) are left
+        out and negative counts are read as zero, as in calculate_citation_metrics and CitationIndex.
+        """
+        citation_lists = [
+            counts if None not in counts else [citations for citations in counts if citations is not None]
+            for counts in citation_lists
+        ]
+        lengths = np.fromiter((len(counts) for counts in citation_lists), dtype=np.int64, count=len(citation_lists))
+        offsets = np.zeros(len(citation_lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.fromiter(chain.from_iterable(citation_lists), dtype=np.int64, count=int(offsets[-1]))
+        np.maximum(values, 0, out=values) # The sort key in compute_batch_metrics relies on values >= 0
+        return cls(values, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def segment_ids(self) -> np.ndarray:
+        """
+        Index of the researcher each value belongs to.
+        """
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths())
+
+def _segment_sums(segment_ids: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    return np.bincount(segment_ids, weights=weights, minlength=size).astype(np.int64)
+
+def compute_batch_metrics(
+    batch: CitationBatch,
+    first_publication_years: np.ndarray | list[int | None] = None,
+    current_year: int = None
+) -> dict[str, np.ndarray]:
+    """
+    Computes, for every researcher in the batch: h_index, i10_index, g_index (capped at the number
+    of publications), total_citations, publications and m_quotient (h-index per career year,
+    counting the first publication year; NaN where that year is unknown or not given).
+    Returns a mapping of indicator name to an array with one element per researcher.
+    """
+    size = len(batch)
+    segment_ids = batch.segment_ids()
+    values = np.maximum(batch.values, 0) # A negative count would fall into the previous researcher's key range
+    # Each researcher's citations in descending order, researchers kept in batch order: one sort of a
+    # combined key (researcher, then reversed count) is several times faster than a lexsort
+    span = int(values.max(initial=0)) + 1
+    keys = segment_ids * span + (span - 1 - values)
+    keys.sort()
+    ordered = span - 1 - keys % span
+    ranks = np.arange(len(ordered), dtype=np.int64) - batch.offsets[segment_ids] + 1
+
+    # Both conditions hold on a prefix of each researcher's descending list, so counting them gives the index
+    running_totals = np.cumsum(ordered)
+    segment_starts = np.concatenate(([0], running_totals))[batch.offsets[:-1]]
+    top_sums = running_totals - segment_starts[segment_ids]
+
+    metrics = {
+        "h_index": _segment_sums(segment_ids, ordered >= ranks, size),
+        "i10_index": _segment_sums(segment_ids, values >= I10_THRESHOLD, size),
+        "g_index": _segment_sums(segment_ids, top_sums >= ranks * ranks, size),
+        "total_citations": _segment_sums(segment_ids, values, size),
+        "publications": batch.lengths(),
+    }
+
+    m_quotient = np.full(size, np.nan)
+    if first_publication_years is not None:
+        first_years = np.array(
+            [np.nan if year is None else year for year in first_publication_years], dtype=np.float64
+        )
+        current_year = current_year or datetime.now(timezone.utc).year
+        career_years = np.maximum(current_year - first_years + 1, 1)
+        known = ~np.isnan(first_years)
+        m_quotient[known] = metrics["h_index"][known] / career_years[known]
+    metrics["m_quotient"] = m_quotient
+    return metrics
+
+def indicators_per_researcher(
+    citation_lists: list[list[int]],
+    first_publication_years: list[int | None] = None,
+    current_year: int = None
+) -> list[dict]:
+    """
+    compute_batch_metrics over plain lists, returned as one dict of plain Python values per researcher
+    (m_quotient rounded to three places, None when unknown), ready to store in a summary.
+    """
+    metrics = compute_batch_metrics(CitationBatch.from_lists(citation_lists), first_publication_years, current_year)
+    m_quotients = np.round(metrics["m_quotient"], 3).tolist()
+    columns = {name: metrics[name].tolist() for name in ("h_index", "i10_index", "g_index", "total_citations")}
+    return [
+        {
+            **{name: values[index] for name, values in columns.items()},
+            "m_quotient": None if math.isnan(m_quotients[index]) else m_quotients[index],
+        }
+        for index in range(len(citation_lists))
+    ]
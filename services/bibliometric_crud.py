@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from database import models # This points to database/models.py
 from datetime import datetime, timezone
+from services.bibliometric_timeseries import pack_series
 
 def get_bibliometric_summary(db: Session, researcher_id: int) -> models.BibliometricSummary | None:
     """
@@ -13,7 +14,7 @@ def get_bibliometric_summary(db: Session, researcher_id: int) -> models.Bibliome
 def create_or_update_bibliometric_summary(
     db: Session, 
     researcher_id: int, 
-    summary_data: dict, # Contains h_index, i10_index, total_publications, total_citations
+    summary_data: dict, # Contains h_index, i10_index, g_index, m_quotient, total_publications, total_citations; citation_index stays None until an incremental refresh builds it
     cache_id: int | None
 ) -> models.BibliometricSummary:
     """
@@ -25,6 +26,9 @@ def create_or_update_bibliometric_summary(
         # Update existing summary
         existing_summary.h_index = summary_data.get('h_index')
         existing_summary.i10_index = summary_data.get('i10_index')
+        existing_summary.g_index = summary_data.get('g_index')
+        existing_summary.m_quotient = summary_data.get('m_quotient')
+        existing_summary.citation_index = summary_data.get('citation_index')
         existing_summary.total_publications = summary_data.get('total_publications')
         existing_summary.total_citations = summary_data.get('total_citations')
         existing_summary.last_updated_from_cache_id = cache_id
@@ -36,6 +40,9 @@ def create_or_update_bibliometric_summary(
             researcher_id=researcher_id,
             h_index=summary_data.get('h_index'),
             i10_index=summary_data.get('i10_index'),
+            g_index=summary_data.get('g_index'),
+            m_quotient=summary_data.get('m_quotient'),
+            citation_index=summary_data.get('citation_index'),
             total_publications=summary_data.get('total_publications'),
             total_citations=summary_data.get('total_citations'),
             last_updated_from_cache_id=cache_id,
@@ -47,3 +54,67 @@ def create_or_update_bibliometric_summary(
     db.commit()
     db.refresh(summary_to_save)
     return summary_to_save
+
+def bulk_upsert_bibliometric_summaries(
+    db: Session,
+    summaries: dict[int, dict], # researcher_id -> summary_data (as for create_or_update_bibliometric_summary)
+    cache_ids: dict[int, int | None],
+    commit: bool = True
+) -> None:
+    """
+    Creates or updates summaries for many researchers with one lookup query and one commit.
+    """
+    researcher_ids = list(summaries)
+    existing_summaries = {
+        summary.researcher_id: summary
+        for summary in db.query(models.BibliometricSummary).filter(
+            models.BibliometricSummary.researcher_id.in_(researcher_ids)
+        )
+    } if researcher_ids else {}
+    generated_at = datetime.now(timezone.utc)
+
+    for researcher_id, summary_data in summaries.items():
+        summary = existing_summaries.get(researcher_id)
+        if summary is None:
+            summary = models.BibliometricSummary(researcher_id=researcher_id)
+            db.add(summary)
+        summary.h_index = summary_data.get('h_index')
+        summary.i10_index = summary_data.get('i10_index')
+        summary.g_index = summary_data.get('g_index')
+        summary.m_quotient = summary_data.get('m_quotient')
+        summary.citation_index = summary_data.get('citation_index')
+        summary.total_publications = summary_data.get('total_publications')
+        summary.total_citations = summary_data.get('total_citations')
+        summary.last_updated_from_cache_id = cache_ids.get(researcher_id)
+        summary.summary_generated_at = generated_at
+
+    if commit:
+        db.commit()
+
+def get_bibliometric_timeseries(db: Session, researcher_id: int) -> models.BibliometricTimeSeries | None:
+    return db.query(models.BibliometricTimeSeries).filter(
+        models.BibliometricTimeSeries.researcher_id == researcher_id
+    ).first()
+
+def create_or_update_bibliometric_timeseries(
+    db: Session,
+    researcher_id: int,
+    series: dict, # As returned by bibliometric_timeseries.build_timeseries
+    cache_id: int | None
+) -> models.BibliometricTimeSeries:
+    """
+    Stores a researcher's yearly series in their single time-series row, packed one array per series.
+    """
+    timeseries = get_bibliometric_timeseries(db, researcher_id)
+    if timeseries is None:
+        timeseries = models.BibliometricTimeSeries(researcher_id=researcher_id)
+        db.add(timeseries)
+    timeseries.first_year = series.get('first_year')
+    timeseries.works_by_year = pack_series(series.get('works_count', []))
+    timeseries.citations_by_year = pack_series(series.get('cited_by_count', []))
+    timeseries.h_index_by_year = pack_series(series.get('h_index', []))
+    timeseries.last_updated_from_cache_id = cache_id
+    timeseries.generated_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(timeseries)
+    return timeseries
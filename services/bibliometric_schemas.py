@@ -1,12 +1,14 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class BibliometricSummaryPublic(BaseModel):
     id: int
     researcher_id: int
     h_index: Optional[int] = None
     i10_index: Optional[int] = None
+    g_index: Optional[int] = None
+    m_quotient: Optional[float] = None
     total_publications: Optional[int] = None
     total_citations: Optional[int] = None
     summary_generated_at: datetime
@@ -14,3 +16,11 @@ class BibliometricSummaryPublic(BaseModel):
 
     class Config:
         from_attributes = True # For Pydantic V2 compatibility with ORM models
+
+class BibliometricTimeSeriesPublic(BaseModel):
+    researcher_id: int
+    years: List[int] = []
+    works_count: List[int] = [] # Works published per year
+    cited_by_count: List[int] = [] # Citations received per year
+    h_index: List[int] = [] # h-index at the end of each year
+    generated_at: datetime
@@ -1,9 +1,30 @@
+import asyncio
 import json
+import httpx
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from database import models as db_models # Renamed to avoid conflict
-from services import openalex_service, bibliometric_utils, bibliometric_crud, cache_crud
+from services import openalex_service, openalex_records, bibliometric_batch, bibliometric_crud, bibliometric_timeseries, cache_crud, unit_of_work
+from services.citation_index import CitationIndex
 from config import OPENALEX_POLITE_EMAIL
 
+def _indicators_by_researcher(researcher_ids: list[int], works_by_researcher: dict[int, list]) -> dict[int, dict]:
+    """
+    Computes h-index, i10-index, g-index and m-quotient (plus the works' own citation total) for
+    each researcher from their WorkRecords, in one batch. No citation index is built here: the
+    first incremental refresh builds it (see refresh_summary_incrementally), so batch recomputes
+    keep their vectorized speed.
+    """
+    citation_lists, first_years = [], []
+    for researcher_id in researcher_ids:
+        works = works_by_researcher[researcher_id]
+        citation_lists.append([work.cited_by_count for work in works if work.cited_by_count is not None])
+        years = [work.publication_year for work in works if work.publication_year]
+        first_years.append(min(years) if years else None)
+    indicators = bibliometric_batch.indicators_per_researcher(citation_lists, first_years)
+    return dict(zip(researcher_ids, indicators))
+
+@unit_of_work.in_unit_of_work
 async def generate_researcher_bibliometric_summary(
     db: Session, 
     researcher: db_models.Researcher, 
@@ -24,30 +45,34 @@ async def generate_researcher_bibliometric_summary(
     # We need the cache entry ID for linking the summary.
     
     # First, fetch the raw data (this function handles caching internally)
-    author_profile_dict = await openalex_service.fetch_and_cache_researcher_openalex_profile(
-        db=db, researcher=researcher, email=email_for_api
+    author_profile = await openalex_service.fetch_and_cache_researcher_openalex_profile(
+        db=db, researcher=researcher, email=email_for_api, projection="summary" # An AuthorRecord
     )
-    if not author_profile_dict:
+    if not author_profile:
         print(f"Could not fetch OpenAlex profile for researcher {researcher.id} (OpenAlex ID: {researcher.openalex_id}).")
         return None
     
-    # Retrieve the cache entry that was just created/updated for the profile
-    profile_cache_entry = cache_crud.get_cached_openalex_data(db, researcher.id, "author_profile")
-    profile_cache_id = profile_cache_entry.id if profile_cache_entry else None
+    # ID of the cache entry the profile came from (possibly a stale one being refreshed);
+    # known to the unit of work without another query
+    profile_cache_id = cache_crud.get_cache_entry_id(
+        db, researcher.id, openalex_service.projected_data_type("author_profile", "summary")
+    )
 
 
     # 2. Fetch OpenAlex works data
     # Similar logic for works data
-    works_data_list = await openalex_service.fetch_and_cache_researcher_openalex_works(
-        db=db, researcher=researcher, email=email_for_api, max_pages=5 # Fetch more pages for better summary
+    works_records = await openalex_service.fetch_and_cache_researcher_openalex_works(
+        db=db, researcher=researcher, email=email_for_api, projection="summary", # WorkRecords; citations and years
+        citation_head=True # Only the most cited works, which determine the indices exactly
     )
-    if works_data_list is None: # Could be an empty list for no works, None for error
+    if works_records is None: # Could be an empty list for no works, None for error
         print(f"Could not fetch OpenAlex works for researcher {researcher.id} (OpenAlex ID: {researcher.openalex_id}).")
         # Depending on requirements, we might proceed with only profile data or return None
         return None # For now, require works data for full summary
 
-    works_cache_entry = cache_crud.get_cached_openalex_data(db, researcher.id, "author_works")
-    works_cache_id = works_cache_entry.id if works_cache_entry else None
+    works_cache_id = cache_crud.get_cache_entry_id(
+        db, researcher.id, openalex_service.citation_head_data_type("summary")
+    )
 
     # Determine the most recent cache ID to link. Could be more sophisticated.
     # For simplicity, we can pick one, e.g., works_cache_id if available, else profile_cache_id.
@@ -57,26 +82,17 @@ async def generate_researcher_bibliometric_summary(
 
     # 3. Extract and Calculate Metrics
     # Total publications and citations from profile (as per OpenAlex definitions)
-    total_publications = author_profile_dict.get('works_count', 0)
-    total_citations_from_profile = author_profile_dict.get('cited_by_count', 0)
-
-    # Extract citation counts from each work for h-index and i10-index calculation
-    citation_counts_from_works = []
-    for work in works_data_list:
-        if isinstance(work, dict) and work.get('cited_by_count') is not None:
-            citation_counts_from_works.append(work['cited_by_count'])
-        # else: print(f"Warning: Work item format unexpected or missing cited_by_count: {work}")
+    total_publications = author_profile.works_count or 0
+    total_citations_from_profile = author_profile.cited_by_count or 0
 
-
-    h_index = bibliometric_utils.calculate_h_index(citation_counts_from_works)
-    i10_index = bibliometric_utils.calculate_i10_index(citation_counts_from_works)
+    # Citation-based indicators come from the works, through the same engine as department-wide recomputes
+    indicators = _indicators_by_researcher([researcher.id], {researcher.id: works_records})[researcher.id]
     
     # We can also sum citations from works if preferred over profile's cited_by_count
-    # total_citations_from_works = sum(citation_counts_from_works)
+    # total_citations_from_works = indicators['total_citations']
 
     summary_data = {
-        'h_index': h_index,
-        'i10_index': i10_index,
+        **indicators,
         'total_publications': total_publications,
         'total_citations': total_citations_from_profile, # Using profile's count
     }
@@ -90,3 +106,204 @@ async def generate_researcher_bibliometric_summary(
     )
     
     return db_summary
+
+@unit_of_work.in_unit_of_work
+async def generate_researcher_bibliometric_timeseries(
+    db: Session,
+    researcher: db_models.Researcher,
+    openalex_email: str = None
+) -> db_models.BibliometricTimeSeries | None:
+    """
+    Builds (or rebuilds) a researcher's yearly series from their OpenAlex counts_by_year and every
+    work's counts_by_year, and stores them in the researcher's time-series row.
+    """
+    if not researcher.openalex_id:
+        print(f"Researcher {researcher.id} has no OpenAlex ID. Cannot generate time series.")
+        return None
+
+    email_for_api = openalex_email or OPENALEX_POLITE_EMAIL
+    author_profile = await openalex_service.fetch_and_cache_researcher_openalex_profile(
+        db=db, researcher=researcher, email=email_for_api, projection="timeseries" # counts_by_year only
+    )
+    if not author_profile:
+        print(f"Could not fetch OpenAlex profile for the time series of researcher {researcher.id}.")
+        return None
+
+    # Every work may be in some past year's h-core; they are streamed a page at a time, never held at once
+    builder = bibliometric_timeseries.TimeSeriesBuilder(author_profile.counts_by_year)
+    try:
+        async for works_on_page in openalex_service.iter_author_works_from_openalex(
+            researcher.openalex_id, email_for_api, select=openalex_service.select_fields("timeseries", "works")
+        ):
+            builder.add_works(openalex_records.work_from_dict(work) for work in works_on_page)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        print(f"Could not fetch OpenAlex works for the time series of researcher {researcher.id}: {e}")
+        return None
+
+    profile_cache_id = cache_crud.get_cache_entry_id(
+        db, researcher.id, openalex_service.projected_data_type("author_profile", "timeseries")
+    )
+    return bibliometric_crud.create_or_update_bibliometric_timeseries(db, researcher.id, builder.series(), profile_cache_id)
+
+def recompute_bibliometric_summaries(db: Session, researcher_ids: list[int] = None) -> int:
+    """
+    Recomputes the summaries of many researchers at once (every researcher with cached works when
+    researcher_ids is None) from their cached citation heads and profiles, without calling OpenAlex.
+    Researchers whose cached works list references a work no longer stored are skipped.
+    Returns the number of summaries written.
+    """
+    works_type = openalex_service.citation_head_data_type("summary")
+    profile_type = openalex_service.projected_data_type("author_profile", "summary")
+    works_entries = cache_crud.get_openalex_cache_entries_bulk(db, works_type, researcher_ids)
+    payloads = {
+        entry.researcher_id: cache_crud.parse_payload_text(works_type, cache_crud.read_cached_payload_text(entry))
+        for entry in works_entries
+    }
+    # Co-authored works are resolved from the shared work store once for the whole batch
+    stored_works = cache_crud.get_works_by_id(db, cache_crud.work_projection(works_type), list({
+        work_id for payload in payloads.values() if isinstance(payload, dict) for work_id in payload["work_ids"]
+    }))
+    works_by_researcher = {}
+    for researcher_id, payload in payloads.items():
+        if not isinstance(payload, dict):
+            works_by_researcher[researcher_id] = payload # Listed inline by a row written before the work store
+        elif all(work_id in stored_works for work_id in payload["work_ids"]):
+            works_by_researcher[researcher_id] = [stored_works[work_id] for work_id in payload["work_ids"]]
+
+    researcher_ids = list(works_by_researcher)
+    profiles = {
+        entry.researcher_id: cache_crud.parse_payload_text(profile_type, cache_crud.read_cached_payload_text(entry))
+        for entry in cache_crud.get_openalex_cache_entries_bulk(db, profile_type, researcher_ids)
+    }
+    # The cached works are only the citation head, so without a profile the totals are unknown:
+    # earlier totals are kept, and a researcher summarized for the first time gets none
+    unprofiled_ids = [researcher_id for researcher_id in researcher_ids if researcher_id not in profiles]
+    previous_totals = {}
+    for start in range(0, len(unprofiled_ids), cache_crud.BULK_QUERY_CHUNK_SIZE):
+        for researcher_id, total_publications, total_citations in db.query(
+            db_models.BibliometricSummary.researcher_id,
+            db_models.BibliometricSummary.total_publications,
+            db_models.BibliometricSummary.total_citations
+        ).filter(db_models.BibliometricSummary.researcher_id.in_(unprofiled_ids[start:start + cache_crud.BULK_QUERY_CHUNK_SIZE])):
+            previous_totals[researcher_id] = (total_publications, total_citations)
+    summaries = {}
+    for researcher_id, indicators in _indicators_by_researcher(researcher_ids, works_by_researcher).items():
+        profile = profiles.get(researcher_id)
+        total_publications, total_citations = previous_totals.get(researcher_id, (None, None))
+        summaries[researcher_id] = {
+            **indicators,
+            'total_publications': profile.works_count if profile else total_publications,
+            'total_citations': profile.cited_by_count if profile else total_citations,
+        }
+    bibliometric_crud.bulk_upsert_bibliometric_summaries(
+        db, summaries, {entry.researcher_id: entry.id for entry in works_entries}
+    )
+    return len(summaries)
+
+async def refresh_summary_incrementally(
+    db: Session,
+    researcher: db_models.Researcher,
+    openalex_email: str = None
+) -> str:
+    """
+    Brings a researcher's summary up to date with only the works OpenAlex changed since the summary
+    works were last synced: each changed citation count is applied to the stored citation index in
+    O(log n), and the works list is extended rather than rewritten. Changes are detected against the
+    counts the index itself was built with, since the shared work store may already hold a
+    co-author's newer copy. An index that is missing (or has no per-work counts) is built from the
+    cached works first; summaries whose cached works are gone are rebuilt in full instead.
+    Returns "unchanged", "updated", "rebuilt" or "failed".
+    """
+    if not researcher.openalex_id:
+        return "failed"
+    works_type = openalex_service.citation_head_data_type("summary")
+    projection = cache_crud.work_projection(works_type)
+    summary = bibliometric_crud.get_bibliometric_summary(db, researcher.id)
+    works_entry = cache_crud.get_openalex_cache_entry(db, researcher.id, works_type)
+    listed = works_entry and cache_crud.parse_payload_text(works_type, cache_crud.read_cached_payload_text(works_entry))
+    if summary is None or not isinstance(listed, dict):
+        rebuilt = await generate_researcher_bibliometric_summary(db, researcher, openalex_email)
+        return "rebuilt" if rebuilt else "failed"
+
+    index = CitationIndex.from_bytes(summary.citation_index) if summary.citation_index is not None else None
+    index_built = index is None or index.work_citations is None
+    if index_built:
+        listed_works = cache_crud.get_works(db, projection, listed["work_ids"])
+        if listed_works is None:
+            rebuilt = await generate_researcher_bibliometric_summary(db, researcher, openalex_email) # Stored copies were swept
+            return "rebuilt" if rebuilt else "failed"
+        index = CitationIndex.from_works(
+            [work.cited_by_count for work in listed_works],
+            [work.publication_year for work in listed_works],
+            [work.id for work in listed_works]
+        )
+
+    fetched_works = await openalex_service.get_author_works_updated_since(
+        researcher.openalex_id, works_entry.fetched_at, openalex_email or OPENALEX_POLITE_EMAIL,
+        select=openalex_service.select_fields("summary", "works")
+    )
+    if fetched_works is None:
+        return "failed"
+    fetched_works = list({work["id"]: work for work in fetched_works}.values())
+
+    index_changed = index_built
+    for work in fetched_works:
+        if index.update_work(work["id"], work.get("cited_by_count")):
+            index_changed = True
+        index.note_publication_year(work.get("publication_year"))
+
+    # The shared copies (and this researcher's list) only need the works that differ from what is stored
+    stored_works = cache_crud.get_works_by_id(db, projection, [work["id"] for work in fetched_works])
+    listed_ids = set(listed["work_ids"])
+    changed_works = [
+        work for work in fetched_works
+        if work["id"] not in listed_ids or work["id"] not in stored_works
+        or (stored_works[work["id"]].cited_by_count, stored_works[work["id"]].publication_year)
+        != (work.get("cited_by_count"), work.get("publication_year"))
+    ]
+
+    cache_crud.record_incremental_works_sync(db, works_entry, changed_works, commit=False)
+    if index_changed:
+        summary.h_index = index.h_index()
+        summary.i10_index = index.i10_index
+        summary.g_index = index.g_index()
+        summary.m_quotient = index.m_quotient()
+        summary.citation_index = index.to_bytes()
+        summary.last_updated_from_cache_id = works_entry.id
+        summary.summary_generated_at = datetime.now(timezone.utc)
+    db.commit()
+    return "updated" if index_changed else "unchanged"
+
+async def refresh_summaries_incrementally(db: Session, researchers: list[db_models.Researcher] = None, openalex_email: str = None) -> dict:
+    """
+    Nightly job: refresh_summary_incrementally for each researcher (all with an OpenAlex ID by default).
+    Returns how many researchers ended in each outcome.
+    """
+    if researchers is None:
+        researchers = db.query(db_models.Researcher).filter(db_models.Researcher.openalex_id.isnot(None)).all()
+    outcomes = {"unchanged": 0, "updated": 0, "rebuilt": 0, "failed": 0}
+    for researcher in researchers:
+        try:
+            outcomes[await refresh_summary_incrementally(db, researcher, openalex_email)] += 1
+        except Exception as e:
+            db.rollback()
+            outcomes["failed"] += 1
+            print(f"Incremental summary refresh failed for researcher {researcher.id}: {e}")
+    return outcomes
+
+if __name__ == "__main__":
+    from database.database_setup import SessionLocal, init_db
+
+    async def main():
+        init_db()
+        await openalex_service.open_client()
+        db = SessionLocal()
+        try:
+            print(f"Incremental summary refresh: {await refresh_summaries_incrementally(db)}")
+            for researcher in db.query(db_models.Researcher).filter(db_models.Researcher.timeseries.has()).all():
+                await generate_researcher_bibliometric_timeseries(db, researcher) # Only series someone has asked for
+        finally:
+            db.close()
+            await openalex_service.close_client()
+
+    asyncio.run(main())
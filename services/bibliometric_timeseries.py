@@ -0,0 +1,109 @@
+# Yearly bibliometric series of one researcher: works published and citations received per year
+# (from the author's OpenAlex counts_by_year) and the h-index the researcher had at the end of each
+# year (from the works' own counts_by_year). A researcher's series are stored in a single
+# BibliometricTimeSeries row as packed integer arrays that share one span of years.
+from array import array
+from collections import Counter
+from typing import Iterable
+
+from .openalex_records import WorkRecord, YearCountRecord
+
+SERIES = ("works_count", "cited_by_count", "h_index")
+
+def pack_series(values: list[int]) -> bytes:
+    return array("q", values).tobytes() # 8 bytes per year, as in CitationIndex.to_bytes
+
+def unpack_series(data: bytes | None) -> list[int]:
+    values = array("q")
+    if data:
+        values.frombytes(data)
+    return values.tolist()
+
+def _counts_by_year(counts_by_year: list[YearCountRecord] | None, field: str) -> dict[int, int]:
+    return {counts.year: getattr(counts, field) or 0 for counts in counts_by_year or () if counts.year}
+
+def _h_index_of_tally(tally: Counter) -> int:
+    # Largest h with h works cited at least h times, walking the distinct counts from the top
+    h_index, works = 0, 0
+    for citations in sorted(tally, reverse=True):
+        works += tally[citations]
+        h_index = max(h_index, min(citations, works))
+        if works >= citations:
+            break
+    return h_index
+
+class TimeSeriesBuilder:
+    """
+    Builds the series over the years the author's counts_by_year covers (years OpenAlex leaves out
+    count as zero). Works are added page by page as they stream in; each year keeps only a tally of
+    citation counts, so memory does not grow with the number of works.
+    """
+    def __init__(self, author_counts_by_year: list[YearCountRecord] | None):
+        self.works_per_year = _counts_by_year(author_counts_by_year, "works_count")
+        self.citations_per_year = _counts_by_year(author_counts_by_year, "cited_by_count")
+        self.first_year = min(self.works_per_year, default=None)
+        self.last_year = max(self.works_per_year, default=None)
+        span = 0 if self.first_year is None else self.last_year - self.first_year + 1
+        self._citation_tallies = [Counter() for _ in range(span)] # Per year: citation count -> works
+
+    def add_works(self, works: Iterable[WorkRecord]):
+        """
+        Counts each work towards the h-index of every year from its publication on. A work's
+        citations up to the end of year Y are its cited_by_count less what it received after Y,
+        so this is exact for every year its counts_by_year window (the recent years) covers.
+        """
+        if self.first_year is None:
+            return
+        first_year, last_year = self.first_year, self.last_year
+        for work in works:
+            if not work.publication_year or work.cited_by_count is None or work.publication_year > last_year:
+                continue
+            received = _counts_by_year(work.counts_by_year, "cited_by_count")
+            citations = work.cited_by_count - sum(count for year, count in received.items() if year > last_year)
+            for year in range(last_year, max(first_year, work.publication_year) - 1, -1):
+                self._citation_tallies[year - first_year][max(citations, 0)] += 1
+                citations -= received.get(year, 0)
+
+    def series(self) -> dict:
+        """
+        Returns {"first_year": ..., "works_count": [...], "cited_by_count": [...], "h_index": [...]},
+        with first_year None and empty series when OpenAlex has no yearly counts.
+        """
+        if self.first_year is None:
+            return {"first_year": None, **{name: [] for name in SERIES}}
+        years = range(self.first_year, self.last_year + 1)
+        return {
+            "first_year": self.first_year,
+            "works_count": [self.works_per_year.get(year, 0) for year in years],
+            "cited_by_count": [self.citations_per_year.get(year, 0) for year in years],
+            "h_index": [_h_index_of_tally(tally) for tally in self._citation_tallies],
+        }
+
+def yearly_h_index(works: Iterable[WorkRecord], first_year: int, last_year: int) -> list[int]:
+    """
+    h-index at the end of each year from first_year to last_year, in one pass over the works.
+    """
+    builder = TimeSeriesBuilder([YearCountRecord(year=first_year), YearCountRecord(year=last_year)])
+    builder.add_works(works)
+    return builder.series()["h_index"]
+
+def build_timeseries(author_counts_by_year: list[YearCountRecord] | None, works: Iterable[WorkRecord]) -> dict:
+    """
+    Series of an author whose works are all at hand (see TimeSeriesBuilder.series).
+    """
+    builder = TimeSeriesBuilder(author_counts_by_year)
+    builder.add_works(works)
+    return builder.series()
+
+def series_from_row(timeseries) -> dict:
+    """
+    Unpacks a stored BibliometricTimeSeries row into {"years": [...], plus one list per SERIES name}.
+    """
+    series = {
+        "works_count": unpack_series(timeseries.works_by_year),
+        "cited_by_count": unpack_series(timeseries.citations_by_year),
+        "h_index": unpack_series(timeseries.h_index_by_year),
+    }
+    first_year = timeseries.first_year
+    years = [] if first_year is None else list(range(first_year, first_year + len(series["works_count"])))
+    return {"years": years, **series}
@@ -1,35 +1,86 @@
+import math
+from collections import Counter
 from typing import List
 
+# Citations a publication needs to count towards the i10-index
+I10_THRESHOLD = 10
+
+def calculate_citation_metrics(citation_counts: List[int]) -> dict:
+    """
+    Calculates h-index, i10-index, g-index, e-index and the citation total from a single counting
+    pass, without sorting the publications. Publications are bucketed by citation count, with every
+    count of n or more (n publications) in one top bucket: no index can exceed n, so the order
+    within that bucket never matters. The g-index is capped at n as well.
+    """
+    n = len(citation_counts)
+    if not n:
+        return {'h_index': 0, 'i10_index': 0, 'g_index': 0, 'e_index': 0.0, 'total_citations': 0}
+
+    # The one pass over the input is Counter's C-level tally; the rest only visits the distinct counts
+    buckets = {}
+    total_citations = 0
+    i10_index = 0
+    top_papers, top_citations = 0, 0 # The top bucket, whose counts differ
+    for count, publications in Counter(citation_counts).items():
+        count = max(count, 0) # A negative count is read as no citations
+        total_citations += count * publications
+        if count >= I10_THRESHOLD:
+            i10_index += publications
+        if count >= n:
+            top_papers += publications
+            top_citations += count * publications
+        else:
+            buckets[count] = buckets.get(count, 0) + publications
+
+    # Walk the buckets from the most cited down, tracking how many publications (and their citations)
+    # have more citations than the current bucket. Every publication in the top bucket has at least
+    # n >= g citations, so they all belong to the g-core.
+    papers, cited = top_papers, top_citations
+    g_index, g_done = papers, False
+    h_index, h_core_citations = None, 0
+    if papers >= n:
+        h_index, h_core_citations = n, total_citations
+    for citations in sorted(buckets.keys() | {0}, reverse=True):
+        if h_index is not None and g_done:
+            break
+        bucket = buckets.get(citations, 0)
+        if h_index is None:
+            if papers > citations:
+                # Between this bucket and the one above, `papers` publications have at least h = papers citations
+                h_index, h_core_citations = papers, cited
+            elif papers + bucket >= citations:
+                # The h-core is every publication above this bucket plus enough of this bucket to make h
+                h_index = citations
+                h_core_citations = cited + (citations - papers) * citations
+        if not g_done:
+            # Publications in this bucket all have exactly `citations`; the g condition holds on a prefix
+            for added in range(1, bucket + 1):
+                if cited + added * citations >= (papers + added) ** 2:
+                    g_index = papers + added
+                else:
+                    g_done = True
+                    break
+        papers += bucket
+        cited += bucket * citations
+
+    return {
+        'h_index': h_index,
+        'i10_index': i10_index,
+        'g_index': g_index,
+        'e_index': math.sqrt(h_core_citations - h_index * h_index),
+        'total_citations': total_citations,
+    }
+
 def calculate_h_index(citation_counts: List[int]) -> int:
     """
     Calculates the h-index from a list of citation counts.
+    The h-index is the largest number h such that h publications have at least h citations.
     """
-    if not citation_counts:
-        return 0
-    
-    # Sort citations in descending order
-    sorted_citations = sorted(citation_counts, reverse=True)
-    
-    h = 0
-    for i, count in enumerate(sorted_citations):
-        # The h-index is the largest number h such that h publications have at least h citations.
-        # i+1 is the number of publications with 'count' or more citations.
-        if count >= i + 1:
-            h = i + 1
-        else:
-            break # Since counts are sorted, further publications won't meet the criteria
-    return h
+    return calculate_citation_metrics(citation_counts)['h_index']
 
 def calculate_i10_index(citation_counts: List[int]) -> int:
     """
     Calculates the i10-index from a list of citation counts.
     The i10-index is the number of publications with at least 10 citations.
     """
-    if not citation_counts:
-        return 0
-    
-    i10_count = 0
-    for count in citation_counts:
-        if count >= 10:
-            i10_count += 1
-    return i10_count
+    return calculate_citation_metrics(citation_counts)['i10_index']
@@ -1,6 +1,60 @@
+import json
+import threading
+import time
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from database import models # This should correctly point to database/models.py
 from datetime import datetime, timedelta, timezone
+from config import (
+    OPENALEX_MEMORY_CACHE_MAX_BYTES,
+    OPENALEX_CACHE_TTL_SECONDS,
+    OPENALEX_CACHE_TTL_BY_TYPE,
+    OPENALEX_ADAPTIVE_TTL,
+    OPENALEX_ADAPTIVE_TTL_MIN_SECONDS,
+    OPENALEX_ADAPTIVE_TTL_MAX_SECONDS,
+    OPENALEX_ADAPTIVE_TTL_STABLE_AFTER,
+    OPENALEX_ADAPTIVE_TTL_FACTOR
+)
+from . import metrics, openalex_records, unit_of_work
+from .memory_cache import ParsedPayloadCache
+from .payload_codec import decode_payload, encode_payload
+from .ttl_policy import TTLPolicy, next_refresh_streak, parse_ttl_overrides, payload_hash as hash_payload
+
+# Keeps IN (...) lists well below SQLite's bound-parameter limit
+BULK_QUERY_CHUNK_SIZE = 500
+
+# last_accessed_at is only rewritten when older than this, so hot rows do not cost a write per read
+ACCESS_TOUCH_INTERVAL_SECONDS = 3600
+
+# Memory-tier hits touch an entry at most this often, tracked per process in _memory_hit_touches
+MEMORY_HIT_TOUCH_INTERVAL_SECONDS = 600
+
+# Ends the projection of a citation-head works list, which holds only a researcher's most cited
+# works (see openalex_service.citation_head_data_type); its works are shared with the projection's
+CITATION_HEAD_SUFFIX = "_head"
+
+# Parsed works are kept in the in-process tier for this long; writes from this process invalidate them at once
+WORK_MEMORY_TTL_SECONDS = 3600
+
+# In-process tier of parsed payloads keyed by (researcher_id, data_type), and of shared works keyed by
+# ("work", projection, work_id); see get_cached_openalex_payload and get_works
+memory_cache = ParsedPayloadCache(OPENALEX_MEMORY_CACHE_MAX_BYTES)
+
+# Freshness of entries stored without an explicit cache_duration_seconds
+ttl_policy = TTLPolicy(
+    OPENALEX_CACHE_TTL_SECONDS,
+    parse_ttl_overrides(OPENALEX_CACHE_TTL_BY_TYPE),
+    adaptive=OPENALEX_ADAPTIVE_TTL,
+    min_seconds=OPENALEX_ADAPTIVE_TTL_MIN_SECONDS,
+    max_seconds=OPENALEX_ADAPTIVE_TTL_MAX_SECONDS,
+    stable_after=OPENALEX_ADAPTIVE_TTL_STABLE_AFTER,
+    factor=OPENALEX_ADAPTIVE_TTL_FACTOR
+)
+
+# Cache entry ID -> time.monotonic() of the last access recorded for it by this process
+_memory_hit_touches: dict[int, float] = {}
+_memory_hit_touches_lock = threading.Lock()
 
 def get_cached_openalex_data(db: Session, researcher_id: int, data_type: str) -> models.OpenAlexDataCache | None:
     """
@@ -14,40 +68,517 @@ def get_cached_openalex_data(db: Session, researcher_id: int, data_type: str) ->
     ).first()
     return cache_entry
 
+def _as_utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes that are in UTC
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+def touch_cache_entries(db: Session, cache_entries: list[models.OpenAlexDataCache]):
+    """
+    Records a read of the given entries in last_accessed_at, which the cache sweeper uses to pick
+    eviction victims and the cache warmer to pick entries worth refreshing. Writes leave it alone,
+    so a refresh nobody reads does not keep an entry warm. Entries touched within
+    ACCESS_TOUCH_INTERVAL_SECONDS are skipped.
+    The update is best-effort and runs on its own connection, outside the session's transaction.
+    """
+    now = datetime.now(timezone.utc)
+    touch_before = now - timedelta(seconds=ACCESS_TOUCH_INTERVAL_SECONDS)
+    stale_ids = [
+        cache_entry.id for cache_entry in cache_entries
+        if cache_entry.last_accessed_at is None
+        or _as_utc(cache_entry.last_accessed_at) < touch_before
+    ]
+    _record_access(db, stale_ids, now)
+    with _memory_hit_touches_lock:
+        moment = time.monotonic()
+        _memory_hit_touches.update((cache_entry.id, moment) for cache_entry in cache_entries)
+
+def touch_memory_hits(db: Session, cache_entry_ids: list[int | None]):
+    """
+    Records a read of entries served from the in-process tier, which holds no row to compare
+    last_accessed_at against. Each entry is written at most once per MEMORY_HIT_TOUCH_INTERVAL_SECONDS
+    per process, so hot entries stay off the database on nearly every hit.
+    """
+    moment = time.monotonic()
+    with _memory_hit_touches_lock:
+        due_ids = [
+            cache_entry_id for cache_entry_id in cache_entry_ids
+            if cache_entry_id is not None
+            and moment - _memory_hit_touches.get(cache_entry_id, float("-inf")) >= MEMORY_HIT_TOUCH_INTERVAL_SECONDS
+        ]
+        if not due_ids:
+            return
+        if len(_memory_hit_touches) > 4 * len(memory_cache): # Forget entries the tier has long since dropped
+            for cache_entry_id, touched in list(_memory_hit_touches.items()):
+                if moment - touched >= MEMORY_HIT_TOUCH_INTERVAL_SECONDS:
+                    del _memory_hit_touches[cache_entry_id]
+        _memory_hit_touches.update((cache_entry_id, moment) for cache_entry_id in due_ids)
+    _record_access(db, due_ids, datetime.now(timezone.utc))
+
+def _record_access(db: Session, cache_entry_ids: list[int], now: datetime):
+    if not cache_entry_ids:
+        return
+    cache_table = models.OpenAlexDataCache.__table__
+    try:
+        with db.get_bind().engine.begin() as connection: # Engine, even when the session is bound to a Connection
+            for start in range(0, len(cache_entry_ids), BULK_QUERY_CHUNK_SIZE):
+                connection.execute(
+                    update(cache_table)
+                    .where(cache_table.c.id.in_(cache_entry_ids[start:start + BULK_QUERY_CHUNK_SIZE]))
+                    .values(last_accessed_at=now)
+                )
+    except OperationalError as e: # E.g. SQLite busy; a missed touch only makes eviction less precise
+        print(f"Could not record cache access times: {e}")
+
+def read_cached_payload_text(cache_entry: models.OpenAlexDataCache) -> str:
+    """
+    Returns the JSON text of a cache entry, decompressing it as named by its payload_codec.
+    """
+    return decode_payload(cache_entry.openalex_json_data, cache_entry.payload_codec)
+
+def is_work_list_data_type(data_type: str) -> bool:
+    return data_type.split(":")[0] == "author_works"
+
+def work_projection(data_type: str) -> str:
+    """
+    Projection under which the works of a work-list data type are stored:
+    "author_works" -> "full", "author_works:summary" and "author_works:summary_head" -> "summary".
+    """
+    return (data_type.partition(":")[2] or "full").removesuffix(CITATION_HEAD_SUFFIX)
+
+def get_works(db: Session, projection: str, work_ids: list[str]) -> list[dict] | None:
+    """
+    Returns the stored works with the given IDs, in order, from the in-process tier or the
+    openalex_works table: dicts for the "full" projection, WorkRecords for the others.
+    Returns None if any of them is missing from the store.
+    Parsed works are shared by every co-author's list, so callers must not modify them.
+    """
+    works = get_works_by_id(db, projection, work_ids)
+    if any(work_id not in works for work_id in work_ids):
+        return None
+    return [works[work_id] for work_id in work_ids]
+
+def get_works_by_id(db: Session, projection: str, work_ids: list[str]) -> dict[str, object]:
+    """
+    Returns the stored works among work_ids keyed by ID (see get_works); missing ones are left out.
+    """
+    works = {}
+    missing_ids = []
+    for work_id in dict.fromkeys(work_ids):
+        cached = memory_cache.get(("work", projection, work_id))
+        if cached is not None:
+            works[work_id] = cached[0]
+        else:
+            missing_ids.append(work_id)
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=WORK_MEMORY_TTL_SECONDS)
+    for start in range(0, len(missing_ids), BULK_QUERY_CHUNK_SIZE):
+        for stored_work in db.query(models.OpenAlexWork).filter(
+            models.OpenAlexWork.projection == projection,
+            models.OpenAlexWork.work_id.in_(missing_ids[start:start + BULK_QUERY_CHUNK_SIZE])
+        ):
+            work_text = decode_payload(stored_work.openalex_json_data, stored_work.payload_codec)
+            works[stored_work.work_id] = (
+                json.loads(work_text) if projection == "full" else openalex_records.decode_work(work_text)
+            )
+            memory_cache.put(("work", projection, stored_work.work_id), works[stored_work.work_id], len(work_text), expires_at)
+    return works
+
+def store_works(db: Session, projection: str, works: list[dict]) -> list[str]:
+    """
+    Upserts works into the shared openalex_works store without committing, and returns their IDs
+    in order. Every work must carry its "id". A work stored again replaces the previous copy
+    for every researcher whose list references it.
+    """
+    works_by_id = {work["id"]: work for work in works}
+    work_ids = list(works_by_id)
+    existing_works = {}
+    for start in range(0, len(work_ids), BULK_QUERY_CHUNK_SIZE):
+        for stored_work in db.query(models.OpenAlexWork).filter(
+            models.OpenAlexWork.projection == projection,
+            models.OpenAlexWork.work_id.in_(work_ids[start:start + BULK_QUERY_CHUNK_SIZE])
+        ):
+            existing_works[stored_work.work_id] = stored_work
+
+    fetched_at = datetime.now(timezone.utc)
+    for work_id, work in works_by_id.items():
+        memory_cache.invalidate(("work", projection, work_id))
+        stored_data, codec = encode_payload(json.dumps(work))
+        stored_work = existing_works.get(work_id)
+        if stored_work:
+            stored_work.openalex_json_data = stored_data
+            stored_work.payload_codec = codec
+            stored_work.payload_size = len(stored_data)
+            stored_work.fetched_at = fetched_at
+        else:
+            db.add(models.OpenAlexWork(
+                work_id=work_id, projection=projection, openalex_json_data=stored_data,
+                payload_codec=codec, payload_size=len(stored_data), fetched_at=fetched_at
+            ))
+    return [work["id"] for work in works]
+
+def parse_payload_text(data_type: str, payload_text: str) -> object:
+    """
+    Parses cached JSON text. Projected profiles are decoded straight into AuthorRecords;
+    work lists stay ID lists (see _resolve_payload); full payloads become plain dicts.
+    """
+    base_type, _, projection = data_type.partition(":")
+    if not projection:
+        return json.loads(payload_text)
+    if base_type == "author_profile":
+        return openalex_records.decode_author(payload_text)
+    payload = json.loads(payload_text)
+    if isinstance(payload, list): # Works held inline, written before the shared work store
+        return [openalex_records.work_from_dict(work) for work in payload]
+    return payload
+
+def _resolve_payload(db: Session, data_type: str, payload: object) -> object | None:
+    # Work lists are stored as {"work_ids": [...]}; rows written before the shared work
+    # store hold the works inline and are returned as they are
+    if is_work_list_data_type(data_type) and isinstance(payload, dict) and "work_ids" in payload:
+        return get_works(db, work_projection(data_type), payload["work_ids"])
+    return payload
+
+def load_cached_payload(db: Session, cache_entry: models.OpenAlexDataCache) -> object | None:
+    """
+    Returns the parsed payload of a cache entry (see parse_payload_text), with work lists
+    resolved from the shared work store. Returns None if a referenced work is no longer stored.
+    """
+    stored_payload = parse_payload_text(cache_entry.data_type, read_cached_payload_text(cache_entry))
+    return _resolve_payload(db, cache_entry.data_type, stored_payload)
+
+def get_cached_openalex_payload(db: Session, researcher_id: int, data_type: str) -> tuple[object, int] | None:
+    """
+    Returns (parsed payload, cache entry ID) for unexpired cached data, or None.
+    Served from the in-process tier when possible; otherwise the row is read and parsed
+    once and kept in that tier until the row's expires_at. Work lists are kept there as
+    ID lists and resolved against the shared works on every read, so a refreshed work is
+    seen by all of its co-authors at once. Inside a unit of work the resolved payload is
+    memoized, and later lookups in the same unit skip both tiers.
+    """
+    remembered = unit_of_work.recall(researcher_id, data_type)
+    if remembered is not None:
+        metrics.cache_lookups.inc(data_type=data_type, result="unit_of_work_hit")
+        return remembered
+
+    key = (researcher_id, data_type)
+    cached = memory_cache.get(key)
+    if cached is not None:
+        payload = _resolve_payload(db, data_type, cached[0])
+        if payload is not None:
+            metrics.cache_lookups.inc(data_type=data_type, result="memory_hit")
+            touch_memory_hits(db, [cached[1]])
+            unit_of_work.remember(researcher_id, data_type, payload, cached[1])
+            return payload, cached[1]
+        memory_cache.invalidate(key)
+
+    cache_entry = get_cached_openalex_data(db, researcher_id, data_type)
+    if cache_entry is None:
+        metrics.cache_lookups.inc(data_type=data_type, result="miss")
+        return None
+    payload_text = read_cached_payload_text(cache_entry)
+    stored_payload = parse_payload_text(data_type, payload_text)
+    payload = _resolve_payload(db, data_type, stored_payload)
+    if payload is None:
+        metrics.cache_lookups.inc(data_type=data_type, result="miss")
+        return None # A referenced work was removed; treat as a miss so the list is fetched again
+    metrics.cache_lookups.inc(data_type=data_type, result="db_hit")
+    metrics.cache_payload_bytes.observe(len(payload_text), data_type=data_type, operation="read")
+    memory_cache.put(key, stored_payload, len(payload_text), cache_entry.expires_at, cache_entry.id)
+    touch_cache_entries(db, [cache_entry])
+    unit_of_work.remember(researcher_id, data_type, payload, cache_entry.id)
+    return payload, cache_entry.id
+
+def get_stale_openalex_payload(
+    db: Session, researcher_id: int, data_type: str, max_staleness_seconds: int
+) -> tuple[object, int] | None:
+    """
+    Returns (parsed payload, cache entry ID) for an entry that has expired less than
+    max_staleness_seconds ago, or None. Used for stale-while-revalidate reads; stale
+    payloads are not kept in the in-process tier.
+    """
+    oldest_allowed_expiry = datetime.now(timezone.utc) - timedelta(seconds=max_staleness_seconds)
+    cache_entry = db.query(models.OpenAlexDataCache).filter(
+        models.OpenAlexDataCache.researcher_id == researcher_id,
+        models.OpenAlexDataCache.data_type == data_type,
+        models.OpenAlexDataCache.expires_at > oldest_allowed_expiry
+    ).first()
+    if cache_entry is None:
+        return None
+    payload = load_cached_payload(db, cache_entry)
+    if payload is None:
+        return None
+    metrics.cache_stale_served.inc(data_type=data_type)
+    touch_cache_entries(db, [cache_entry])
+    unit_of_work.remember(researcher_id, data_type, payload, cache_entry.id)
+    return payload, cache_entry.id
+
+def get_openalex_cache_entry(db: Session, researcher_id: int, data_type: str) -> models.OpenAlexDataCache | None:
+    """
+    Retrieves the cache entry for a researcher and data type regardless of expiry.
+    Its fetched_at is the time of the last successful sync with OpenAlex.
+    """
+    return db.query(models.OpenAlexDataCache).filter(
+        models.OpenAlexDataCache.researcher_id == researcher_id,
+        models.OpenAlexDataCache.data_type == data_type
+    ).first()
+
+def get_openalex_cache_entries_bulk(
+    db: Session, data_type: str, researcher_ids: list[int] = None
+) -> list[models.OpenAlexDataCache]:
+    """
+    Retrieves the cache entries of one data type regardless of expiry, for the given
+    researchers or, when researcher_ids is None, for every researcher.
+    """
+    query = db.query(models.OpenAlexDataCache).filter(models.OpenAlexDataCache.data_type == data_type)
+    if researcher_ids is None:
+        return query.all()
+    entries = []
+    for start in range(0, len(researcher_ids), BULK_QUERY_CHUNK_SIZE):
+        entries.extend(query.filter(
+            models.OpenAlexDataCache.researcher_id.in_(researcher_ids[start:start + BULK_QUERY_CHUNK_SIZE])
+        ))
+    return entries
+
+def get_cache_entry_id(db: Session, researcher_id: int, data_type: str) -> int | None:
+    """
+    Returns the ID of the cache entry for a researcher and data type regardless of expiry,
+    taken from the current unit of work when the entry was read or written in it.
+    """
+    remembered = unit_of_work.recall(researcher_id, data_type)
+    if remembered is not None and remembered[1] is not None:
+        return remembered[1]
+    row = db.query(models.OpenAlexDataCache.id).filter(
+        models.OpenAlexDataCache.researcher_id == researcher_id,
+        models.OpenAlexDataCache.data_type == data_type
+    ).first()
+    return row[0] if row else None
+
+def _refreshed_freshness(
+    cache_entry: models.OpenAlexDataCache | None,
+    data_type: str,
+    data_hash: str,
+    fetched_at: datetime,
+    cache_duration_seconds: int | None
+) -> tuple[int, datetime]:
+    """
+    Returns (refresh streak, expires_at) for data_hash being stored over cache_entry (None for a new entry).
+    """
+    refresh_streak = next_refresh_streak(
+        cache_entry.payload_hash if cache_entry else None, data_hash, cache_entry.refresh_streak if cache_entry else 0
+    )
+    if cache_duration_seconds is None:
+        cache_duration_seconds = ttl_policy.ttl_for(data_type, refresh_streak)
+    return refresh_streak, fetched_at + timedelta(seconds=cache_duration_seconds)
+
 def store_openalex_data(
     db: Session, 
     researcher_id: int, 
     data_type: str, 
     data: str, # JSON string data
-    cache_duration_seconds: int
+    cache_duration_seconds: int | None = None, # None: as long as ttl_policy decides
+    payload_hash: str = None # Identifies the data for the adaptive TTL; defaults to a hash of data
 ) -> models.OpenAlexDataCache:
     """
-    Stores or updates OpenAlex data in the cache.
+    Stores or updates OpenAlex data in the cache, compressed with the preferred payload codec.
     Sets fetched_at to current time and calculates expires_at.
+    Any parsed copy in the in-process tier or the current unit of work is invalidated.
     """
+    memory_cache.invalidate((researcher_id, data_type))
+    unit_of_work.forget(researcher_id, data_type)
+    metrics.cache_payload_bytes.observe(len(data), data_type=data_type, operation="write")
+    stored_data, codec = encode_payload(data)
+    data_hash = payload_hash or hash_payload(data)
     fetched_at = datetime.now(timezone.utc)
-    expires_at = fetched_at + timedelta(seconds=cache_duration_seconds)
 
     # Check if an entry already exists to update it (upsert logic)
     cache_entry = db.query(models.OpenAlexDataCache).filter(
         models.OpenAlexDataCache.researcher_id == researcher_id,
         models.OpenAlexDataCache.data_type == data_type
     ).first()
+    refresh_streak, expires_at = _refreshed_freshness(cache_entry, data_type, data_hash, fetched_at, cache_duration_seconds)
 
     if cache_entry:
-        cache_entry.openalex_json_data = data
+        cache_entry.openalex_json_data = stored_data
+        cache_entry.payload_codec = codec
+        cache_entry.payload_size = len(stored_data)
         cache_entry.fetched_at = fetched_at
         cache_entry.expires_at = expires_at
+        cache_entry.payload_hash = data_hash
+        cache_entry.refresh_streak = refresh_streak
     else:
         cache_entry = models.OpenAlexDataCache(
             researcher_id=researcher_id,
             data_type=data_type,
-            openalex_json_data=data,
+            openalex_json_data=stored_data,
+            payload_codec=codec,
+            payload_size=len(stored_data),
             fetched_at=fetched_at,
-            expires_at=expires_at
+            expires_at=expires_at,
+            payload_hash=data_hash,
+            refresh_streak=refresh_streak
         )
         db.add(cache_entry)
     
     db.commit()
     db.refresh(cache_entry)
     return cache_entry
+
+def get_cached_openalex_data_bulk(
+    db: Session, researcher_ids: list[int], data_type: str
+) -> dict[int, models.OpenAlexDataCache]:
+    """
+    Retrieves unexpired cache entries of one data type for many researchers at once.
+    Returns a mapping of researcher_id to cache entry; researchers without a valid entry are omitted.
+    """
+    current_time = datetime.now(timezone.utc)
+    entries = {}
+    for start in range(0, len(researcher_ids), BULK_QUERY_CHUNK_SIZE):
+        chunk = researcher_ids[start:start + BULK_QUERY_CHUNK_SIZE]
+        for cache_entry in db.query(models.OpenAlexDataCache).filter(
+            models.OpenAlexDataCache.researcher_id.in_(chunk),
+            models.OpenAlexDataCache.data_type == data_type,
+            models.OpenAlexDataCache.expires_at > current_time
+        ):
+            entries[cache_entry.researcher_id] = cache_entry
+    touch_cache_entries(db, list(entries.values()))
+    return entries
+
+def store_openalex_data_bulk(
+    db: Session,
+    data_type: str,
+    data_by_researcher: dict[int, str], # researcher_id -> JSON string data
+    cache_duration_seconds: int | None = None, # None: as long as ttl_policy decides
+    commit: bool = True, # False leaves the rows flushed but uncommitted, for callers batching more writes
+    payload_hashes: dict[int, str] = None # researcher_id -> hash identifying the data; see store_openalex_data
+) -> list[models.OpenAlexDataCache]:
+    """
+    Stores or updates cache entries of one data type for many researchers
+    and commits them in a single transaction.
+    """
+    fetched_at = datetime.now(timezone.utc)
+    payload_hashes = payload_hashes or {}
+    researcher_ids = list(data_by_researcher)
+
+    existing_entries = {}
+    for start in range(0, len(researcher_ids), BULK_QUERY_CHUNK_SIZE):
+        chunk = researcher_ids[start:start + BULK_QUERY_CHUNK_SIZE]
+        for cache_entry in db.query(models.OpenAlexDataCache).filter(
+            models.OpenAlexDataCache.researcher_id.in_(chunk),
+            models.OpenAlexDataCache.data_type == data_type
+        ):
+            existing_entries[cache_entry.researcher_id] = cache_entry
+
+    stored_entries = []
+    for researcher_id, data in data_by_researcher.items():
+        memory_cache.invalidate((researcher_id, data_type))
+        unit_of_work.forget(researcher_id, data_type)
+        metrics.cache_payload_bytes.observe(len(data), data_type=data_type, operation="write")
+        stored_data, codec = encode_payload(data)
+        data_hash = payload_hashes.get(researcher_id) or hash_payload(data)
+        cache_entry = existing_entries.get(researcher_id)
+        refresh_streak, expires_at = _refreshed_freshness(cache_entry, data_type, data_hash, fetched_at, cache_duration_seconds)
+        if cache_entry:
+            cache_entry.openalex_json_data = stored_data
+            cache_entry.payload_codec = codec
+            cache_entry.payload_size = len(stored_data)
+            cache_entry.fetched_at = fetched_at
+            cache_entry.expires_at = expires_at
+            cache_entry.payload_hash = data_hash
+            cache_entry.refresh_streak = refresh_streak
+        else:
+            cache_entry = models.OpenAlexDataCache(
+                researcher_id=researcher_id,
+                data_type=data_type,
+                openalex_json_data=stored_data,
+                payload_codec=codec,
+                payload_size=len(stored_data),
+                fetched_at=fetched_at,
+                expires_at=expires_at,
+                payload_hash=data_hash,
+                refresh_streak=refresh_streak
+            )
+            db.add(cache_entry)
+        stored_entries.append(cache_entry)
+
+    if commit:
+        db.commit()
+    else:
+        db.flush() # Assigns IDs to new entries
+    return stored_entries
+
+def store_author_works(
+    db: Session,
+    researcher_id: int,
+    data_type: str,
+    works: list[dict],
+    cache_duration_seconds: int | None = None
+) -> models.OpenAlexDataCache:
+    """
+    Stores a researcher's works list: the works go to the shared store, the cache entry
+    keeps only their IDs. Committed in one transaction. The entry's payload hash covers
+    the works themselves, so a changed citation count counts as a change.
+    """
+    work_ids = store_works(db, work_projection(data_type), works)
+    return store_openalex_data(
+        db, researcher_id, data_type, json.dumps({"work_ids": work_ids}), cache_duration_seconds,
+        payload_hash=hash_payload(json.dumps(works))
+    )
+
+def record_incremental_works_sync(
+    db: Session,
+    cache_entry: models.OpenAlexDataCache,
+    changed_works: list[dict],
+    cache_duration_seconds: int | None = None,
+    commit: bool = True
+) -> models.OpenAlexDataCache:
+    """
+    Records a sync of a works-list entry that fetched only what changed since its fetched_at.
+    changed_works (those differing from their stored copies) replace the shared copies, works
+    the list does not have yet are appended to it, and the entry counts as freshly fetched. The
+    cost follows the number of changes, apart from rewriting the ID list when works are added.
+    The payload hash is chained over the changes, so an empty sync keeps the TTL streak going.
+    """
+    researcher_id, data_type = cache_entry.researcher_id, cache_entry.data_type
+    memory_cache.invalidate((researcher_id, data_type))
+    unit_of_work.forget(researcher_id, data_type)
+    data_hash = cache_entry.payload_hash
+    if changed_works:
+        store_works(db, work_projection(data_type), changed_works)
+        work_ids = parse_payload_text(data_type, read_cached_payload_text(cache_entry))["work_ids"]
+        listed_ids = set(work_ids)
+        added_ids = [work["id"] for work in changed_works if work["id"] not in listed_ids]
+        if added_ids:
+            data = json.dumps({"work_ids": work_ids + added_ids})
+            metrics.cache_payload_bytes.observe(len(data), data_type=data_type, operation="write")
+            cache_entry.openalex_json_data, cache_entry.payload_codec = encode_payload(data)
+            cache_entry.payload_size = len(cache_entry.openalex_json_data)
+        data_hash = hash_payload((cache_entry.payload_hash or "") + json.dumps(changed_works))
+
+    fetched_at = datetime.now(timezone.utc)
+    refresh_streak, expires_at = _refreshed_freshness(cache_entry, data_type, data_hash, fetched_at, cache_duration_seconds)
+    cache_entry.fetched_at = fetched_at
+    cache_entry.expires_at = expires_at
+    cache_entry.payload_hash = data_hash
+    cache_entry.refresh_streak = refresh_streak
+    if commit:
+        db.commit()
+    return cache_entry
+
+def store_author_works_bulk(
+    db: Session,
+    data_type: str,
+    works_by_researcher: dict[int, list[dict]],
+    cache_duration_seconds: int | None = None,
+    commit: bool = True
+) -> list[models.OpenAlexDataCache]:
+    """
+    Bulk counterpart of store_author_works; a work shared by several researchers is stored once.
+    """
+    unique_works = {work["id"]: work for works in works_by_researcher.values() for work in works}
+    store_works(db, work_projection(data_type), list(unique_works.values()))
+    return store_openalex_data_bulk(
+        db, data_type,
+        {rid: json.dumps({"work_ids": [work["id"] for work in works]}) for rid, works in works_by_researcher.items()},
+        cache_duration_seconds, commit,
+        payload_hashes={rid: hash_payload(json.dumps(works)) for rid, works in works_by_researcher.items()}
+    )
@@ -0,0 +1,222 @@
+# Retention for the openalex_data_cache table, which is otherwise only ever overwritten.
+# A periodic sweep (started from the app lifespan, or run once with `python -m services.cache_maintenance`):
+#   1. deletes entries that expired more than a grace period ago, and entries of deleted researchers;
+#   2. if a byte budget is set, evicts the least recently accessed entries until they and the
+#      shared works they reference fit;
+#   3. deletes shared works (openalex_works) no longer referenced by any researcher's works list;
+#   4. on SQLite, returns the freed pages to the file system with PRAGMA incremental_vacuum.
+# Deletes run in small batches, each in its own short transaction, so request handlers are never
+# locked out for long.
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+from database import models
+from database.database_setup import SessionLocal
+from services import cache_crud
+from services.payload_codec import decode_payload
+from config import (
+    OPENALEX_CACHE_SWEEP_INTERVAL_SECONDS,
+    OPENALEX_CACHE_SWEEP_GRACE_SECONDS,
+    OPENALEX_CACHE_SWEEP_BATCH_SIZE,
+    OPENALEX_CACHE_MAX_BYTES
+)
+
+def _delete_entries(db: Session, cache_entries: list[tuple[int, int, str]]):
+    """
+    Deletes cache entries given as (id, researcher_id, data_type), unlinking any summary or
+    time series that points at them and dropping their parsed copies from the in-process tier.
+    """
+    entry_ids = [entry_id for entry_id, _, _ in cache_entries]
+    for linked_model in (models.BibliometricSummary, models.BibliometricTimeSeries):
+        db.query(linked_model).filter(
+            linked_model.last_updated_from_cache_id.in_(entry_ids)
+        ).update({linked_model.last_updated_from_cache_id: None}, synchronize_session=False)
+    db.query(models.OpenAlexDataCache).filter(
+        models.OpenAlexDataCache.id.in_(entry_ids)
+    ).delete(synchronize_session=False)
+    db.commit()
+    for _, researcher_id, data_type in cache_entries:
+        cache_crud.memory_cache.invalidate((researcher_id, data_type))
+
+def delete_expired_entries(
+    db: Session,
+    grace_seconds: int = OPENALEX_CACHE_SWEEP_GRACE_SECONDS,
+    batch_size: int = OPENALEX_CACHE_SWEEP_BATCH_SIZE
+) -> int:
+    """
+    Deletes entries expired more than grace_seconds ago and entries whose researcher no longer
+    exists, batch_size rows per transaction. Returns the number of rows deleted.
+    """
+    expired_before = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    existing_researcher_ids = db.query(models.Researcher.id)
+    deleted = 0
+    while True:
+        batch = db.query(
+            models.OpenAlexDataCache.id, models.OpenAlexDataCache.researcher_id, models.OpenAlexDataCache.data_type
+        ).filter(or_(
+            models.OpenAlexDataCache.expires_at < expired_before,
+            models.OpenAlexDataCache.researcher_id.not_in(existing_researcher_ids)
+        )).limit(batch_size).all()
+        if not batch:
+            return deleted
+        _delete_entries(db, batch)
+        deleted += len(batch)
+
+def delete_unreferenced_works(db: Session, batch_size: int = OPENALEX_CACHE_SWEEP_BATCH_SIZE) -> int:
+    """
+    Deletes works that no cached works list references any more. Works written after the
+    sweep started are kept, since the list referencing them may not be committed yet.
+    Returns the number of works deleted.
+    """
+    sweep_started_at = datetime.now(timezone.utc)
+    referenced = set()
+    last_id = 0
+    while True:
+        work_lists = db.query(
+            models.OpenAlexDataCache.id, models.OpenAlexDataCache.data_type,
+            models.OpenAlexDataCache.openalex_json_data, models.OpenAlexDataCache.payload_codec
+        ).filter(
+            models.OpenAlexDataCache.id > last_id,
+            models.OpenAlexDataCache.data_type.like("author_works%")
+        ).order_by(models.OpenAlexDataCache.id).limit(batch_size).all()
+        if not work_lists:
+            break
+        for _, data_type, stored_data, codec in work_lists:
+            payload = json.loads(decode_payload(stored_data, codec))
+            if isinstance(payload, dict): # Lists written before the shared work store hold works inline
+                projection = cache_crud.work_projection(data_type)
+                referenced.update((projection, work_id) for work_id in payload.get("work_ids", []))
+        last_id = work_lists[-1][0]
+
+    deleted = 0
+    last_id = 0
+    while True:
+        stored_works = db.query(models.OpenAlexWork.id, models.OpenAlexWork.work_id, models.OpenAlexWork.projection).filter(
+            models.OpenAlexWork.id > last_id,
+            models.OpenAlexWork.fetched_at < sweep_started_at
+        ).order_by(models.OpenAlexWork.id).limit(batch_size).all()
+        if not stored_works:
+            return deleted
+        unreferenced = [
+            (row_id, projection, work_id) for row_id, work_id, projection in stored_works
+            if (projection, work_id) not in referenced
+        ]
+        if unreferenced:
+            db.query(models.OpenAlexWork).filter(
+                models.OpenAlexWork.id.in_([row_id for row_id, _, _ in unreferenced])
+            ).delete(synchronize_session=False)
+            db.commit()
+            for _, projection, work_id in unreferenced:
+                cache_crud.memory_cache.invalidate(("work", projection, work_id))
+            deleted += len(unreferenced)
+        last_id = stored_works[-1][0]
+
+def _stored_bytes(db: Session) -> tuple[int, int, int]:
+    """
+    Returns (bytes of all cache entries, bytes of works lists among them, bytes of shared works).
+    """
+    entry_bytes, list_bytes = db.query(
+        func.coalesce(func.sum(models.OpenAlexDataCache.payload_size), 0),
+        func.coalesce(func.sum(case(
+            (models.OpenAlexDataCache.data_type.like("author_works%"), models.OpenAlexDataCache.payload_size), else_=0
+        )), 0)
+    ).one()
+    work_bytes = db.query(func.coalesce(func.sum(models.OpenAlexWork.payload_size), 0)).scalar()
+    return entry_bytes, list_bytes, work_bytes
+
+def enforce_size_budget(
+    db: Session,
+    max_bytes: int = OPENALEX_CACHE_MAX_BYTES,
+    batch_size: int = OPENALEX_CACHE_SWEEP_BATCH_SIZE
+) -> int:
+    """
+    Evicts least recently accessed entries until the stored payloads, cache entries and shared
+    works together, total at most max_bytes. Works only go once no list references them, so
+    orphaned works are deleted before each round of evictions. Within a round a works list is
+    counted as freeing its own bytes plus its share of the works, in proportion to its size.
+    A max_bytes of 0 means no budget. Returns the number of rows deleted, entries and works.
+    """
+    if max_bytes <= 0:
+        return 0
+    last_used = func.coalesce(models.OpenAlexDataCache.last_accessed_at, models.OpenAlexDataCache.fetched_at)
+    deleted = 0
+    while True:
+        entry_bytes, list_bytes, work_bytes = _stored_bytes(db)
+        excess_bytes = entry_bytes + work_bytes - max_bytes
+        if excess_bytes <= 0:
+            return deleted
+        orphaned_works = delete_unreferenced_works(db, batch_size)
+        if orphaned_works:
+            deleted += orphaned_works
+            continue
+        candidates = db.query(
+            models.OpenAlexDataCache.id, models.OpenAlexDataCache.researcher_id,
+            models.OpenAlexDataCache.data_type, models.OpenAlexDataCache.payload_size
+        ).order_by(last_used, models.OpenAlexDataCache.id).limit(batch_size).all()
+        if not candidates:
+            return deleted
+        work_bytes_per_list_byte = work_bytes / list_bytes if list_bytes else 0
+        batch = []
+        for entry_id, researcher_id, data_type, payload_size in candidates:
+            if excess_bytes <= 0:
+                break
+            batch.append((entry_id, researcher_id, data_type))
+            excess_bytes -= payload_size or 0
+            if cache_crud.is_work_list_data_type(data_type):
+                excess_bytes -= (payload_size or 0) * work_bytes_per_list_byte
+        _delete_entries(db, batch)
+        deleted += len(batch)
+
+def incremental_vacuum(db: Session, max_pages: int = None):
+    """
+    Releases free pages of a SQLite database (all of them, or at most max_pages) back to the
+    file system. Needs auto_vacuum=INCREMENTAL, which database/migrations.py sets up.
+    A no-op on other databases, whose own vacuuming reclaims the space.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    pragma = f"PRAGMA incremental_vacuum({int(max_pages)});" if max_pages else "PRAGMA incremental_vacuum;"
+    # executescript steps the pragma to completion; a plain execute frees a single page
+    raw_connection = db.get_bind().engine.raw_connection()
+    try:
+        raw_connection.driver_connection.executescript(pragma)
+    finally:
+        raw_connection.close()
+
+def sweep_cache(db: Session) -> dict:
+    """
+    Runs one full retention pass and returns the number of rows deleted per step.
+    """
+    stats = {"expired_deleted": delete_expired_entries(db), "evicted_over_budget": enforce_size_budget(db)}
+    stats["unreferenced_works_deleted"] = delete_unreferenced_works(db) # After both, which can orphan works
+    incremental_vacuum(db)
+    return stats
+
+def _sweep_with_own_session() -> dict:
+    db = SessionLocal()
+    try:
+        return sweep_cache(db)
+    finally:
+        db.close()
+
+async def run_periodic_sweeper(interval_seconds: int = OPENALEX_CACHE_SWEEP_INTERVAL_SECONDS):
+    """
+    Sweeps the cache every interval_seconds until cancelled. Each sweep runs in a worker thread
+    with its own session so the event loop keeps serving requests.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            stats = await asyncio.to_thread(_sweep_with_own_session)
+            if any(stats.values()):
+                print(f"Cache sweep: {stats}")
+        except Exception as e:
+            print(f"Cache sweep failed: {e}")
+
+if __name__ == "__main__":
+    from database.database_setup import init_db
+    init_db()
+    print(f"Cache sweep: {_sweep_with_own_session()}")
@@ -0,0 +1,133 @@
+# Proactive refresh of OpenAlex cache entries shortly before they expire, so that user requests keep
+# hitting the cache. A scheduler task runs in every app worker, but each pass first takes the
+# "cache_warming" lease in the database, so only one worker warms at a time and another takes over
+# when it stops. A pass picks the most recently read entries expiring within the horizon, then
+# spreads their refreshes over most of the interval; every request still goes through the shared
+# rate limiter.
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+from database import models
+from database.database_setup import SessionLocal
+from services import lease_crud, openalex_service
+from config import (
+    OPENALEX_MAX_STALENESS_SECONDS,
+    OPENALEX_WARM_INTERVAL_SECONDS,
+    OPENALEX_WARM_HORIZON_SECONDS,
+    OPENALEX_WARM_ACCESS_WINDOW_SECONDS,
+    OPENALEX_WARM_MAX_PER_PASS
+)
+
+LEASE_NAME = "cache_warming"
+# Share of the interval over which a pass spreads its refreshes, leaving slack before the next pass
+SPREAD_FRACTION = 0.8
+
+# Identifies this process as a lease holder
+_holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_session_factory = SessionLocal
+
+def find_entries_to_warm(
+    db: Session,
+    horizon_seconds: int = OPENALEX_WARM_HORIZON_SECONDS,
+    access_window_seconds: int = OPENALEX_WARM_ACCESS_WINDOW_SECONDS,
+    limit: int = OPENALEX_WARM_MAX_PER_PASS
+) -> list[tuple[int, str]]:
+    """
+    Returns (researcher_id, data_type) of entries that expire within horizon_seconds (or have
+    expired but may still be served stale) and were read within access_window_seconds,
+    most recently read first.
+    """
+    now = datetime.now(timezone.utc)
+    return [tuple(row) for row in db.query(
+        models.OpenAlexDataCache.researcher_id, models.OpenAlexDataCache.data_type
+    ).join(
+        models.Researcher, models.Researcher.id == models.OpenAlexDataCache.researcher_id
+    ).filter(
+        models.Researcher.openalex_id.isnot(None),
+        models.OpenAlexDataCache.expires_at < now + timedelta(seconds=horizon_seconds),
+        models.OpenAlexDataCache.expires_at > now - timedelta(seconds=OPENALEX_MAX_STALENESS_SECONDS),
+        models.OpenAlexDataCache.last_accessed_at > now - timedelta(seconds=access_window_seconds)
+    ).order_by(models.OpenAlexDataCache.last_accessed_at.desc()).limit(limit)]
+
+async def warm_entries(db: Session, entries: list[tuple[int, str]], spread_seconds: float = 0) -> int:
+    """
+    Refreshes the given entries and returns how many refresh operations succeeded. Profiles of the
+    same projection are refreshed together in OR-filter batches; works lists one researcher at a time,
+    incrementally (only works updated since the last sync are fetched). A citation head (a list of
+    only the most cited works, see openalex_service.citation_head_data_type) stays a head: works
+    that changed are merged into it, and a head with no previous sync is fetched as a head again.
+    Operations are spaced evenly over spread_seconds.
+    """
+    researchers = {
+        researcher.id: researcher for researcher in db.query(models.Researcher).filter(
+            models.Researcher.id.in_({researcher_id for researcher_id, _ in entries})
+        )
+    }
+    profile_groups: dict[str | None, list[models.Researcher]] = {}
+    works_jobs: list[tuple[models.Researcher, str | None, bool]] = []
+    for researcher_id, data_type in entries:
+        base_type, _, projection = data_type.partition(":")
+        researcher = researchers.get(researcher_id)
+        if researcher is None:
+            continue
+        if base_type == "author_profile":
+            profile_groups.setdefault(projection or None, []).append(researcher)
+        elif base_type == "author_works":
+            works_jobs.append((researcher, *openalex_service.works_list_options(data_type)))
+
+    operations = (
+        [openalex_service.fetch_and_cache_researchers_openalex_profiles(db, group, force_refresh=True, projection=projection)
+         for projection, group in profile_groups.items()]
+        + [openalex_service.fetch_and_cache_researcher_openalex_works(
+            db, researcher, projection=projection, incremental=True, allow_stale=False, force_refresh=True,
+            citation_head=citation_head
+        ) for researcher, projection, citation_head in works_jobs]
+    )
+    spacing = spread_seconds / len(operations) if operations else 0
+    succeeded = 0
+    for index, operation in enumerate(operations):
+        if index and spacing:
+            await asyncio.sleep(spacing)
+        try:
+            if await operation is not None:
+                succeeded += 1
+        except Exception as e:
+            print(f"Cache warming refresh failed: {e}")
+    return succeeded
+
+async def run_warming_pass(db: Session, spread_seconds: float = 0, lease_seconds: float = None) -> int | None:
+    """
+    Runs one warming pass if this process holds (or can take) the warming lease.
+    Returns the number of refreshes, or None when another process holds the lease.
+    """
+    lease_seconds = lease_seconds or 2 * max(OPENALEX_WARM_INTERVAL_SECONDS, 1)
+    if not lease_crud.acquire_lease(db, LEASE_NAME, _holder, lease_seconds):
+        return None
+    return await warm_entries(db, find_entries_to_warm(db), spread_seconds)
+
+async def run_warming_scheduler(interval_seconds: int = OPENALEX_WARM_INTERVAL_SECONDS):
+    """
+    Runs a warming pass every interval_seconds until cancelled, then releases the lease.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            db = _session_factory()
+            try:
+                warmed = await run_warming_pass(db, interval_seconds * SPREAD_FRACTION, 2 * interval_seconds)
+                if warmed:
+                    print(f"Cache warming: refreshed {warmed} entries")
+            except Exception as e:
+                print(f"Cache warming pass failed: {e}")
+            finally:
+                db.close()
+    finally:
+        db = _session_factory()
+        try:
+            lease_crud.release_lease(db, LEASE_NAME, _holder)
+        finally:
+            db.close()
@@ -0,0 +1,231 @@
+# Per-researcher citation index that is kept up to date as individual works change, so a summary can be
+# refreshed in O(log n) per changed work instead of being recomputed from the full works list. It is
+# stored with the researcher's BibliometricSummary (see bibliometric_service.refresh_summary_incrementally).
+import json
+import struct
+import zlib
+from array import array
+from datetime import datetime, timezone
+
+from .bibliometric_utils import I10_THRESHOLD
+
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<8q") # version, capacity, publications, total citations, i10, first year, overflow pairs, work map bytes
+_NO_YEAR = -1
+_NO_WORK_MAP = -1
+
+class CitationIndex:
+    """
+    Multiset of one researcher's citation counts. Counts below `capacity` are tallied in two Fenwick
+    trees indexed by count (publications with that count, and their citations); larger counts are
+    kept exactly in `overflow`. Capacity is kept above the number of publications, so overflowing
+    works always rank above any h- or g-index threshold. Adding, removing or changing a work costs
+    O(log capacity); h_index is O(log capacity) and g_index O(log^2 capacity).
+    `work_citations` records the count each work was indexed with, so changes are detected against
+    the index itself rather than against the shared work store, which co-authors' refreshes rewrite.
+    """
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self._counts = array("q", bytes(8 * (capacity + 1))) # 1-based; position c + 1 is citation count c
+        self._sums = array("q", bytes(8 * (capacity + 1)))
+        self.overflow: dict[int, int] = {} # citation count -> publications, for counts >= capacity
+        self.publications = 0
+        self.total_citations = 0
+        self.i10_index = 0
+        self.first_publication_year: int | None = None
+        self.work_citations: dict[str, int | None] | None = None # Work ID -> indexed count; None if not kept
+
+    @classmethod
+    def from_works(
+        cls, citation_counts: list[int], publication_years: list[int] = (), work_ids: list[str] = None
+    ) -> "CitationIndex":
+        index = cls(_capacity_for(len(citation_counts)))
+        for citations in citation_counts:
+            index.add(citations)
+        for year in publication_years:
+            index.note_publication_year(year)
+        if work_ids is not None:
+            index.work_citations = dict(zip(work_ids, citation_counts))
+        return index
+
+    def _update_trees(self, citations: int, publications: int):
+        position = citations + 1
+        while position <= self.capacity:
+            self._counts[position] += publications
+            self._sums[position] += publications * citations
+            position += position & -position
+
+    def _tally(self, citations: int, publications: int):
+        if citations < self.capacity:
+            self._update_trees(citations, publications)
+        else:
+            remaining = self.overflow.get(citations, 0) + publications
+            if remaining:
+                self.overflow[citations] = remaining
+            else:
+                del self.overflow[citations]
+        self.publications += publications
+        self.total_citations += publications * citations
+        if citations >= I10_THRESHOLD:
+            self.i10_index += publications
+
+    def add(self, citations: int | None):
+        """
+        Adds a work. As in the batch indicators, works without a citation count are left out.
+        """
+        if citations is None:
+            return
+        if self.publications + 1 >= self.capacity:
+            self._grow(_capacity_for(self.publications + 1))
+        self._tally(max(citations, 0), 1)
+
+    def remove(self, citations: int | None):
+        if citations is not None:
+            self._tally(max(citations, 0), -1)
+
+    def replace(self, old_citations: int | None, new_citations: int | None):
+        """
+        Applies a change to one work's citation count.
+        """
+        if old_citations != new_citations:
+            self.remove(old_citations)
+            self.add(new_citations)
+
+    def update_work(self, work_id: str, citations: int | None) -> bool:
+        """
+        Brings one work (by ID, see work_citations) to its current count, adding it if it was not
+        indexed yet. Returns whether anything changed.
+        """
+        if work_id in self.work_citations:
+            previous = self.work_citations[work_id]
+            if previous == citations:
+                return False
+            self.replace(previous, citations)
+        else:
+            self.add(citations)
+        self.work_citations[work_id] = citations
+        return True
+
+    def note_publication_year(self, year: int | None):
+        if year and (self.first_publication_year is None or year < self.first_publication_year):
+            self.first_publication_year = year
+
+    def _bucket_counts(self) -> list[int]:
+        # Undoes the Fenwick layout: publications per citation count below capacity
+        buckets = list(self._counts)
+        for position in range(self.capacity, 0, -1):
+            parent = position + (position & -position)
+            if parent <= self.capacity:
+                buckets[parent] -= buckets[position]
+        return buckets[1:]
+
+    def _grow(self, capacity: int):
+        buckets = self._bucket_counts()
+        overflow = self.overflow
+        publications, total_citations, i10_index = self.publications, self.total_citations, self.i10_index
+        first_publication_year, work_citations = self.first_publication_year, self.work_citations
+        self.__init__(capacity)
+        for citations, count in enumerate(buckets):
+            if count:
+                self._update_trees(citations, count)
+        for citations, count in overflow.items():
+            if citations < capacity:
+                self._update_trees(citations, count)
+            else:
+                self.overflow[citations] = count
+        self.publications, self.total_citations, self.i10_index = publications, total_citations, i10_index
+        self.first_publication_year, self.work_citations = first_publication_year, work_citations
+
+    def h_index(self) -> int:
+        """
+        Largest h such that h works have at least h citations.
+        """
+        # Binary lifting for the largest h with publications - (works cited fewer than h times) >= h
+        position, fewer = 0, 0
+        step = 1 << (self.capacity.bit_length() - 1)
+        while step:
+            candidate = position + step
+            if candidate <= self.capacity and self.publications - (fewer + self._counts[candidate]) >= candidate:
+                position, fewer = candidate, fewer + self._counts[candidate]
+            step >>= 1
+        return position
+
+    def _sum_of_least_cited(self, publications: int) -> int:
+        # Citations of the `publications` least cited works below capacity
+        position, counted, cited = 0, 0, 0
+        step = 1 << (self.capacity.bit_length() - 1)
+        while step:
+            candidate = position + step
+            if candidate <= self.capacity and counted + self._counts[candidate] <= publications:
+                position = candidate
+                counted += self._counts[candidate]
+                cited += self._sums[candidate]
+            step >>= 1
+        return cited + (publications - counted) * position # The rest have exactly `position` citations
+
+    def g_index(self) -> int:
+        """
+        Largest g (at most the number of works) such that the g most cited works have at least g^2 citations.
+        """
+        overflow_publications = sum(self.overflow.values())
+        overflow_citations = sum(citations * count for citations, count in self.overflow.items())
+        tree_citations = self.total_citations - overflow_citations
+
+        def holds(g: int) -> bool:
+            if g <= overflow_publications:
+                return True # Each overflowing work has more than n >= g citations
+            top_citations = overflow_citations + tree_citations - self._sum_of_least_cited(self.publications - g)
+            return top_citations >= g * g
+
+        low, high = 0, self.publications # The condition holds on a prefix of g
+        while low < high:
+            middle = (low + high + 1) // 2
+            if holds(middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def m_quotient(self, current_year: int = None) -> float | None:
+        if self.first_publication_year is None:
+            return None
+        current_year = current_year or datetime.now(timezone.utc).year
+        return round(self.h_index() / max(current_year - self.first_publication_year + 1, 1), 3)
+
+    def to_bytes(self) -> bytes:
+        overflow = array("q", [value for item in sorted(self.overflow.items()) for value in item])
+        work_map = b"" if self.work_citations is None else json.dumps(self.work_citations, separators=(",", ":")).encode()
+        header = _HEADER.pack(
+            FORMAT_VERSION, self.capacity, self.publications, self.total_citations, self.i10_index,
+            _NO_YEAR if self.first_publication_year is None else self.first_publication_year, len(self.overflow),
+            _NO_WORK_MAP if self.work_citations is None else len(work_map)
+        )
+        return zlib.compress(header + self._counts.tobytes() + self._sums.tobytes() + overflow.tobytes() + work_map, 1)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CitationIndex":
+        raw = zlib.decompress(data)
+        version, capacity, publications, total_citations, i10_index, first_year, overflow_pairs, work_map_bytes = _HEADER.unpack_from(raw)
+        if version not in (1, FORMAT_VERSION): # Version 1 has no work map (its last header field is 0)
+            raise ValueError(f"Unsupported citation index format {version}")
+        index = cls.__new__(cls)
+        index.capacity = capacity
+        tree_bytes = 8 * (capacity + 1)
+        offset = _HEADER.size
+        index._counts = array("q")
+        index._counts.frombytes(raw[offset:offset + tree_bytes])
+        index._sums = array("q")
+        index._sums.frombytes(raw[offset + tree_bytes:offset + 2 * tree_bytes])
+        overflow = array("q")
+        overflow_end = offset + 2 * tree_bytes + 16 * overflow_pairs
+        overflow.frombytes(raw[offset + 2 * tree_bytes:overflow_end])
+        index.overflow = dict(zip(overflow[::2], overflow[1::2]))
+        has_work_map = version >= 2 and work_map_bytes != _NO_WORK_MAP
+        index.work_citations = json.loads(raw[overflow_end:overflow_end + work_map_bytes]) if has_work_map else None
+        index.publications, index.total_citations, index.i10_index = publications, total_citations, i10_index
+        index.first_publication_year = None if first_year == _NO_YEAR else first_year
+        return index
+
+def _capacity_for(publications: int) -> int:
+    # Smallest power of two above the number of publications, with headroom for new ones
+    return max(16, 1 << (publications + 1).bit_length())
@@ -6,10 +6,12 @@ from services import (
     openalex_service, 
     topic_crud, 
     collaboration_crud, 
-    cache_crud # To potentially get cache entry for OpenAlex profile
+    cache_crud, # To potentially get cache entry for OpenAlex profile
+    unit_of_work
 )
 from config import OPENALEX_POLITE_EMAIL
 
+@unit_of_work.in_unit_of_work
 async def extract_and_store_researcher_topics(
     db: Session, 
     researcher: db_models.Researcher, 
@@ -26,16 +28,16 @@ async def extract_and_store_researcher_topics(
     email_for_api = openalex_email or OPENALEX_POLITE_EMAIL
 
     # Fetch OpenAlex author profile data (this handles caching)
-    author_profile_dict = await openalex_service.fetch_and_cache_researcher_openalex_profile(
-        db=db, researcher=researcher, email=email_for_api
+    author_profile = await openalex_service.fetch_and_cache_researcher_openalex_profile(
+        db=db, researcher=researcher, email=email_for_api, projection="concepts" # An AuthorRecord; only x_concepts is used
     )
 
-    if not author_profile_dict or 'x_concepts' not in author_profile_dict:
+    if not author_profile or author_profile.x_concepts is None:
         print(f"No concepts found in OpenAlex profile for researcher {researcher.id}.")
         return []
 
     extracted_topics = []
-    concepts = author_profile_dict.get('x_concepts', [])
+    concepts = author_profile.x_concepts
     
     # Filter concepts (e.g., by level or score if desired)
     # For now, let's take concepts with level 0 or 1, or a certain score threshold
@@ -44,8 +46,8 @@ async def extract_and_store_researcher_topics(
     concepts_to_process = concepts
 
     for concept_data in concepts_to_process:
-        topic_name = concept_data.get('display_name')
-        openalex_concept_url = concept_data.get('id') # This is the full URL like "https://openalex.org/Cxxxx"
+        topic_name = concept_data.display_name
+        openalex_concept_url = concept_data.id # This is the full URL like "https://openalex.org/Cxxxx"
         
         # Extract the concept ID part from the URL if it's a URL
         openalex_concept_id_only = None
@@ -64,6 +66,7 @@ async def extract_and_store_researcher_topics(
     return extracted_topics
 
 
+@unit_of_work.in_unit_of_work
 async def generate_collaboration_suggestions(
     db: Session, 
     researcher: db_models.Researcher, 
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from database import models
+
+def acquire_lease(db: Session, name: str, holder: str, duration_seconds: float) -> bool:
+    """
+    Takes or renews the named lease for holder until duration_seconds from now. Succeeds when the
+    lease is free, expired or already held by holder; the conditional UPDATE (or the primary key
+    on INSERT) makes this safe when several processes try at once.
+    """
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=duration_seconds)
+    updated = db.query(models.SchedulerLease).filter(
+        models.SchedulerLease.name == name,
+        or_(models.SchedulerLease.holder == holder, models.SchedulerLease.expires_at < now)
+    ).update({models.SchedulerLease.holder: holder, models.SchedulerLease.expires_at: expires_at}, synchronize_session=False)
+    if updated:
+        db.commit()
+        return True
+    if db.query(models.SchedulerLease.name).filter(models.SchedulerLease.name == name).first() is not None:
+        db.rollback()
+        return False # Held by another process
+    try:
+        db.add(models.SchedulerLease(name=name, holder=holder, expires_at=expires_at))
+        db.commit()
+        return True
+    except IntegrityError: # Another process created it first
+        db.rollback()
+        return False
+
+def release_lease(db: Session, name: str, holder: str):
+    """
+    Gives up the named lease if holder still has it, so another process can take over at once.
+    """
+    db.query(models.SchedulerLease).filter(
+        models.SchedulerLease.name == name, models.SchedulerLease.holder == holder
+    ).delete(synchronize_session=False)
+    db.commit()
@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Hashable
+
+class ParsedPayloadCache:
+    """
+    Bounded in-process LRU of already-parsed cache payloads, sitting in front of the
+    openalex_data_cache table. Entries carry the expiry of the row they were read from
+    and the row's ID; the total size (in bytes of the serialized payload) is capped at
+    max_bytes, evicting least-recently-used entries first. A max_bytes of 0 disables it.
+
+    The cache is per process: writes made by other workers are only seen once the
+    local entry expires, exactly as with the row's own expires_at.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int, datetime, int | None]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _as_utc(moment: datetime) -> datetime:
+        # SQLite hands back naive datetimes that are in UTC
+        return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[Any, int | None] | None:
+        """
+        Returns (payload, cache_entry_id) for an unexpired entry, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, size_bytes, expires_at, cache_entry_id = entry
+            if expires_at <= datetime.now(timezone.utc):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload, cache_entry_id
+
+    def put(self, key: Hashable, payload: Any, size_bytes: int, expires_at: datetime, cache_entry_id: int | None = None):
+        """
+        Stores a parsed payload. Payloads larger than a quarter of the budget are not kept,
+        so one huge entry cannot flush the whole cache.
+        """
+        if size_bytes > self.max_bytes // 4:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (payload, size_bytes, self._as_utc(expires_at), cache_entry_id)
+            self._total_bytes += size_bytes
+            while self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
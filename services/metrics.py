@@ -0,0 +1,179 @@
+# In-process counters and histograms for the OpenAlex cache and client, rendered in the Prometheus
+# text exposition format by GET /metrics (api/metrics_routes.py). Values are per process: with several
+# workers, Prometheus scrapes each one and sums across them.
+import math
+import threading
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAYLOAD_BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(label_names: tuple, label_values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        return "\n".join(lines + self._samples())
+
+class Counter(_Metric):
+    """
+    Monotonically increasing count, one series per combination of label values.
+    """
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down, set by its owner (e.g. just before rendering).
+    """
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values over fixed cumulative buckets, plus their sum and count.
+    """
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = (), buckets: tuple = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {} # label values -> [per-bucket counts, +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    series[0][index] += 1
+                    break
+            series[1] += 1
+            series[2] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[1] if series else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            snapshot = sorted((key, (list(series[0]), series[1], series[2])) for key, series in self._series.items())
+        lines = []
+        for key, (bucket_counts, count, total) in snapshot:
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = _format_labels(self.label_names, key, f'le="{_format_value(upper_bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, INF_BUCKET_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+INF_BUCKET_LABEL = 'le="+Inf"'
+
+registry: list[_Metric] = []
+
+def render_prometheus() -> str:
+    """
+    All registered metrics in the Prometheus text exposition format (version 0.0.4).
+    """
+    return "\n".join(metric.render() for metric in registry) + "\n"
+
+# --- OpenAlex cache (services/cache_crud.py) ---
+cache_lookups = Counter(
+    "openalex_cache_lookups_total",
+    "Fresh cache lookups by data type and result (unit_of_work_hit, memory_hit, db_hit or miss).",
+    ("data_type", "result")
+)
+cache_stale_served = Counter(
+    "openalex_cache_stale_served_total",
+    "Expired cache entries served while a background refresh runs.",
+    ("data_type",)
+)
+cache_payload_bytes = Histogram(
+    "openalex_cache_payload_bytes",
+    "Size of cached JSON payloads read from or written to the database, before compression.",
+    ("data_type", "operation"),
+    buckets=PAYLOAD_BYTES_BUCKETS
+)
+memory_cache_bytes = Gauge(
+    "openalex_memory_cache_bytes",
+    "Bytes of parsed payloads held by the in-process cache tier."
+)
+
+# --- OpenAlex client (services/openalex_service.py) ---
+upstream_request_seconds = Histogram(
+    "openalex_upstream_request_duration_seconds",
+    "Latency of individual OpenAlex requests by endpoint and status (\"error\" for transport errors).",
+    ("endpoint", "status")
+)
+upstream_retries = Counter(
+    "openalex_upstream_retries_total",
+    "OpenAlex requests retried, by endpoint and reason (status code or transport_error).",
+    ("endpoint", "reason")
+)
+background_refreshes = Counter(
+    "openalex_background_refreshes_total",
+    "Stale-while-revalidate background refreshes by outcome (ok or error).",
+    ("result",)
+)
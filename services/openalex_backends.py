@@ -0,0 +1,157 @@
+import hashlib
+import importlib.util
+import json
+import os
+
+import httpx
+
+from config import (
+    OPENALEX_API_BASE_URL,
+    OPENALEX_BACKEND,
+    OPENALEX_HTTP2,
+    OPENALEX_TIMEOUT_SECONDS,
+    OPENALEX_MAX_CONNECTIONS,
+    OPENALEX_MAX_KEEPALIVE_CONNECTIONS,
+    OPENALEX_KEEPALIVE_EXPIRY_SECONDS,
+    OPENALEX_CASSETTE_DIR,
+    OPENALEX_STANDIN_FIXTURES_DIR,
+    OPENALEX_STANDIN_LATENCY_SECONDS
+)
+
+class OpenAlexBackend:
+    """
+    Transport used by openalex_service. Implementations answer GET requests for OpenAlex
+    API paths (e.g. "/works") with an httpx.Response, so the service's status handling,
+    retries and JSON decoding work the same against every backend.
+    """
+    async def get(self, url: str, params: dict = None) -> httpx.Response:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+class HttpBackend(OpenAlexBackend):
+    """
+    Sends requests over HTTP with an httpx.AsyncClient: to the live API by default, or to any
+    ASGI app (such as the local stand-in) when an httpx transport is supplied.
+    Connection pool size, keep-alive and HTTP/2 default to the OPENALEX_* settings;
+    HTTP/2 is silently skipped when the h2 package is not installed.
+    """
+    def __init__(
+        self,
+        base_url: str = OPENALEX_API_BASE_URL,
+        timeout: float = OPENALEX_TIMEOUT_SECONDS,
+        transport=None,
+        http2: bool = OPENALEX_HTTP2,
+        max_connections: int = OPENALEX_MAX_CONNECTIONS,
+        max_keepalive_connections: int = OPENALEX_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = OPENALEX_KEEPALIVE_EXPIRY_SECONDS,
+        verify=True # TLS verification, as for httpx; an ssl.SSLContext lets benchmarks trust a local certificate
+    ):
+        self.http2 = http2 and transport is None and http2_available()
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            transport=transport,
+            http2=self.http2,
+            verify=verify,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+
+    async def get(self, url: str, params: dict = None) -> httpx.Response:
+        return await self.client.get(url, params=params)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+class CassetteMissError(httpx.RequestError):
+    """
+    Raised in replay mode for a request that was never recorded. Being a RequestError
+    (not a TransportError) it is reported like a failed request and not retried.
+    """
+
+class CassetteBackend(OpenAlexBackend):
+    """
+    Record/replay store for OpenAlex responses, one JSON file per distinct request.
+    In "record" mode requests are forwarded to `inner` and the responses written to
+    cassette_dir; in "replay" mode responses are served from cassette_dir only.
+    The polite-pool mailto parameter is not part of the request key.
+    """
+    def __init__(self, cassette_dir: str, mode: str = "replay", inner: OpenAlexBackend = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs an inner backend to forward requests to")
+        self.cassette_dir = cassette_dir
+        self.mode = mode
+        self.inner = inner
+
+    @staticmethod
+    def request_key(url: str, params: dict = None) -> str:
+        key_params = sorted((str(k), str(v)) for k, v in (params or {}).items() if k != "mailto")
+        return hashlib.sha256(json.dumps([url, key_params]).encode("utf-8")).hexdigest()
+
+    def _path(self, url: str, params: dict = None) -> str:
+        return os.path.join(self.cassette_dir, f"{self.request_key(url, params)}.json")
+
+    async def get(self, url: str, params: dict = None) -> httpx.Response:
+        path = self._path(url, params)
+        request = httpx.Request("GET", OPENALEX_API_BASE_URL + url, params=params)
+
+        if self.mode == "replay":
+            if not os.path.exists(path):
+                raise CassetteMissError(f"No recorded response for GET {url} {params}", request=request)
+            with open(path, encoding="utf-8") as cassette_file:
+                recorded = json.load(cassette_file)
+            return httpx.Response(
+                recorded["status_code"],
+                headers=recorded["headers"],
+                content=recorded["body"].encode("utf-8"),
+                request=request
+            )
+
+        response = await self.inner.get(url, params=params)
+        os.makedirs(self.cassette_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as cassette_file:
+            json.dump({
+                "request": {"url": url, "params": {k: v for k, v in (params or {}).items() if k != "mailto"}},
+                "status_code": response.status_code,
+                "headers": {"content-type": response.headers.get("content-type", "application/json")},
+                "body": response.text
+            }, cassette_file)
+        return response
+
+    async def aclose(self):
+        if self.inner is not None:
+            await self.inner.aclose()
+
+def create_standin_backend(fixtures_dir: str, latency_seconds: float = 0.0) -> HttpBackend:
+    """
+    HttpBackend wired in-process to the local stand-in app (no sockets involved).
+    """
+    from .openalex_standin import create_standin_app
+    app = create_standin_app(fixtures_dir, latency_seconds)
+    return HttpBackend(base_url="http://openalex-standin", transport=httpx.ASGITransport(app=app))
+
+def build_backend(kind: str = None) -> OpenAlexBackend:
+    """
+    Builds the backend named by `kind` (defaults to OPENALEX_BACKEND):
+    "live", "record", "replay" or "standin".
+    """
+    kind = kind or OPENALEX_BACKEND
+    if kind == "live":
+        return HttpBackend()
+    if kind == "record":
+        return CassetteBackend(OPENALEX_CASSETTE_DIR, mode="record", inner=HttpBackend())
+    if kind == "replay":
+        return CassetteBackend(OPENALEX_CASSETTE_DIR, mode="replay")
+    if kind == "standin":
+        return create_standin_backend(OPENALEX_STANDIN_FIXTURES_DIR, OPENALEX_STANDIN_LATENCY_SECONDS)
+    raise ValueError(f"Unknown OpenAlex backend '{kind}'")
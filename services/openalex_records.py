@@ -0,0 +1,84 @@
+# Compact typed records for the OpenAlex data our services compute with. Payloads cached under a
+# projection (see openalex_service.PROJECTION_PROFILES) are decoded straight into these records
+# instead of full dict trees: only the declared fields are kept, and everything else in the JSON
+# is skipped while decoding. Full (unprojected) payloads stay plain dicts for the API routes.
+import json
+from dataclasses import asdict, dataclass, fields
+
+try: # Optional, typed JSON decoder; the json module is used when it is not installed
+    import msgspec
+except ImportError:
+    msgspec = None
+
+@dataclass(slots=True)
+class ConceptRecord:
+    id: str | None = None
+    display_name: str | None = None
+    level: int | None = None
+    score: float | None = None
+
+@dataclass(slots=True)
+class YearCountRecord:
+    year: int | None = None
+    works_count: int | None = None # Only on authors
+    cited_by_count: int | None = None
+
+@dataclass(slots=True)
+class WorkRecord:
+    id: str | None = None
+    cited_by_count: int | None = None
+    publication_year: int | None = None
+    counts_by_year: list[YearCountRecord] | None = None # Citations received per year (recent years only)
+
+@dataclass(slots=True)
+class AuthorRecord:
+    id: str | None = None
+    display_name: str | None = None
+    works_count: int | None = None
+    cited_by_count: int | None = None
+    x_concepts: list[ConceptRecord] | None = None # None when the payload has no x_concepts at all
+    counts_by_year: list[YearCountRecord] | None = None # Works published and citations received per year
+
+def _from_dict(record_type, data: dict):
+    return record_type(**{field.name: data.get(field.name) for field in fields(record_type)})
+
+def concept_from_dict(data: dict) -> ConceptRecord:
+    return _from_dict(ConceptRecord, data)
+
+def _year_counts_from_dicts(counts_by_year: list[dict] | None) -> list[YearCountRecord] | None:
+    return None if counts_by_year is None else [_from_dict(YearCountRecord, counts) for counts in counts_by_year]
+
+def work_from_dict(data: dict) -> WorkRecord:
+    work = _from_dict(WorkRecord, data)
+    work.counts_by_year = _year_counts_from_dicts(work.counts_by_year)
+    return work
+
+def author_from_dict(data: dict) -> AuthorRecord:
+    author = _from_dict(AuthorRecord, data)
+    if author.x_concepts is not None:
+        author.x_concepts = [concept_from_dict(concept) for concept in author.x_concepts]
+    author.counts_by_year = _year_counts_from_dicts(author.counts_by_year)
+    return author
+
+def to_dict(record) -> dict:
+    return asdict(record)
+
+if msgspec is not None:
+    _work_decoder = msgspec.json.Decoder(WorkRecord)
+    _works_decoder = msgspec.json.Decoder(list[WorkRecord])
+    _author_decoder = msgspec.json.Decoder(AuthorRecord)
+
+def decode_work(payload_text: str | bytes) -> WorkRecord:
+    if msgspec is not None:
+        return _work_decoder.decode(payload_text)
+    return work_from_dict(json.loads(payload_text))
+
+def decode_works(payload_text: str | bytes) -> list[WorkRecord]:
+    if msgspec is not None:
+        return _works_decoder.decode(payload_text)
+    return [work_from_dict(work) for work in json.loads(payload_text)]
+
+def decode_author(payload_text: str | bytes) -> AuthorRecord:
+    if msgspec is not None:
+        return _author_decoder.decode(payload_text)
+    return author_from_dict(json.loads(payload_text))
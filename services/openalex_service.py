@@ -1,17 +1,248 @@
+import asyncio
+import math
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Hashable
 import httpx
 import json # For converting dict to JSON string for storage
 from sqlalchemy.orm import Session
 from database import models as db_models # Renamed to avoid conflict with 'models' parameter name
-from . import cache_crud, openalex_schemas # Schemas for validation/serialization if needed
-from config import OPENALEX_API_BASE_URL, OPENALEX_POLITE_EMAIL
+from database.database_setup import SessionLocal
+from . import cache_crud, metrics, openalex_records, openalex_schemas, unit_of_work # Schemas for validation/serialization if needed
+from .openalex_records import AuthorRecord, WorkRecord
+from .openalex_backends import OpenAlexBackend, build_backend
+from .bibliometric_utils import I10_THRESHOLD
+from .rate_limiter import AsyncTokenBucket
+from .single_flight import SingleFlight
+from config import (
+    OPENALEX_POLITE_EMAIL,
+    OPENALEX_MAX_CONCURRENT_PAGES,
+    OPENALEX_AUTHOR_BATCH_SIZE,
+    OPENALEX_RATE_LIMIT_PER_SECOND,
+    OPENALEX_RATE_LIMIT_BURST,
+    OPENALEX_MAX_RETRIES,
+    OPENALEX_RETRY_BACKOFF_BASE_SECONDS,
+    OPENALEX_RETRY_BACKOFF_MAX_SECONDS,
+    OPENALEX_STALE_WHILE_REVALIDATE,
+    OPENALEX_MAX_STALENESS_SECONDS
+)
 
-# Initialize a reusable HTTP client
-client = httpx.AsyncClient(base_url=OPENALEX_API_BASE_URL, timeout=10.0) # Added timeout
+# Backend for all OpenAlex requests (live HTTP unless OPENALEX_BACKEND says otherwise).
+# The app opens and closes it in its lifespan so connections are pooled for the process
+# lifetime and released on shutdown; scripts that skip open_client() get one on first use.
+client: OpenAlexBackend | None = None
 
-async def get_openalex_author_data(openalex_id: str, email: str = None) -> dict | None:
+async def open_client() -> OpenAlexBackend:
+    """
+    Creates the shared backend if it is not open yet and returns it.
+    """
+    global client
+    if client is None:
+        client = build_backend()
+    return client
+
+async def close_client():
+    """
+    Closes the shared backend and its connection pool.
+    """
+    global client
+    if client is not None:
+        previous_backend, client = client, None
+        await previous_backend.aclose()
+
+def set_backend(backend: OpenAlexBackend) -> OpenAlexBackend:
+    """
+    Swaps the backend used for OpenAlex requests, e.g. to replay cassettes or target the
+    local stand-in in benchmarks. Returns the previous backend so callers can restore it.
+    """
+    global client
+    previous_backend, client = client, backend
+    return previous_backend
+
+# Shared by every OpenAlex request made by this process
+rate_limiter = AsyncTokenBucket(OPENALEX_RATE_LIMIT_PER_SECOND, OPENALEX_RATE_LIMIT_BURST)
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# Coalesces concurrent cache-miss fetches keyed by (researcher_id, data_type), so that
+# e.g. the summary, concept-summary and topic endpoints loading together share one
+# upstream request and one cache write.
+inflight_fetches = SingleFlight()
+
+# Background refreshes started for stale cache reads. Tasks are held here so they are not
+# garbage collected mid-flight; keys are held so each entry is refreshed at most once at a time.
+revalidation_tasks: set[asyncio.Task] = set()
+_revalidating_keys: set[Hashable] = set()
+# Background refreshes outlive the request, so they open their own database session
+_session_factory = SessionLocal
+
+def schedule_revalidation(key: Hashable, refresh: Callable[[Session], Awaitable]) -> bool:
+    """
+    Runs refresh(db) in a background task with its own session, unless a refresh or a
+    foreground fetch for the same key is already running. Returns whether a task was started.
+    """
+    if key in _revalidating_keys or inflight_fetches.is_in_flight(key):
+        return False
+    _revalidating_keys.add(key)
+
+    async def run():
+        unit_of_work.detach() # The task outlives the request that started it
+        db = _session_factory()
+        try:
+            await inflight_fetches.do(key, lambda: refresh(db))
+            metrics.background_refreshes.inc(result="ok")
+        except Exception as e:
+            metrics.background_refreshes.inc(result="error")
+            print(f"Background refresh of cached OpenAlex data {key} failed: {e}")
+        finally:
+            db.close()
+            _revalidating_keys.discard(key)
+
+    task = asyncio.create_task(run())
+    revalidation_tasks.add(task)
+    task.add_done_callback(revalidation_tasks.discard)
+    return True
+
+# Named field projections per consumer, sent to OpenAlex as select=... on /authors and /works.
+# Projected payloads are cached under their own data_type (see projected_data_type), so a
+# consumer never reads a row that lacks the fields it needs. Fields must be top-level.
+PROJECTION_PROFILES = {
+    "summary": {
+        "authors": ["id", "works_count", "cited_by_count"],
+        "works": ["id", "cited_by_count", "publication_year"], # publication_year dates the career for the m-quotient
+    },
+    "concepts": {
+        "authors": ["id", "display_name", "x_concepts"],
+    },
+    "timeseries": {
+        "authors": ["id", "counts_by_year"],
+        "works": ["id", "cited_by_count", "publication_year", "counts_by_year"],
+    },
+}
+
+def select_fields(projection: str | None, entity: str) -> str | None:
+    """
+    Returns the OpenAlex select= value for a projection profile and entity ("authors" or "works"),
+    or None when no projection is requested (full objects).
+    """
+    if not projection:
+        return None
+    if projection not in PROJECTION_PROFILES or entity not in PROJECTION_PROFILES[projection]:
+        raise ValueError(f"Unknown OpenAlex projection '{projection}' for {entity}")
+    return ",".join(PROJECTION_PROFILES[projection][entity])
+
+def _as_author_result(author_data: dict | None, projection: str | None) -> dict | AuthorRecord | None:
+    # Projected payloads are handed to consumers as records, matching what the cache returns for them
+    return openalex_records.author_from_dict(author_data) if projection and author_data else author_data
+
+def _as_works_result(works_data: list[dict] | None, projection: str | None) -> list[dict] | list[WorkRecord] | None:
+    if projection and works_data is not None:
+        return [openalex_records.work_from_dict(work) for work in works_data]
+    return works_data
+
+def projected_data_type(data_type: str, projection: str | None) -> str:
+    """
+    Cache data_type for a projection, e.g. "author_works:summary". Full objects keep the plain data_type.
+    """
+    return f"{data_type}:{projection}" if projection else data_type
+
+def citation_head_data_type(projection: str | None) -> str:
+    """
+    Cache data_type of a citation-head works list, e.g. "author_works:summary_head". A head holds
+    only the most cited works, so it never shares a row with the complete list of its projection.
+    """
+    return f"author_works:{projection or 'full'}{cache_crud.CITATION_HEAD_SUFFIX}"
+
+def works_list_options(data_type: str) -> tuple[str | None, bool]:
+    """
+    Returns (projection, citation_head) for the data_type of a works list, the arguments of
+    fetch_and_cache_researcher_openalex_works that produce it.
+    """
+    projection = data_type.partition(":")[2]
+    citation_head = projection.endswith(cache_crud.CITATION_HEAD_SUFFIX)
+    if citation_head:
+        projection = projection.removesuffix(cache_crud.CITATION_HEAD_SUFFIX)
+        return (None if projection == "full" else projection), True
+    return projection or None, False
+
+def _retry_after_seconds(value) -> float | None:
+    """
+    Parses a Retry-After header given either as delay-seconds or as an HTTP date.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def _endpoint_label(url: str) -> str:
+    # "/authors/A123" -> "/authors/{id}", keeping metric label values bounded
+    segments = url.strip("/").split("/")
+    return "/" + segments[0] + ("/{id}" if len(segments) > 1 else "")
+
+def _backoff_seconds(attempt: int) -> float:
+    """
+    Exponential backoff with full jitter for the given (zero-based) retry attempt.
+    """
+    ceiling = min(OPENALEX_RETRY_BACKOFF_MAX_SECONDS, OPENALEX_RETRY_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+async def _get(url: str, params: dict = None) -> httpx.Response:
+    """
+    Issues a GET against OpenAlex through the shared rate limiter.
+    429 and 502-504 responses and transport errors are retried up to OPENALEX_MAX_RETRIES
+    times, waiting for Retry-After when the server sends it and for a jittered exponential
+    backoff otherwise. A 429 also pauses the shared limiter so other callers back off too.
+    The last response is returned (or the last transport error raised) once retries run out.
+    """
+    endpoint = _endpoint_label(url)
+    attempt = 0
+    while True:
+        await rate_limiter.acquire()
+        backend = client or await open_client()
+        started = time.perf_counter()
+        try:
+            response = await backend.get(url, params=params)
+        except httpx.TransportError as e:
+            metrics.upstream_request_seconds.observe(time.perf_counter() - started, endpoint=endpoint, status="error")
+            if attempt >= OPENALEX_MAX_RETRIES:
+                raise
+            metrics.upstream_retries.inc(endpoint=endpoint, reason="transport_error")
+            delay = _backoff_seconds(attempt)
+            print(f"Transport error calling OpenAlex {url}, retrying in {delay:.2f}s: {e}")
+        else:
+            metrics.upstream_request_seconds.observe(
+                time.perf_counter() - started, endpoint=endpoint, status=response.status_code
+            )
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= OPENALEX_MAX_RETRIES:
+                return response
+            metrics.upstream_retries.inc(endpoint=endpoint, reason=response.status_code)
+            retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+            delay = retry_after if retry_after is not None else _backoff_seconds(attempt)
+            print(f"OpenAlex {url} returned {response.status_code}, retrying in {delay:.2f}s")
+            if response.status_code == 429:
+                # The next acquire() (ours included) now waits out the delay
+                rate_limiter.pause(delay)
+                delay = 0
+        if delay:
+            await asyncio.sleep(delay)
+        attempt += 1
+
+async def get_openalex_author_data(openalex_id: str, email: str = None, select: str = None) -> dict | None:
     """
     Fetches author data from OpenAlex API.
     openalex_id should be the ID only (e.g., A5023888337), not the full URL.
+    select optionally restricts the returned fields (see select_fields).
     """
     if not openalex_id:
         return None
@@ -22,12 +253,14 @@ async def get_openalex_author_data(openalex_id: str, email: str = None) -> dict
 
     url = f"/authors/{openalex_id}"
     params = {}
+    if select:
+        params['select'] = select
     actual_email = email or OPENALEX_POLITE_EMAIL
     if actual_email:
         params['mailto'] = actual_email
     
     try:
-        response = await client.get(url, params=params)
+        response = await _get(url, params=params)
         response.raise_for_status()  # Raises HTTPStatusError for 4xx/5xx responses
         return response.json()
     except httpx.HTTPStatusError as e:
@@ -37,101 +270,457 @@ async def get_openalex_author_data(openalex_id: str, email: str = None) -> dict
         print(f"Request error occurred while fetching author data for {openalex_id}: {e}")
         return None
 
+async def get_openalex_authors_data_batch(
+    openalex_ids: list[str],
+    email: str = None,
+    batch_size: int = None, # Defaults to OPENALEX_AUTHOR_BATCH_SIZE
+    select: str = None # Must include "id" so results can be matched back to the requested IDs
+) -> dict[str, dict]:
+    """
+    Fetches many author records with one /authors?filter=openalex_id:A1|A2|... request per chunk.
+    Returns a mapping of short OpenAlex ID (e.g., A5023888337) to author data.
+    IDs of chunks that fail, or that OpenAlex does not return, are missing from the mapping.
+    """
+    short_ids = []
+    for openalex_id in openalex_ids:
+        if not openalex_id:
+            continue
+        if openalex_id.startswith("https://openalex.org/"):
+            openalex_id = openalex_id.split("/")[-1]
+        if openalex_id not in short_ids:
+            short_ids.append(openalex_id)
+
+    batch_size = batch_size or OPENALEX_AUTHOR_BATCH_SIZE
+    chunks = [short_ids[start:start + batch_size] for start in range(0, len(short_ids), batch_size)]
+    actual_email = email or OPENALEX_POLITE_EMAIL
+    semaphore = asyncio.Semaphore(OPENALEX_MAX_CONCURRENT_PAGES)
+
+    async def fetch_chunk(chunk: list[str]) -> list[dict]:
+        params = {
+            'filter': 'openalex_id:' + '|'.join(chunk),
+            'per_page': len(chunk)
+        }
+        if select:
+            params['select'] = select
+        if actual_email:
+            params['mailto'] = actual_email
+        try:
+            async with semaphore:
+                response = await _get("/authors", params=params)
+            response.raise_for_status()
+            return response.json().get('results', [])
+        except httpx.HTTPStatusError as e:
+            print(f"HTTP error occurred while fetching author batch starting at {chunk[0]}: {e}")
+            return []
+        except httpx.RequestError as e:
+            print(f"Request error occurred while fetching author batch starting at {chunk[0]}: {e}")
+            return []
+
+    authors_by_id = {}
+    for results in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+        for author_data in results:
+            author_id = (author_data.get('id') or '').split("/")[-1]
+            if author_id:
+                authors_by_id[author_id] = author_data
+    return authors_by_id
+
+async def _get_works_page(params: dict) -> dict:
+    """
+    Fetches a single page of the /works listing and returns the decoded response body.
+    """
+    response = await _get("/works", params=params)
+    response.raise_for_status()
+    return response.json()
+
 async def get_author_works_from_openalex(
     openalex_author_id: str, 
     email: str = None, 
     per_page: int = 25, 
-    max_pages: int = 1 # Limit pages to avoid excessive requests
+    max_pages: int | None = 1, # Limit pages to avoid excessive requests; None fetches every work
+    max_concurrency: int = None, # Defaults to OPENALEX_MAX_CONCURRENT_PAGES
+    select: str = None
 ) -> list[dict] | None:
     """
     Fetches author's works from OpenAlex.
     openalex_author_id should be the ID part (e.g., A5023888337).
+    The first page is fetched on its own to read meta.count; the remaining pages
+    (up to max_pages) are then requested concurrently and merged in page order.
+    With max_pages=None all works are collected via cursor paging instead.
     """
     if not openalex_author_id:
         return None
 
+    if max_pages is None:
+        all_works = []
+        try:
+            async for works_on_page in iter_author_works_from_openalex(
+                openalex_author_id, email, per_page, select=select
+            ):
+                all_works.extend(works_on_page)
+        except httpx.HTTPStatusError as e:
+            print(f"HTTP error occurred while fetching works for author {openalex_author_id}: {e}")
+            return None
+        except httpx.RequestError as e:
+            print(f"Request error occurred while fetching works for author {openalex_author_id}: {e}")
+            return None
+        return all_works
+
     if openalex_author_id.startswith("https://openalex.org/"):
         openalex_author_id = openalex_author_id.split("/")[-1]
 
-    all_works = []
-    current_page = 1
     actual_email = email or OPENALEX_POLITE_EMAIL
-    
-    while current_page <= max_pages:
+
+    def page_params(page: int) -> dict:
         params = {
             'filter': f'author.id:{openalex_author_id}',
             'per_page': per_page,
-            'page': current_page
+            'page': page
         }
+        if select:
+            params['select'] = select
         if actual_email:
             params['mailto'] = actual_email
-        
-        try:
-            response = await client.get("/works", params=params)
-            response.raise_for_status()
-            data = response.json()
-            works_on_page = data.get('results', [])
-            all_works.extend(works_on_page)
-            
-            # Check if there are more results (OpenAlex meta includes total count)
-            # For simplicity, we'll just break if fewer than per_page results are returned or if max_pages is reached.
-            if len(works_on_page) < per_page or not works_on_page:
-                break
-            current_page += 1
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error occurred while fetching works for author {openalex_author_id}: {e}")
-            return None # Or return partial results if preferred
-        except httpx.RequestError as e:
-            print(f"Request error occurred while fetching works for author {openalex_author_id}: {e}")
-            return None
-            
+        return params
+
+    semaphore = asyncio.Semaphore(max_concurrency or OPENALEX_MAX_CONCURRENT_PAGES)
+
+    async def fetch_page(page: int) -> list[dict]:
+        async with semaphore:
+            data = await _get_works_page(page_params(page))
+        return data.get('results', [])
+
+    try:
+        first_page = await _get_works_page(page_params(1))
+        all_works = first_page.get('results', [])
+
+        # OpenAlex reports the total number of matching works in meta.count,
+        # which tells us up front how many pages are left to request.
+        total_count = (first_page.get('meta') or {}).get('count') or len(all_works)
+        total_pages = min(max_pages, math.ceil(total_count / per_page))
+        if total_pages <= 1 or len(all_works) < per_page:
+            return all_works
+
+        # asyncio.gather preserves argument order, so pages are merged in sequence
+        remaining_pages = await asyncio.gather(
+            *(fetch_page(page) for page in range(2, total_pages + 1))
+        )
+    except httpx.HTTPStatusError as e:
+        print(f"HTTP error occurred while fetching works for author {openalex_author_id}: {e}")
+        return None # Or return partial results if preferred
+    except httpx.RequestError as e:
+        print(f"Request error occurred while fetching works for author {openalex_author_id}: {e}")
+        return None
+
+    for works_on_page in remaining_pages:
+        all_works.extend(works_on_page)
     return all_works
 
+async def iter_author_works_from_openalex(
+    openalex_author_id: str,
+    email: str = None,
+    per_page: int = 200, # OpenAlex maximum page size
+    extra_filters: list[str] | None = None, # Additional OpenAlex filter clauses, e.g. "publication_year:2020"
+    select: str = None,
+    sort: str = None # OpenAlex sort, e.g. "cited_by_count:desc"; cursor paging keeps the order across pages
+):
+    """
+    Async generator over an author's works using OpenAlex cursor paging (cursor=*).
+    Yields one page (a list of works) at a time, so callers never need to hold the
+    whole result set, and is not subject to the 10,000-result limit of page-based paging.
+    HTTP and request errors are propagated to the caller.
+    """
+    if not openalex_author_id:
+        return
+
+    if openalex_author_id.startswith("https://openalex.org/"):
+        openalex_author_id = openalex_author_id.split("/")[-1]
+
+    filters = [f'author.id:{openalex_author_id}'] + list(extra_filters or [])
+    params = {
+        'filter': ','.join(filters),
+        'per_page': per_page,
+        'cursor': '*'
+    }
+    if select:
+        params['select'] = select
+    if sort:
+        params['sort'] = sort
+    actual_email = email or OPENALEX_POLITE_EMAIL
+    if actual_email:
+        params['mailto'] = actual_email
+
+    while True:
+        data = await _get_works_page(params)
+        works_on_page = data.get('results', [])
+        if works_on_page:
+            yield works_on_page
+
+        next_cursor = (data.get('meta') or {}).get('next_cursor')
+        if not next_cursor or not works_on_page:
+            break
+        params = {**params, 'cursor': next_cursor}
+
+def merge_works_by_id(cached_works: list[dict], changed_works: list[dict]) -> list[dict]:
+    """
+    Merges changed works into a cached works list by OpenAlex ID.
+    Existing works are replaced in place; works not seen before are appended.
+    """
+    position_by_id = {work.get('id'): index for index, work in enumerate(cached_works)}
+    merged_works = list(cached_works)
+    for work in changed_works:
+        index = position_by_id.get(work.get('id'))
+        if index is None:
+            position_by_id[work.get('id')] = len(merged_works)
+            merged_works.append(work)
+        else:
+            merged_works[index] = work
+    return merged_works
+
+async def get_author_works_updated_since(
+    openalex_author_id: str,
+    since: datetime,
+    email: str = None,
+    select: str = None
+) -> list[dict] | None:
+    """
+    Fetches only the author's works that OpenAlex updated on or after the day of `since`,
+    using the from_updated_date filter with cursor paging.
+    """
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc) # SQLite returns naive UTC datetimes
+    # Day granularity re-fetches a little overlap, which the merge by ID makes harmless
+    extra_filters = [f"from_updated_date:{since.astimezone(timezone.utc).date().isoformat()}"]
+
+    changed_works = []
+    try:
+        async for works_on_page in iter_author_works_from_openalex(
+            openalex_author_id, email, extra_filters=extra_filters, select=select
+        ):
+            changed_works.extend(works_on_page)
+    except httpx.HTTPStatusError as e:
+        print(f"HTTP error occurred while fetching updated works for author {openalex_author_id}: {e}")
+        return None
+    except httpx.RequestError as e:
+        print(f"Request error occurred while fetching updated works for author {openalex_author_id}: {e}")
+        return None
+    return changed_works
+
+def citation_head_is_complete(citation_counts: list[int], citation_total: int) -> bool:
+    """
+    Tells whether the most cited works seen so far, in descending citation order, already fix the
+    h-, i10- and g-index: no remaining work has as many citations as its rank would need, none
+    reaches the i10 threshold, and the g condition already fails at the current rank (once it fails
+    it cannot hold again, as later works are cited less).
+    """
+    rank = len(citation_counts)
+    minimum = citation_counts[-1] if citation_counts else 0
+    return minimum < min(rank, I10_THRESHOLD) and citation_total < rank * rank
+
+async def get_author_citation_head_works(
+    openalex_author_id: str,
+    email: str = None,
+    select: str = None
+) -> list[dict] | None:
+    """
+    Fetches an author's works sorted by cited_by_count:desc, 200 per page, and stops paging as soon
+    as a page ends below the rank it reached (see citation_head_is_complete), so the h-index (and
+    the i10- and g-index) of the returned works equal those of the full list. The author's earliest
+    work is fetched alongside and included, for the career length of the m-quotient.
+    """
+    async def most_cited() -> list[dict]:
+        head_works, citation_counts, citation_total = [], [], 0
+        async for works_on_page in iter_author_works_from_openalex(
+            openalex_author_id, email, per_page=200, select=select, sort="cited_by_count:desc"
+        ):
+            head_works.extend(works_on_page)
+            for work in works_on_page:
+                citations = work.get('cited_by_count') or 0
+                citation_counts.append(citations)
+                citation_total += citations
+            if citation_head_is_complete(citation_counts, citation_total):
+                break
+        return head_works
+
+    async def earliest() -> list[dict]:
+        async for works_on_page in iter_author_works_from_openalex(
+            openalex_author_id, email, per_page=1, select=select, sort="publication_year:asc"
+        ):
+            return works_on_page
+        return []
+
+    try:
+        head_works, earliest_works = await asyncio.gather(most_cited(), earliest())
+    except httpx.HTTPStatusError as e:
+        print(f"HTTP error occurred while fetching most cited works for author {openalex_author_id}: {e}")
+        return None
+    except httpx.RequestError as e:
+        print(f"Request error occurred while fetching most cited works for author {openalex_author_id}: {e}")
+        return None
+    # Any work added to the head lies between it and the full list, so the indices stay the same
+    return merge_works_by_id(head_works, earliest_works)
+
 async def fetch_and_cache_researcher_openalex_profile(
     db: Session, 
     researcher: db_models.Researcher, 
     email: str = None, 
-    cache_duration_seconds: int = 86400 # 24 hours
-) -> dict | None:
+    cache_duration_seconds: int = None, # None: as long as cache_crud.ttl_policy decides
+    projection: str = None, # Name of a PROJECTION_PROFILES entry; None fetches the full author object
+    allow_stale: bool = OPENALEX_STALE_WHILE_REVALIDATE, # Serve a recently expired entry and refresh it in the background
+    force_refresh: bool = False # Fetch from OpenAlex even if the cache entry is still valid (cache warming)
+) -> dict | AuthorRecord | None:
+    """
+    Returns the researcher's OpenAlex author: a dict for the full object, an AuthorRecord
+    when a projection is given.
+    """
     if not researcher.openalex_id:
         return None # Cannot fetch without an OpenAlex ID
 
-    data_type = "author_profile"
-    cached_data_entry = cache_crud.get_cached_openalex_data(db, researcher.id, data_type)
-    if cached_data_entry:
-        return json.loads(cached_data_entry.openalex_json_data) # Deserialize JSON string
+    data_type = projected_data_type("author_profile", projection)
+    cached = None if force_refresh else cache_crud.get_cached_openalex_payload(db, researcher.id, data_type)
+    if cached is not None:
+        return cached[0]
+
+    # Plain values, so a background refresh does not touch the request's session
+    researcher_id, openalex_id = researcher.id, researcher.openalex_id
 
     # Data not in cache or expired, fetch from OpenAlex
-    author_data = await get_openalex_author_data(researcher.openalex_id, email)
-    if author_data:
-        cache_crud.store_openalex_data(
-            db, researcher.id, data_type, json.dumps(author_data), cache_duration_seconds
-        )
-    return author_data
+    async def fetch_and_store(session: Session) -> tuple[dict | AuthorRecord | None, int | None]:
+        author_data = await get_openalex_author_data(openalex_id, email, select=select_fields(projection, "authors"))
+        cache_entry = None
+        if author_data:
+            cache_entry = cache_crud.store_openalex_data(
+                session, researcher_id, data_type, json.dumps(author_data), cache_duration_seconds
+            )
+        return _as_author_result(author_data, projection), cache_entry.id if cache_entry else None
+
+    key = (researcher_id, data_type)
+    if allow_stale and not force_refresh:
+        stale = cache_crud.get_stale_openalex_payload(db, researcher_id, data_type, OPENALEX_MAX_STALENESS_SECONDS)
+        if stale is not None:
+            schedule_revalidation(key, fetch_and_store)
+            return stale[0]
+
+    # Concurrent callers share the leader's outcome; each memoizes it in its own unit of work
+    result, cache_entry_id = await inflight_fetches.do(key, lambda: fetch_and_store(db))
+    unit_of_work.remember(researcher_id, data_type, result, cache_entry_id)
+    return result
 
 async def fetch_and_cache_researcher_openalex_works(
     db: Session, 
     researcher: db_models.Researcher, 
     email: str = None, 
-    cache_duration_seconds: int = 86400, # 24 hours
+    cache_duration_seconds: int = None, # None: as long as cache_crud.ttl_policy decides
     per_page: int = 25,
-    max_pages: int = 1 # Default to fetching only the first page of works
-) -> list[dict] | None:
+    max_pages: int | None = 1, # Default to fetching only the first page of works; None fetches all
+    projection: str = None, # Name of a PROJECTION_PROFILES entry; None fetches full work objects
+    incremental: bool = False, # On expiry, fetch only works updated since the last sync and merge them
+    allow_stale: bool = OPENALEX_STALE_WHILE_REVALIDATE, # Serve a recently expired entry and refresh it in the background
+    force_refresh: bool = False, # Fetch from OpenAlex even if the cache entry is still valid (cache warming)
+    citation_head: bool = False # Fetch only the most cited works that fix the citation indices; ignores per_page and max_pages
+) -> list[dict] | list[WorkRecord] | None:
+    """
+    Returns the researcher's OpenAlex works: dicts for full objects, WorkRecords when a
+    projection is given.
+    """
     if not researcher.openalex_id:
         return None
 
-    data_type = "author_works" # Standardized data_type string
+    # Standardized data_type string; a citation head is cached apart from the complete list
+    data_type = citation_head_data_type(projection) if citation_head else projected_data_type("author_works", projection)
     # For works, caching strategy might be more complex if pagination is involved.
     # This basic cache will store the result of the first 'max_pages' call.
-    cached_data_entry = cache_crud.get_cached_openalex_data(db, researcher.id, data_type)
-    if cached_data_entry:
-        return json.loads(cached_data_entry.openalex_json_data)
+    cached = None if force_refresh else cache_crud.get_cached_openalex_payload(db, researcher.id, data_type)
+    if cached is not None:
+        return cached[0]
 
-    works_data = await get_author_works_from_openalex(
-        researcher.openalex_id, email, per_page, max_pages
-    )
-    if works_data is not None: # Check for None, as empty list is a valid result
-        cache_crud.store_openalex_data(
-            db, researcher.id, data_type, json.dumps(works_data), cache_duration_seconds
+    # Plain values, so a background refresh does not touch the request's session
+    researcher_id, openalex_id = researcher.id, researcher.openalex_id
+
+    async def fetch_and_store(session: Session) -> tuple[list[dict] | list[WorkRecord] | None, int | None]:
+        # The expired entry's fetched_at marks the last sync with OpenAlex
+        previous_entry = cache_crud.get_openalex_cache_entry(session, researcher_id, data_type) if incremental else None
+        previous_works = cache_crud.load_cached_payload(session, previous_entry) if previous_entry else None
+        if previous_works is not None and projection:
+            previous_works = [openalex_records.to_dict(work) for work in previous_works]
+        if previous_works is not None:
+            changed_works = await get_author_works_updated_since(
+                openalex_id, previous_entry.fetched_at, email, select=select_fields(projection, "works")
+            )
+            works_data = None if changed_works is None else merge_works_by_id(previous_works, changed_works)
+        elif citation_head:
+            works_data = await get_author_citation_head_works(openalex_id, email, select=select_fields(projection, "works"))
+        else:
+            works_data = await get_author_works_from_openalex(
+                openalex_id, email, per_page, max_pages, select=select_fields(projection, "works")
+            )
+        cache_entry = None
+        if works_data is not None: # Check for None, as empty list is a valid result
+            cache_entry = cache_crud.store_author_works(session, researcher_id, data_type, works_data, cache_duration_seconds)
+        return _as_works_result(works_data, projection), cache_entry.id if cache_entry else None
+
+    key = (researcher_id, data_type)
+    if allow_stale and not force_refresh:
+        stale = cache_crud.get_stale_openalex_payload(db, researcher_id, data_type, OPENALEX_MAX_STALENESS_SECONDS)
+        if stale is not None:
+            schedule_revalidation(key, fetch_and_store)
+            return stale[0]
+
+    # Concurrent callers share the leader's outcome; each memoizes it in its own unit of work
+    result, cache_entry_id = await inflight_fetches.do(key, lambda: fetch_and_store(db))
+    unit_of_work.remember(researcher_id, data_type, result, cache_entry_id)
+    return result
+
+async def fetch_and_cache_researchers_openalex_profiles(
+    db: Session,
+    researchers: list[db_models.Researcher],
+    email: str = None,
+    cache_duration_seconds: int = None, # None: as long as cache_crud.ttl_policy decides
+    force_refresh: bool = False,
+    projection: str = None
+) -> dict[int, dict | AuthorRecord]:
+    """
+    Batch counterpart of fetch_and_cache_researcher_openalex_profile.
+    Researchers with a valid cache entry are served from the cache (unless force_refresh);
+    the rest are fetched in OR-filter chunks and written to the cache in a single transaction.
+    Returns a mapping of researcher ID to author data (AuthorRecords when a projection is given).
+    """
+    data_type = projected_data_type("author_profile", projection)
+    researchers = [researcher for researcher in researchers if researcher.openalex_id]
+
+    profiles = {}
+    if not force_refresh:
+        memory_hit_ids = []
+        for researcher in researchers:
+            cached = cache_crud.memory_cache.get((researcher.id, data_type))
+            if cached is not None:
+                profiles[researcher.id] = cached[0]
+                memory_hit_ids.append(cached[1])
+        cache_crud.touch_memory_hits(db, memory_hit_ids)
+        cached_entries = cache_crud.get_cached_openalex_data_bulk(
+            db, [researcher.id for researcher in researchers if researcher.id not in profiles], data_type
         )
-    return works_data
+        for researcher_id, cached_data_entry in cached_entries.items():
+            payload_text = cache_crud.read_cached_payload_text(cached_data_entry)
+            profiles[researcher_id] = cache_crud.parse_payload_text(data_type, payload_text)
+            cache_crud.memory_cache.put(
+                (researcher_id, data_type), profiles[researcher_id], len(payload_text),
+                cached_data_entry.expires_at, cached_data_entry.id
+            )
+
+    to_fetch = [researcher for researcher in researchers if researcher.id not in profiles]
+    if not to_fetch:
+        return profiles
+
+    authors_by_id = await get_openalex_authors_data_batch(
+        [researcher.openalex_id for researcher in to_fetch], email, select=select_fields(projection, "authors")
+    )
+    fetched_json = {}
+    for researcher in to_fetch:
+        author_data = authors_by_id.get(researcher.openalex_id.split("/")[-1])
+        if author_data:
+            profiles[researcher.id] = _as_author_result(author_data, projection)
+            fetched_json[researcher.id] = json.dumps(author_data)
+
+    if fetched_json:
+        cache_crud.store_openalex_data_bulk(db, data_type, fetched_json, cache_duration_seconds)
+    return profiles
@@ -0,0 +1,159 @@
+# Local stand-in for the OpenAlex endpoints we use (/authors, /authors/{id}, /works), served
+# from authors.jsonl[.gz] / works.jsonl[.gz] fixture files, for offline benchmarks and load tests.
+# Run standalone: python -m services.openalex_standin --fixtures-dir <dir> --port 8081 --latency-ms 50
+# With --certfile/--keyfile it is served over TLS by hypercorn, which negotiates HTTP/2 through ALPN
+# like the live API; otherwise by uvicorn over plain HTTP/1.1.
+import argparse
+import asyncio
+import gzip
+import json
+import os
+
+from fastapi import FastAPI, HTTPException
+
+MAX_PER_PAGE = 200
+
+def _short_id(openalex_id: str | None) -> str:
+    return (openalex_id or "").rstrip("/").split("/")[-1]
+
+def load_fixture_records(fixtures_dir: str, entity: str) -> list[dict]:
+    """
+    Loads <entity>.jsonl or <entity>.jsonl.gz from fixtures_dir. A missing file means no records.
+    """
+    for file_name, opener in ((f"{entity}.jsonl", open), (f"{entity}.jsonl.gz", gzip.open)):
+        path = os.path.join(fixtures_dir, file_name)
+        if os.path.exists(path):
+            with opener(path, "rt", encoding="utf-8") as fixture_file:
+                return [json.loads(line) for line in fixture_file if line.strip()]
+    return []
+
+def _parse_filter(filter_param: str | None) -> list[tuple[str, str]]:
+    clauses = []
+    for clause in (filter_param or "").split(","):
+        if clause:
+            key, _, value = clause.partition(":")
+            clauses.append((key, value))
+    return clauses
+
+def _work_author_ids(work: dict) -> set[str]:
+    return {
+        _short_id((authorship.get("author") or {}).get("id"))
+        for authorship in work.get("authorships") or []
+    }
+
+def _matches(record: dict, key: str, value: str) -> bool:
+    if key == "openalex_id":
+        return _short_id(record.get("id")) in {_short_id(v) for v in value.split("|")}
+    if key == "author.id":
+        return bool(_work_author_ids(record) & {_short_id(v) for v in value.split("|")})
+    if key == "from_updated_date":
+        # updated_date is an ISO timestamp; comparing the leading date part is enough
+        return (record.get("updated_date") or "")[:len(value)] >= value
+    if key == "publication_year":
+        return str(record.get("publication_year")) in value.split("|")
+    if key == "cited_by_count":
+        if value.startswith(">"):
+            return (record.get("cited_by_count") or 0) > int(value[1:])
+        if value.startswith("<"):
+            return (record.get("cited_by_count") or 0) < int(value[1:])
+        return (record.get("cited_by_count") or 0) == int(value)
+    raise HTTPException(status_code=400, detail=f"Unsupported filter: {key}")
+
+def _project(record: dict, select: str | None) -> dict:
+    if not select:
+        return record
+    return {field: record.get(field) for field in select.split(",")}
+
+def create_standin_app(fixtures_dir: str, latency_seconds: float = 0.0) -> FastAPI:
+    """
+    Builds the stand-in ASGI app. latency_seconds is added to every response.
+    """
+    authors = load_fixture_records(fixtures_dir, "authors")
+    works = load_fixture_records(fixtures_dir, "works")
+    authors_by_id = {_short_id(author.get("id")): author for author in authors}
+
+    app = FastAPI(title="OpenAlex stand-in")
+
+    async def inject_latency():
+        if latency_seconds > 0:
+            await asyncio.sleep(latency_seconds)
+
+    def list_response(records: list[dict], filter_param, sort, per_page, page, cursor, select) -> dict:
+        for key, value in _parse_filter(filter_param):
+            records = [record for record in records if _matches(record, key, value)]
+        if sort:
+            field, _, direction = sort.partition(":")
+            # As in the live API, records without the field come last in either direction
+            records = sorted(
+                (record for record in records if record.get(field) is not None),
+                key=lambda record: record[field], reverse=direction == "desc"
+            ) + [record for record in records if record.get(field) is None]
+
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        if cursor is not None:
+            # Cursors are opaque to clients; here they simply encode the next offset
+            offset = 0 if cursor == "*" else int(cursor)
+        else:
+            offset = (page - 1) * per_page
+        page_records = records[offset:offset + per_page]
+        next_offset = offset + per_page
+        meta = {"count": len(records), "per_page": per_page}
+        if cursor is not None:
+            meta["next_cursor"] = str(next_offset) if next_offset < len(records) else None
+        else:
+            meta["page"] = page
+        return {"meta": meta, "results": [_project(record, select) for record in page_records]}
+
+    @app.get("/authors/{author_id}")
+    async def get_author(author_id: str, select: str | None = None, mailto: str | None = None):
+        await inject_latency()
+        author = authors_by_id.get(_short_id(author_id))
+        if author is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return _project(author, select)
+
+    @app.get("/authors")
+    async def list_authors(
+        filter: str | None = None, sort: str | None = None,
+        per_page: int = 25, page: int = 1,
+        cursor: str | None = None, select: str | None = None, mailto: str | None = None
+    ):
+        await inject_latency()
+        return list_response(authors, filter, sort, per_page, page, cursor, select)
+
+    @app.get("/works")
+    async def list_works(
+        filter: str | None = None, sort: str | None = None,
+        per_page: int = 25, page: int = 1,
+        cursor: str | None = None, select: str | None = None, mailto: str | None = None
+    ):
+        await inject_latency()
+        return list_response(works, filter, sort, per_page, page, cursor, select)
+
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve OpenAlex fixture data locally.")
+    parser.add_argument("--fixtures-dir", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--certfile", default=None, help="Serve HTTPS (HTTP/2 and HTTP/1.1) with this certificate")
+    parser.add_argument("--keyfile", default=None)
+    args = parser.parse_args()
+    standin_app = create_standin_app(args.fixtures_dir, args.latency_ms / 1000.0)
+
+    if args.certfile:
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+
+        hypercorn_config = Config()
+        hypercorn_config.bind = [f"{args.host}:{args.port}"]
+        hypercorn_config.certfile, hypercorn_config.keyfile = args.certfile, args.keyfile
+        hypercorn_config.alpn_protocols = ["h2", "http/1.1"]
+        hypercorn_config.keep_alive_max_requests = 10 ** 9 # Its default GOAWAY after 1000 streams aborts benchmark runs
+        asyncio.run(serve(standin_app, hypercorn_config))
+    else:
+        import uvicorn
+
+        uvicorn.run(standin_app, host=args.host, port=args.port)
@@ -0,0 +1,46 @@
+import zlib
+
+try: # Optional, faster codec; zlib from the standard library is always available
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Payloads smaller than this are stored as-is; compression gains nothing on them
+MIN_COMPRESS_BYTES = 256
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+def preferred_codec() -> str:
+    return "zstd" if zstandard is not None else "zlib"
+
+def encode_payload(data: str | bytes, codec: str = None) -> tuple[bytes, str]:
+    """
+    Compresses a JSON payload for storage. Returns (stored bytes, codec name);
+    the codec name must be stored alongside so decode_payload can reverse it.
+    """
+    raw = data.encode("utf-8") if isinstance(data, str) else data
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return raw, "identity"
+    codec = codec or preferred_codec()
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw), codec
+    if codec == "zlib":
+        return zlib.compress(raw, ZLIB_LEVEL), codec
+    if codec == "identity":
+        return raw, codec
+    raise ValueError(f"Unknown payload codec '{codec}'")
+
+def decode_payload(stored: str | bytes, codec: str | None) -> str:
+    """
+    Returns the JSON text of a stored payload. Rows written before compression was
+    introduced hold plain text with the "identity" codec.
+    """
+    if codec in (None, "identity"):
+        return stored if isinstance(stored, str) else bytes(stored).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(stored).decode("utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Payload was stored with zstd but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(stored).decode("utf-8")
+    raise ValueError(f"Unknown payload codec '{codec}'")
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio code. Tokens refill continuously at `rate` per second
+    up to `capacity` (the allowed burst).
+
+    acquire() reserves a token immediately and sleeps for whatever time the reservation
+    is in debt, so callers are served in arrival order without holding a lock. That keeps
+    a single instance safe to share process-wide, even across event loops (as in tests).
+    """
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Takes `tokens` from the bucket and returns how many seconds the caller must wait
+        before using them (0.0 if they were available).
+        """
+        self._refill()
+        self._tokens -= tokens
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, tokens: float = 1.0):
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        """
+        Holds back every caller for at least `seconds`, e.g. when the upstream answers
+        429 with a Retry-After header. Never shortens an existing wait.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs the coroutine,
+    later callers for the same key await its outcome (result or exception) instead of
+    starting their own. The key is released as soon as the call finishes, so results
+    are never reused across calls that do not overlap in time.
+    """
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._in_flight.get(key)
+        if future is not None:
+            # shield: a follower being cancelled must not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the outcome as retrieved so an unobserved failure does not log a warning
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
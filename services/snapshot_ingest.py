@@ -0,0 +1,267 @@
+# Bulk ingestion of the OpenAlex snapshot (gzipped JSON-lines partitions under authors/ and works/)
+# for the researchers in our database, as an alternative to the REST API for large institutions.
+#
+#   python -m services.snapshot_ingest --snapshot-dir /data/openalex-snapshot --workers 8
+#
+# Phase 1 runs one worker process per partition file: each streams its file, keeps the records that
+# belong to our researchers and spills them, tagged with the researcher ID, into hash buckets on disk,
+# then sorts each of its spill files by researcher ID. Phase 2 runs in this process, the only database
+# writer: it merges the sorted spill files of one bucket, so the records arrive one researcher at a
+# time, and writes cache rows and bibliometric summaries in large batched transactions. Memory stays
+# bounded by one spill file (workers) and one batch of researchers (writer) rather than by the
+# snapshot or the institution.
+import argparse
+import glob
+import heapq
+import itertools
+import json
+import os
+import gzip
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy.orm import Session
+from database import models
+from database.database_setup import SessionLocal, init_db
+from services import bibliometric_batch, bibliometric_crud, cache_crud
+from services.openalex_service import PROJECTION_PROFILES, citation_head_data_type, projected_data_type
+
+ENTITIES = ("authors", "works")
+
+# Set once per worker process by _init_worker
+_researcher_ids_by_openalex_id: dict[str, int] = {}
+
+def _short_id(openalex_id: str | None) -> str:
+    return (openalex_id or "").rstrip("/").split("/")[-1]
+
+def _init_worker(researcher_ids_by_openalex_id: dict[str, int]):
+    global _researcher_ids_by_openalex_id
+    _researcher_ids_by_openalex_id = researcher_ids_by_openalex_id
+
+def _matching_researcher_ids(entity: str, record: dict) -> set[int]:
+    if entity == "authors":
+        researcher_id = _researcher_ids_by_openalex_id.get(_short_id(record.get("id")))
+        return {researcher_id} if researcher_id is not None else set()
+    return {
+        _researcher_ids_by_openalex_id[author_id]
+        for author_id in (_short_id((a.get("author") or {}).get("id")) for a in record.get("authorships") or [])
+        if author_id in _researcher_ids_by_openalex_id
+    }
+
+def _spill_path(spill_dir: str, entity: str, partition_index: int, bucket: int) -> str:
+    return os.path.join(spill_dir, f"{entity}-{partition_index:05d}-{bucket:03d}.tsv")
+
+def _spill_researcher_id(line: str) -> int:
+    return int(line.partition("\t")[0])
+
+def _sort_spill_file(spill_path: str):
+    """
+    Rewrites a spill file ordered by researcher ID (stable, so partition order is kept per researcher).
+    """
+    with open(spill_path, encoding="utf-8") as spill_file:
+        lines = sorted(spill_file, key=_spill_researcher_id)
+    with open(spill_path, "w", encoding="utf-8") as spill_file:
+        spill_file.writelines(lines)
+
+def filter_partition(task: tuple[str, int, str, str, int]) -> int:
+    """
+    Worker entry point. Streams one gzipped JSON-lines partition and appends each record that
+    belongs to one of our researchers to that researcher's bucket file as "<researcher_id>\t<json>",
+    then sorts each bucket file it wrote by researcher ID. Returns the number of lines written.
+    """
+    entity, partition_index, partition_path, spill_dir, buckets = task
+    spill_files = {}
+    written = 0
+    try:
+        with gzip.open(partition_path, "rt", encoding="utf-8") as partition:
+            for line in partition:
+                if not line.strip():
+                    continue
+                for researcher_id in _matching_researcher_ids(entity, json.loads(line)):
+                    bucket = researcher_id % buckets
+                    if bucket not in spill_files:
+                        spill_files[bucket] = open(
+                            _spill_path(spill_dir, entity, partition_index, bucket), "w", encoding="utf-8"
+                        )
+                    spill_files[bucket].write(f"{researcher_id}\t{line.rstrip()}\n")
+                    written += 1
+    finally:
+        for spill_file in spill_files.values():
+            spill_file.close()
+    for spill_file in spill_files.values():
+        _sort_spill_file(spill_file.name)
+    return written
+
+def _tagged_lines(spill_path: str, entity: str):
+    with open(spill_path, encoding="utf-8") as spill_file:
+        for line in spill_file:
+            yield _spill_researcher_id(line), entity, line
+
+def iter_bucket(spill_dir: str, bucket: int):
+    """
+    Merges the sorted spill files of one bucket and yields (researcher_id, authors, works) one
+    researcher at a time, each as {OpenAlex ID -> record}. A record present in several snapshot
+    partitions keeps its most recently updated copy.
+    """
+    streams = [
+        _tagged_lines(spill_path, entity)
+        for entity in ENTITIES
+        for spill_path in sorted(glob.glob(os.path.join(spill_dir, f"{entity}-*-{bucket:03d}.tsv")))
+    ]
+    merged = heapq.merge(*streams, key=lambda tagged: tagged[0])
+    for researcher_id, tagged_lines in itertools.groupby(merged, key=lambda tagged: tagged[0]):
+        records = {entity: {} for entity in ENTITIES}
+        for _, entity, line in tagged_lines:
+            record = json.loads(line.partition("\t")[2])
+            by_id = records[entity]
+            existing = by_id.get(record.get("id"))
+            if existing is None or (record.get("updated_date") or "") >= (existing.get("updated_date") or ""):
+                by_id[record.get("id")] = record
+        yield researcher_id, records["authors"], records["works"]
+
+def _project(record: dict, fields: list[str]) -> dict:
+    return {field: record.get(field) for field in fields}
+
+def _store_batch(
+    db: Session,
+    researcher_ids: list[int],
+    authors: dict[int, dict[str, dict]],
+    works: dict[int, dict[str, dict]],
+    cache_duration_seconds: int | None
+):
+    """
+    Writes cache rows (full and projected) and summaries for a batch of researchers in one transaction.
+    """
+    profiles = {rid: next(iter(authors[rid].values())) for rid in researcher_ids if authors.get(rid)}
+    works_lists = {rid: list(works.get(rid, {}).values()) for rid in researcher_ids}
+
+    profile_rows = {"author_profile": {rid: json.dumps(p) for rid, p in profiles.items()}}
+    works_rows = {"author_works": works_lists}
+    for projection, fields_by_entity in PROJECTION_PROFILES.items():
+        if "authors" in fields_by_entity:
+            profile_rows[projected_data_type("author_profile", projection)] = {
+                rid: json.dumps(_project(p, fields_by_entity["authors"])) for rid, p in profiles.items()
+            }
+        if "works" in fields_by_entity:
+            works_rows[projected_data_type("author_works", projection)] = {
+                rid: [_project(w, fields_by_entity["works"]) for w in work_list]
+                for rid, work_list in works_lists.items()
+            }
+
+    # Summaries read the summary works as a citation head, which a complete list also is
+    works_rows[citation_head_data_type("summary")] = works_rows.pop(projected_data_type("author_works", "summary"))
+
+    for data_type, rows in profile_rows.items():
+        if rows:
+            cache_crud.store_openalex_data_bulk(db, data_type, rows, cache_duration_seconds, commit=False)
+    summary_cache_ids = {}
+    for data_type, works_by_researcher in works_rows.items():
+        # Co-authored works are stored once in the shared work store
+        entries = cache_crud.store_author_works_bulk(db, data_type, works_by_researcher, cache_duration_seconds, commit=False)
+        if data_type == citation_head_data_type("summary"):
+            summary_cache_ids = {entry.researcher_id: entry.id for entry in entries}
+
+    # Indicators for the whole batch in one vectorized pass
+    citation_lists = [
+        [w["cited_by_count"] for w in work_list if w.get("cited_by_count") is not None] for work_list in works_lists.values()
+    ]
+    first_years = [
+        min((w["publication_year"] for w in work_list if w.get("publication_year")), default=None)
+        for work_list in works_lists.values()
+    ]
+    summaries = {}
+    for (rid, work_list), indicators in zip(
+        works_lists.items(), bibliometric_batch.indicators_per_researcher(citation_lists, first_years)
+    ):
+        profile = profiles.get(rid) or {}
+        summaries[rid] = {
+            **indicators, # The citation index is built by the first incremental refresh
+            'total_publications': profile.get('works_count', len(work_list)),
+            'total_citations': profile.get('cited_by_count', indicators['total_citations']),
+        }
+    bibliometric_crud.bulk_upsert_bibliometric_summaries(db, summaries, summary_cache_ids, commit=False)
+
+    db.commit()
+    db.expunge_all() # Nothing from this batch is needed again; release it
+
+def find_partitions(snapshot_dir: str, entity: str) -> list[str]:
+    """
+    Lists the .gz partitions of an entity, accepting either the snapshot root or its data/ directory.
+    """
+    for base_dir in (os.path.join(snapshot_dir, "data"), snapshot_dir):
+        entity_dir = os.path.join(base_dir, entity)
+        if os.path.isdir(entity_dir):
+            return sorted(glob.glob(os.path.join(entity_dir, "**", "*.gz"), recursive=True))
+    return []
+
+def ingest_snapshot(
+    db: Session,
+    snapshot_dir: str,
+    workers: int = None,
+    batch_size: int = 500,
+    buckets: int = 16,
+    cache_duration_seconds: int | None = None # None: as long as cache_crud.ttl_policy decides
+) -> dict:
+    """
+    Loads snapshot authors and works for every researcher with an OpenAlex ID.
+    Returns counts of partitions scanned, records matched and researchers written.
+    """
+    researcher_ids_by_openalex_id = {
+        _short_id(openalex_id): researcher_id
+        for researcher_id, openalex_id in db.query(models.Researcher.id, models.Researcher.openalex_id).filter(
+            models.Researcher.openalex_id.isnot(None)
+        )
+    }
+    stats = {"partitions": 0, "records_matched": 0, "researchers_written": 0}
+    if not researcher_ids_by_openalex_id:
+        return stats
+
+    with tempfile.TemporaryDirectory(prefix="openalex-ingest-") as spill_dir:
+        tasks = [
+            (entity, index, partition_path, spill_dir, buckets)
+            for entity in ENTITIES
+            for index, partition_path in enumerate(find_partitions(snapshot_dir, entity))
+        ]
+        stats["partitions"] = len(tasks)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(researcher_ids_by_openalex_id,)
+        ) as executor:
+            stats["records_matched"] = sum(executor.map(filter_partition, tasks))
+
+        for bucket in range(buckets):
+            researcher_ids, authors, works = [], {}, {}
+            written = 0
+            for researcher_id, researcher_authors, researcher_works in iter_bucket(spill_dir, bucket):
+                researcher_ids.append(researcher_id)
+                authors[researcher_id], works[researcher_id] = researcher_authors, researcher_works
+                if len(researcher_ids) == batch_size:
+                    _store_batch(db, researcher_ids, authors, works, cache_duration_seconds)
+                    written += len(researcher_ids)
+                    researcher_ids, authors, works = [], {}, {} # Only one batch is held at a time
+            if researcher_ids:
+                _store_batch(db, researcher_ids, authors, works, cache_duration_seconds)
+                written += len(researcher_ids)
+            stats["researchers_written"] += written
+            print(f"Bucket {bucket + 1}/{buckets}: wrote {written} researchers")
+
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest OpenAlex snapshot data for our researchers.")
+    parser.add_argument("--snapshot-dir", required=True, help="Snapshot root (containing data/authors, data/works)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Researchers per transaction (and held in memory)")
+    parser.add_argument("--buckets", type=int, default=16, help="Spill buckets; more buckets make smaller spill files to sort")
+    parser.add_argument("--cache-duration-seconds", type=int, default=None)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        result = ingest_snapshot(
+            db, args.snapshot_dir, args.workers, args.batch_size, args.buckets, args.cache_duration_seconds
+        )
+    finally:
+        db.close()
+    print(f"Scanned {result['partitions']} partitions, matched {result['records_matched']} records, "
+          f"wrote {result['researchers_written']} researchers.")
@@ -0,0 +1,73 @@
+import hashlib
+
+def parse_ttl_overrides(text: str) -> dict[str, int]:
+    """
+    Parses "author_profile=604800,author_works:summary=43200" into a data type -> seconds mapping.
+    """
+    overrides = {}
+    for item in text.split(","):
+        if item.strip():
+            data_type, _, seconds = item.partition("=")
+            overrides[data_type.strip()] = int(seconds)
+    return overrides
+
+def payload_hash(data: str) -> str:
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+def next_refresh_streak(previous_hash: str | None, new_hash: str, streak: int | None) -> int:
+    """
+    Streak of a cache entry after a refresh: n > 0 after n consecutive refreshes that returned
+    the same payload, -n after n consecutive ones that changed it, 0 for a first fetch.
+    """
+    streak = streak or 0
+    if previous_hash is None:
+        return 0
+    if previous_hash == new_hash:
+        return streak + 1 if streak > 0 else 1
+    return streak - 1 if streak < 0 else -1
+
+class TTLPolicy:
+    """
+    Decides how long a cache entry stays fresh. Each data type has a base TTL: its own entry in
+    seconds_by_type, else that of its unprojected type ("author_works" for "author_works:summary"),
+    else default_seconds. In adaptive mode the TTL follows the entry's refresh streak: once the
+    payload has come back unchanged stable_after times in a row, each further unchanged refresh
+    multiplies the TTL by factor (dormant researchers are fetched less often); each consecutive
+    change divides it by factor (active ones are fetched more often). Adaptive TTLs stay within
+    [min_seconds, max_seconds].
+    """
+    def __init__(
+        self,
+        default_seconds: int,
+        seconds_by_type: dict[str, int] = None,
+        adaptive: bool = False,
+        min_seconds: int = 3600,
+        max_seconds: int = 14 * 86400,
+        stable_after: int = 2,
+        factor: float = 2.0
+    ):
+        self.default_seconds = default_seconds
+        self.seconds_by_type = seconds_by_type or {}
+        self.adaptive = adaptive
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.stable_after = stable_after
+        self.factor = factor
+
+    def base_ttl(self, data_type: str) -> int:
+        if data_type in self.seconds_by_type:
+            return self.seconds_by_type[data_type]
+        return self.seconds_by_type.get(data_type.partition(":")[0], self.default_seconds)
+
+    def ttl_for(self, data_type: str, refresh_streak: int = 0) -> int:
+        base = self.base_ttl(data_type)
+        if not self.adaptive:
+            return base
+        if refresh_streak >= self.stable_after:
+            ttl = base * self.factor ** (refresh_streak - self.stable_after + 1)
+        elif refresh_streak < 0:
+            ttl = base / self.factor ** -refresh_streak
+        else:
+            return base
+        # Adaptation never overrides a configured base TTL outside the bounds
+        return int(max(min(base, self.min_seconds), min(max(base, self.max_seconds), ttl)))
@@ -0,0 +1,59 @@
+# Memoizes parsed OpenAlex payloads and their cache entry IDs for one logical operation (an API
+# request or a job), so that when several services need the same researcher's profile or works,
+# the cache row is read and decoded once. The memo lives in a context variable: concurrent requests
+# each see their own, and tasks started inside a unit of work share it unless they detach().
+# Within a unit of work a payload is not re-checked for expiry; writes through cache_crud replace
+# the memoized copy.
+import contextvars
+import functools
+from contextlib import contextmanager
+
+_current: contextvars.ContextVar[dict | None] = contextvars.ContextVar("openalex_unit_of_work", default=None)
+
+@contextmanager
+def unit_of_work():
+    """
+    Opens a unit of work for the enclosed code. Nested units join the outermost one.
+    """
+    if _current.get() is not None:
+        yield
+        return
+    token = _current.set({})
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+def in_unit_of_work(fn):
+    """
+    Decorator running an async function in a unit of work (joining the caller's, if any),
+    for service operations that also run outside API requests.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with unit_of_work():
+            return await fn(*args, **kwargs)
+    return wrapper
+
+def detach():
+    """
+    Leaves the unit of work in the current context, e.g. in a background task that outlives the request.
+    """
+    _current.set(None)
+
+def recall(researcher_id: int, data_type: str) -> tuple[object, int | None] | None:
+    """
+    Returns (payload, cache entry ID) memoized in the current unit of work, or None.
+    """
+    memo = _current.get()
+    return memo.get((researcher_id, data_type)) if memo is not None else None
+
+def remember(researcher_id: int, data_type: str, payload: object, cache_entry_id: int | None):
+    memo = _current.get()
+    if memo is not None and payload is not None:
+        memo[(researcher_id, data_type)] = (payload, cache_entry_id)
+
+def forget(researcher_id: int, data_type: str):
+    memo = _current.get()
+    if memo is not None:
+        memo.pop((researcher_id, data_type), None)
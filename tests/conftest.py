@@ -8,6 +8,7 @@ from sqlalchemy.pool import StaticPool # Use StaticPool for SQLite in-memory or
 from main import app # Main FastAPI application
 from database.database_setup import Base, SQLALCHEMY_DATABASE_URL as MAIN_SQLALCHEMY_DATABASE_URL
 from auth.auth_handler import get_db # The dependency we need to override
+from services import cache_crud
 
 # --- Test Database Configuration ---
 # Use a different database for testing (in-memory SQLite or a test file)
@@ -49,6 +50,7 @@ def init_test_db(engine_test_fixture):
     """
     Base.metadata.drop_all(bind=engine_test_fixture)
     Base.metadata.create_all(bind=engine_test_fixture)
+    cache_crud.memory_cache.clear() # Parsed payloads from earlier tests refer to dropped rows
     yield # Test runs here
     # Teardown can be added here if needed after each test,
     # but drop_all/create_all at the start of each test ensures isolation.
@@ -0,0 +1,100 @@
+import json
+import math
+
+import numpy as np
+import pytest
+
+from database import models
+from services import bibliometric_service, cache_crud
+from services.bibliometric_batch import CitationBatch, compute_batch_metrics, indicators_per_researcher
+from services.bibliometric_utils import calculate_citation_metrics, calculate_h_index, calculate_i10_index
+from services.citation_index import CitationIndex
+
+CITATION_LISTS = [
+    [],
+    [0, 0, 0],
+    [10, 8, 5, 4, 3],
+    [1, 2, 3, 4, 5],
+    [100],
+    [25, 8, 5, 3, 3],
+    [10, 10, 1, 1],
+]
+
+def make_researcher(db, index):
+    user = models.User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name=str(index), openalex_id=f"A{index}")
+    db.add(researcher)
+    db.commit()
+    return researcher
+
+def test_batch_matches_single_researcher_functions():
+    metrics = compute_batch_metrics(CitationBatch.from_lists(CITATION_LISTS))
+
+    assert metrics["h_index"].tolist() == [calculate_h_index(counts) for counts in CITATION_LISTS]
+    assert metrics["i10_index"].tolist() == [calculate_i10_index(counts) for counts in CITATION_LISTS]
+    assert metrics["total_citations"].tolist() == [sum(counts) for counts in CITATION_LISTS]
+    assert metrics["publications"].tolist() == [len(counts) for counts in CITATION_LISTS]
+
+def test_negative_and_missing_counts_match_the_scalar_kernel_and_index():
+    citation_lists = [[-5, 3], [3, None, 12, -1], [None], [-2, -2], [40, 11, None, 0, 2]]
+
+    metrics = compute_batch_metrics(CitationBatch.from_lists(citation_lists))
+
+    for position, counts in enumerate(citation_lists):
+        present = [citations for citations in counts if citations is not None]
+        scalar = calculate_citation_metrics(present)
+        index = CitationIndex.from_works(counts)
+        for name in ("h_index", "i10_index", "g_index", "total_citations"):
+            assert metrics[name][position] == scalar[name]
+        assert (metrics["h_index"][position], metrics["g_index"][position]) == (index.h_index(), index.g_index())
+        assert metrics["total_citations"][position] == index.total_citations
+        assert metrics["publications"][position] == len(present)
+    assert metrics["h_index"][0] == 1 # [-5, 3] reads as [0, 3]
+
+def test_negative_values_do_not_leak_into_the_previous_researcher():
+    batch = CitationBatch(values=np.array([3, 3, -5, 3], dtype=np.int64), offsets=np.array([0, 2, 4], dtype=np.int64))
+
+    assert compute_batch_metrics(batch)["h_index"].tolist() == [2, 1]
+
+@pytest.mark.parametrize("citations, expected_g_index", [
+    ([], 0),
+    ([0, 0], 0),
+    ([10, 8, 5, 4, 3], 5), # 30 citations >= 25
+    ([100], 1), # Capped at the number of publications
+    ([4, 1, 1, 1], 2), # 5 >= 4, 6 < 9
+])
+def test_g_index(citations, expected_g_index):
+    assert compute_batch_metrics(CitationBatch.from_lists([citations]))["g_index"].tolist() == [expected_g_index]
+
+def test_m_quotient_divides_h_index_by_career_years():
+    indicators = indicators_per_researcher([[10, 8, 5, 4, 3], [5, 5, 5], [1]], [2015, 2024, None], current_year=2024)
+
+    assert indicators[0]["m_quotient"] == 0.4 # h=4 over 10 years
+    assert indicators[1]["m_quotient"] == 3.0 # First year counts as a full year
+    assert indicators[2]["m_quotient"] is None
+    assert math.isnan(compute_batch_metrics(CitationBatch.from_lists([[1]]))["m_quotient"][0]) # Years not given
+
+def test_recompute_summaries_from_cached_works(db_session_test):
+    alice, bob = make_researcher(db_session_test, 1), make_researcher(db_session_test, 2)
+    works = [{"id": f"W{i}", "cited_by_count": count, "publication_year": 2010 + i} for i, count in enumerate([12, 3, 1])]
+    cache_crud.store_author_works(db_session_test, alice.id, "author_works:summary_head", works, 3600)
+    cache_crud.store_author_works(db_session_test, bob.id, "author_works:summary_head", works[1:], 3600)
+    cache_crud.store_openalex_data(
+        db_session_test, alice.id, "author_profile:summary", json.dumps({"id": "A1", "works_count": 40, "cited_by_count": 90}), 3600
+    )
+
+    assert bibliometric_service.recompute_bibliometric_summaries(db_session_test) == 2
+
+    summaries = {summary.researcher_id: summary for summary in db_session_test.query(models.BibliometricSummary)}
+    assert (summaries[alice.id].h_index, summaries[alice.id].i10_index, summaries[alice.id].g_index) == (2, 1, 3)
+    assert (summaries[alice.id].total_publications, summaries[alice.id].total_citations) == (40, 90)
+    # Bob's cached works may be only his most cited ones, so without a profile his totals stay unknown
+    assert (summaries[bob.id].h_index, summaries[bob.id].total_publications, summaries[bob.id].total_citations) == (1, None, None)
+
+    summaries[bob.id].total_publications, summaries[bob.id].total_citations = 30, 70 # From an earlier full summary
+    db_session_test.commit()
+    bibliometric_service.recompute_bibliometric_summaries(db_session_test, [bob.id])
+    db_session_test.refresh(summaries[bob.id])
+    assert (summaries[bob.id].total_publications, summaries[bob.id].total_citations) == (30, 70)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from database import models
+from services import bibliometric_service, bibliometric_timeseries, cache_crud, openalex_records
+from services.bibliometric_utils import calculate_h_index
+from services.openalex_records import WorkRecord, YearCountRecord
+
+def make_works(rng, count, first_year, last_year):
+    works = []
+    for i in range(count):
+        published = rng.randint(first_year - 5, last_year)
+        received = {year: rng.randint(0, 8) for year in range(max(published, first_year), last_year + 1)}
+        works.append(WorkRecord(
+            id=f"https://openalex.org/W{i}",
+            cited_by_count=sum(received.values()) + rng.randint(0, 20), # Plus citations from before the window
+            publication_year=published,
+            counts_by_year=[YearCountRecord(year=year, cited_by_count=count) for year, count in received.items() if count],
+        ))
+    return works
+
+def citations_at_end_of(work, year):
+    return work.cited_by_count - sum(counts.cited_by_count for counts in work.counts_by_year if counts.year > year)
+
+def test_yearly_h_index_matches_per_year_recompute():
+    rng = random.Random(5)
+    works = make_works(rng, 120, 2015, 2024)
+
+    h_series = bibliometric_timeseries.yearly_h_index(works, 2015, 2024)
+
+    assert h_series == [
+        calculate_h_index([citations_at_end_of(work, year) for work in works if work.publication_year <= year])
+        for year in range(2015, 2025)
+    ]
+    assert h_series == sorted(h_series) # Citations only accumulate
+
+def test_build_timeseries_fills_missing_years_with_zero():
+    author_counts = [
+        YearCountRecord(year=2024, works_count=3, cited_by_count=40),
+        YearCountRecord(year=2021, works_count=1, cited_by_count=7),
+    ]
+
+    series = bibliometric_timeseries.build_timeseries(author_counts, [])
+
+    assert series["first_year"] == 2021
+    assert series["works_count"] == [1, 0, 0, 3]
+    assert series["cited_by_count"] == [7, 0, 0, 40]
+    assert series["h_index"] == [0, 0, 0, 0]
+    assert bibliometric_timeseries.build_timeseries(None, [])["first_year"] is None
+
+def test_series_pack_into_eight_bytes_per_year():
+    packed = bibliometric_timeseries.pack_series([0, 5, 2 ** 40])
+
+    assert len(packed) == 24
+    assert bibliometric_timeseries.unpack_series(packed) == [0, 5, 2 ** 40]
+    assert bibliometric_timeseries.unpack_series(None) == []
+
+@pytest.mark.asyncio
+async def test_generated_series_are_served_from_the_stored_row(db_session_test, mocker):
+    user = models.User(username="ts", email="ts@example.com", hashed_password="x")
+    db_session_test.add(user)
+    db_session_test.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name="T", openalex_id="A1")
+    db_session_test.add(researcher)
+    db_session_test.commit()
+    works = make_works(random.Random(8), 30, 2020, 2024)
+    author = openalex_records.author_from_dict({"id": "A1", "counts_by_year": [
+        {"year": year, "works_count": 2, "cited_by_count": 10 * (year - 2019)} for year in range(2020, 2025)
+    ]})
+    mocker.patch.object(bibliometric_service.openalex_service, "fetch_and_cache_researcher_openalex_profile", return_value=author)
+    requested = []
+
+    async def pages(openalex_author_id, email=None, select=None):
+        requested.append(select)
+        for start in range(0, len(works), 7): # Streamed a page at a time, as from OpenAlex
+            yield [openalex_records.to_dict(work) for work in works[start:start + 7]]
+
+    mocker.patch.object(bibliometric_service.openalex_service, "iter_author_works_from_openalex", new=pages)
+
+    await bibliometric_service.generate_researcher_bibliometric_timeseries(db_session_test, researcher)
+
+    assert requested == ["id,cited_by_count,publication_year,counts_by_year"]
+    stored = db_session_test.query(models.BibliometricTimeSeries).one()
+    assert len(stored.h_index_by_year) == 5 * 8
+    series = bibliometric_timeseries.series_from_row(stored)
+    assert series["years"] == [2020, 2021, 2022, 2023, 2024]
+    assert series["cited_by_count"] == [10, 20, 30, 40, 50]
+    assert series["h_index"] == bibliometric_timeseries.yearly_h_index(works, 2020, 2024)
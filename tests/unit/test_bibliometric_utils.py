@@ -1,5 +1,7 @@
+import math
+
 import pytest
-from services.bibliometric_utils import calculate_h_index, calculate_i10_index
+from services.bibliometric_utils import calculate_citation_metrics, calculate_h_index, calculate_i10_index
 
 # Test cases for h-index
 @pytest.mark.parametrize("citations, expected_h_index", [
@@ -44,3 +46,19 @@ def test_calculate_i10_index_with_unsorted_citations():
     citations = [5, 30, 8, 12, 10]
     expected_i10_index = 3
     assert calculate_i10_index(citations) == expected_i10_index
+
+# Test cases for the combined kernel: (h, i10, g, e, total)
+@pytest.mark.parametrize("citations, expected", [
+    ([], (0, 0, 0, 0.0, 0)),
+    ([0, 0, 0], (0, 0, 0, 0.0, 0)),
+    ([10, 8, 5, 4, 3], (4, 1, 5, math.sqrt(11), 30)), # h-core citations 10+8+5+4 = 27 = 4^2 + 11
+    ([100], (1, 1, 1, math.sqrt(99), 100)), # g capped at the number of publications
+    ([4, 1, 1, 1], (1, 0, 2, math.sqrt(3), 7)),
+    ([5, 5, 5, 5, 5], (5, 0, 5, 0.0, 25)),
+    ([1, 2, 3, 4, 5], (3, 0, 3, math.sqrt(3), 15)), # Unsorted input
+])
+def test_calculate_citation_metrics(citations, expected):
+    metrics = calculate_citation_metrics(citations)
+    assert (
+        metrics['h_index'], metrics['i10_index'], metrics['g_index'], metrics['e_index'], metrics['total_citations']
+    ) == pytest.approx(expected)
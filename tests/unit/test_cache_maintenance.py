@@ -0,0 +1,98 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from database import models
+from services import cache_crud, cache_maintenance
+
+def make_researcher(db, index):
+    user = models.User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name=str(index), openalex_id=f"A{index}")
+    db.add(researcher)
+    db.commit()
+    return researcher
+
+def store(db, researcher, data_type, cache_duration_seconds, size=10):
+    return cache_crud.store_openalex_data(
+        db, researcher.id, data_type, json.dumps({"padding": "x" * size}), cache_duration_seconds
+    )
+
+def test_delete_expired_entries_respects_grace_period_and_unlinks_summaries(db_session_test):
+    researcher = make_researcher(db_session_test, 1)
+    long_expired = store(db_session_test, researcher, "author_works", -7200)
+    recently_expired = store(db_session_test, researcher, "author_profile", -60)
+    fresh = store(db_session_test, researcher, "author_profile:summary", 3600)
+    summary = models.BibliometricSummary(researcher_id=researcher.id, last_updated_from_cache_id=long_expired.id)
+    db_session_test.add(summary)
+    db_session_test.commit()
+
+    deleted = cache_maintenance.delete_expired_entries(db_session_test, grace_seconds=3600, batch_size=1)
+
+    assert deleted == 1
+    remaining = {entry.id for entry in db_session_test.query(models.OpenAlexDataCache)}
+    assert remaining == {recently_expired.id, fresh.id}
+    db_session_test.refresh(summary)
+    assert summary.last_updated_from_cache_id is None
+
+def test_sweeping_an_entry_unlinks_the_time_series_built_from_it(db_session_test):
+    researcher = make_researcher(db_session_test, 1)
+    expired = store(db_session_test, researcher, "author_profile:timeseries", -7200)
+    timeseries = models.BibliometricTimeSeries(
+        researcher_id=researcher.id, first_year=None, works_by_year=b"", citations_by_year=b"",
+        h_index_by_year=b"", last_updated_from_cache_id=expired.id
+    )
+    db_session_test.add(timeseries)
+    db_session_test.commit()
+    db_session_test.execute(text("PRAGMA foreign_keys = ON")) # Enforced like PostgreSQL would
+    try:
+        deleted = cache_maintenance.delete_expired_entries(db_session_test, grace_seconds=3600)
+    finally:
+        db_session_test.execute(text("PRAGMA foreign_keys = OFF"))
+
+    assert deleted == 1
+    db_session_test.refresh(timeseries)
+    assert timeseries.last_updated_from_cache_id is None
+
+def test_enforce_size_budget_evicts_least_recently_accessed(db_session_test):
+    researchers = [make_researcher(db_session_test, index) for index in range(3)]
+    entries = [store(db_session_test, researcher, "author_profile", 3600) for researcher in researchers]
+    now = datetime.now(timezone.utc)
+    for age_hours, entry in zip([1, 3, 2], entries):
+        entry.last_accessed_at = now - timedelta(hours=age_hours)
+    db_session_test.commit()
+    budget = sum(entry.payload_size for entry in entries) - 1
+
+    evicted = cache_maintenance.enforce_size_budget(db_session_test, max_bytes=budget)
+
+    assert evicted == 1
+    remaining = {entry.researcher_id for entry in db_session_test.query(models.OpenAlexDataCache)}
+    assert remaining == {researchers[0].id, researchers[2].id}
+
+def test_enforce_size_budget_counts_shared_works(db_session_test):
+    rng = random.Random(3)
+    idle, active = make_researcher(db_session_test, 1), make_researcher(db_session_test, 2)
+    for researcher, work_ids in ((idle, ["W1", "W2", "W3"]), (active, ["W4"])):
+        works = [{"id": work_id, "abstract": rng.randbytes(2000).hex()} for work_id in work_ids]
+        cache_crud.store_author_works(db_session_test, researcher.id, "author_works", works, 3600)
+    lists = {entry.researcher_id: entry for entry in db_session_test.query(models.OpenAlexDataCache)}
+    lists[idle.id].last_accessed_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    lists[active.id].last_accessed_at = datetime.now(timezone.utc)
+    db_session_test.commit()
+    work_sizes = {work.work_id: work.payload_size for work in db_session_test.query(models.OpenAlexWork)}
+    list_bytes = sum(entry.payload_size for entry in lists.values())
+    assert min(work_sizes.values()) > list_bytes
+    budget = list_bytes + work_sizes["W4"] + work_sizes["W1"] # The lists alone fit many times over
+
+    deleted = cache_maintenance.enforce_size_budget(db_session_test, max_bytes=budget)
+
+    assert deleted == 4 # The idle list, then the three works only it referenced
+    assert [entry.researcher_id for entry in db_session_test.query(models.OpenAlexDataCache)] == [active.id]
+    assert [work.work_id for work in db_session_test.query(models.OpenAlexWork)] == ["W4"]
+
+def test_enforce_size_budget_is_disabled_by_zero(db_session_test):
+    store(db_session_test, make_researcher(db_session_test, 1), "author_profile", 3600)
+    assert cache_maintenance.enforce_size_budget(db_session_test, max_bytes=0) == 0
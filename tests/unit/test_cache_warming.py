@@ -0,0 +1,102 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from database import models
+from services import cache_crud, cache_warming, lease_crud
+
+def make_researcher(db, index):
+    user = models.User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name=str(index), openalex_id=f"A{index}")
+    db.add(researcher)
+    db.commit()
+    return researcher
+
+def store(db, researcher, data_type, cache_duration_seconds, accessed_seconds_ago):
+    entry = cache_crud.store_openalex_data(db, researcher.id, data_type, json.dumps({"id": researcher.openalex_id}), cache_duration_seconds)
+    entry.last_accessed_at = datetime.now(timezone.utc) - timedelta(seconds=accessed_seconds_ago)
+    db.commit()
+    return entry
+
+def test_lease_is_exclusive_until_released_or_expired(db_session_test):
+    assert lease_crud.acquire_lease(db_session_test, "job", "worker-a", 60)
+    assert lease_crud.acquire_lease(db_session_test, "job", "worker-a", 60) # Renewal by the holder
+    assert not lease_crud.acquire_lease(db_session_test, "job", "worker-b", 60)
+
+    lease_crud.release_lease(db_session_test, "job", "worker-a")
+    assert lease_crud.acquire_lease(db_session_test, "job", "worker-b", -1) # Taken, but already expired
+    assert lease_crud.acquire_lease(db_session_test, "job", "worker-a", 60) # Expired leases can be taken over
+
+def test_find_entries_to_warm_selects_recently_read_entries_near_expiry(db_session_test):
+    researchers = [make_researcher(db_session_test, index) for index in range(4)]
+    store(db_session_test, researchers[0], "author_profile", 300, accessed_seconds_ago=600)
+    store(db_session_test, researchers[1], "author_works:summary", 300, accessed_seconds_ago=60)
+    store(db_session_test, researchers[2], "author_profile", 86400, accessed_seconds_ago=60) # Not expiring soon
+    store(db_session_test, researchers[3], "author_profile", 300, accessed_seconds_ago=10 * 86400) # Not read lately
+
+    entries = cache_warming.find_entries_to_warm(db_session_test, horizon_seconds=900, access_window_seconds=86400, limit=10)
+
+    assert entries == [(researchers[1].id, "author_works:summary"), (researchers[0].id, "author_profile")]
+    assert cache_warming.find_entries_to_warm(db_session_test, 900, 86400, limit=1) == entries[:1]
+
+def test_memory_tier_hits_are_recorded_at_most_once_per_interval(db_session_test):
+    researcher = make_researcher(db_session_test, 1)
+    entry = store(db_session_test, researcher, "author_profile", 3600, accessed_seconds_ago=2 * 86400)
+    cache_crud._memory_hit_touches.clear()
+    cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_profile") # Read from the row
+    long_ago = datetime.now(timezone.utc) - timedelta(days=2)
+
+    def last_accessed_after_memory_hit():
+        db_session_test.query(models.OpenAlexDataCache).update({"last_accessed_at": long_ago})
+        db_session_test.commit()
+        assert cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_profile")[1] == entry.id
+        db_session_test.expire_all()
+        return cache_crud._as_utc(db_session_test.get(models.OpenAlexDataCache, entry.id).last_accessed_at)
+
+    assert last_accessed_after_memory_hit() == long_ago # A memory hit; the row read moments ago counts
+    cache_crud._memory_hit_touches[entry.id] -= cache_crud.MEMORY_HIT_TOUCH_INTERVAL_SECONDS
+    assert last_accessed_after_memory_hit() > long_ago
+
+@pytest.mark.asyncio
+async def test_warm_entries_batches_profiles_and_refreshes_works_incrementally(db_session_test, mocker):
+    researchers = [make_researcher(db_session_test, index) for index in range(3)]
+    fetch_profiles = mocker.patch(
+        "services.cache_warming.openalex_service.fetch_and_cache_researchers_openalex_profiles", return_value={}
+    )
+    fetch_works = mocker.patch(
+        "services.cache_warming.openalex_service.fetch_and_cache_researcher_openalex_works", return_value=[]
+    )
+
+    warmed = await cache_warming.warm_entries(db_session_test, [
+        (researchers[0].id, "author_profile"),
+        (researchers[1].id, "author_profile"),
+        (researchers[2].id, "author_works:summary_head"),
+    ])
+
+    assert warmed == 2
+    fetch_profiles.assert_awaited_once_with(db_session_test, researchers[:2], force_refresh=True, projection=None)
+    fetch_works.assert_awaited_once_with(
+        db_session_test, researchers[2], projection="summary", incremental=True, allow_stale=False, force_refresh=True,
+        citation_head=True
+    )
+
+@pytest.mark.asyncio
+async def test_warming_does_not_count_as_a_read(db_session_test, mocker):
+    researcher = make_researcher(db_session_test, 1)
+    store(db_session_test, researcher, "author_profile", 300, accessed_seconds_ago=2 * 3600)
+    mocker.patch(
+        "services.cache_warming.openalex_service.get_openalex_authors_data_batch", return_value={"A1": {"id": "A1"}}
+    )
+    assert cache_warming.find_entries_to_warm(db_session_test, 900, access_window_seconds=3 * 3600, limit=10)
+
+    assert await cache_warming.warm_entries(db_session_test, [(researcher.id, "author_profile")]) == 1
+
+    db_session_test.expire_all()
+    entry = db_session_test.query(models.OpenAlexDataCache).one()
+    assert cache_crud._as_utc(entry.expires_at) > datetime.now(timezone.utc) + timedelta(seconds=900) # Refreshed
+    # Still read two hours ago, so it drops out once the access window no longer covers that read
+    assert cache_warming.find_entries_to_warm(db_session_test, 10 ** 7, access_window_seconds=3 * 3600, limit=10)
+    assert cache_warming.find_entries_to_warm(db_session_test, 10 ** 7, access_window_seconds=3600, limit=10) == []
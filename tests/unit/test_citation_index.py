@@ -0,0 +1,122 @@
+import json
+import random
+
+import pytest
+
+from database import models
+from services import bibliometric_service, cache_crud
+from services.bibliometric_utils import calculate_citation_metrics
+from services.citation_index import CitationIndex
+
+def make_researcher(db, index):
+    user = models.User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name=str(index), openalex_id=f"A{index}")
+    db.add(researcher)
+    db.commit()
+    return researcher
+
+def assert_matches_full_recompute(index, citation_counts):
+    metrics = calculate_citation_metrics(citation_counts)
+    assert (index.h_index(), index.i10_index, index.g_index(), index.total_citations, index.publications) == (
+        metrics['h_index'], metrics['i10_index'], metrics['g_index'], metrics['total_citations'], len(citation_counts)
+    )
+
+def test_updates_match_full_recompute():
+    rng = random.Random(3)
+    citation_counts = [rng.randint(0, 50) for _ in range(20)]
+    index = CitationIndex.from_works(citation_counts)
+    for step in range(300): # Adds push it past its initial capacity; large counts go to the overflow
+        action = rng.random()
+        if action < 0.4:
+            citation_counts.append(rng.choice([0, 3, 40, 5000]))
+            index.add(citation_counts[-1])
+        elif action < 0.6:
+            index.remove(citation_counts.pop(rng.randrange(len(citation_counts))))
+        else:
+            position, new_count = rng.randrange(len(citation_counts)), rng.randint(0, 300)
+            index.replace(citation_counts[position], new_count)
+            citation_counts[position] = new_count
+        if step % 50 == 0:
+            index = CitationIndex.from_bytes(index.to_bytes())
+        assert_matches_full_recompute(index, citation_counts)
+
+def test_works_without_citation_count_are_left_out():
+    index = CitationIndex.from_works([100])
+    index.add(None)
+    index.replace(None, 4)
+
+    assert_matches_full_recompute(index, [100, 4])
+
+def test_m_quotient_uses_earliest_publication_year():
+    index = CitationIndex.from_works([10, 8, 5, 4, 3], [2016])
+    index.note_publication_year(2015)
+    index.note_publication_year(None)
+
+    assert index.m_quotient(current_year=2024) == 0.4
+
+@pytest.mark.asyncio
+async def test_incremental_refresh_applies_only_changed_works(db_session_test, mocker):
+    researcher = make_researcher(db_session_test, 1)
+    works = [{"id": f"W{i}", "cited_by_count": count, "publication_year": 2020} for i, count in enumerate([5, 4, 3, 1])]
+    cache_crud.store_author_works(db_session_test, researcher.id, "author_works:summary_head", works, 3600)
+    cache_crud.store_openalex_data(
+        db_session_test, researcher.id, "author_profile:summary", json.dumps({"id": "A1", "works_count": 4, "cited_by_count": 13}), 3600
+    )
+    bibliometric_service.recompute_bibliometric_summaries(db_session_test, [researcher.id])
+    assert db_session_test.query(models.BibliometricSummary).one().citation_index is None # Built on first refresh
+    mocker.patch.object(
+        bibliometric_service.openalex_service, "get_author_works_updated_since", return_value=[
+            {"id": "W3", "cited_by_count": 4, "publication_year": 2020}, # Changed
+            {"id": "W0", "cited_by_count": 5, "publication_year": 2020}, # Re-fetched, unchanged
+            {"id": "W4", "cited_by_count": 9, "publication_year": 2018}, # New
+        ]
+    )
+    store_works = mocker.spy(cache_crud, "store_works")
+
+    assert await bibliometric_service.refresh_summary_incrementally(db_session_test, researcher) == "updated"
+
+    summary = db_session_test.query(models.BibliometricSummary).one()
+    assert (summary.h_index, summary.total_publications) == (4, 4)
+    assert CitationIndex.from_bytes(summary.citation_index).work_citations == {"W0": 5, "W1": 4, "W2": 3, "W3": 4, "W4": 9}
+    assert [work["id"] for work in store_works.call_args.args[2]] == ["W3", "W4"]
+    works_after, _ = cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_works:summary_head")
+    assert [(work.id, work.cited_by_count) for work in works_after] == [("W0", 5), ("W1", 4), ("W2", 3), ("W3", 4), ("W4", 9)]
+
+    bibliometric_service.openalex_service.get_author_works_updated_since.return_value = []
+    assert await bibliometric_service.refresh_summary_incrementally(db_session_test, researcher) == "unchanged"
+
+@pytest.mark.asyncio
+async def test_co_authors_both_apply_a_shared_work_change(db_session_test, mocker):
+    first, second = make_researcher(db_session_test, 1), make_researcher(db_session_test, 2)
+    cache_crud.store_author_works(db_session_test, first.id, "author_works:summary_head", [
+        {"id": "W0", "cited_by_count": 1, "publication_year": 2020}, {"id": "W1", "cited_by_count": 2, "publication_year": 2020}
+    ], 3600)
+    cache_crud.store_author_works(db_session_test, second.id, "author_works:summary_head", [
+        {"id": "W0", "cited_by_count": 1, "publication_year": 2020}, {"id": "W2", "cited_by_count": 3, "publication_year": 2020}
+    ], 3600)
+    bibliometric_service.recompute_bibliometric_summaries(db_session_test, [first.id, second.id])
+    updated_since = mocker.patch.object(bibliometric_service.openalex_service, "get_author_works_updated_since", return_value=[])
+    for researcher in (first, second): # Builds both indices, with the counts they were built from
+        await bibliometric_service.refresh_summary_incrementally(db_session_test, researcher)
+
+    # The first co-author's refresh rewrites the shared copy of W0 before the second one runs
+    updated_since.return_value = [{"id": "W0", "cited_by_count": 50, "publication_year": 2020}]
+    outcomes = [await bibliometric_service.refresh_summary_incrementally(db_session_test, r) for r in (first, second)]
+
+    assert outcomes == ["updated", "updated"]
+    incremental = {s.researcher_id: s.h_index for s in db_session_test.query(models.BibliometricSummary)}
+    bibliometric_service.recompute_bibliometric_summaries(db_session_test, [first.id, second.id])
+    recomputed = {s.researcher_id: s.h_index for s in db_session_test.query(models.BibliometricSummary)}
+    assert incremental == recomputed == {first.id: 2, second.id: 2}
+
+def test_work_map_survives_serialization():
+    index = CitationIndex.from_works([5, None, 12], [2019], ["W1", "W2", "W3"])
+    assert index.update_work("W2", 7) and not index.update_work("W3", 12)
+
+    restored = CitationIndex.from_bytes(index.to_bytes())
+
+    assert restored.work_citations == {"W1": 5, "W2": 7, "W3": 12}
+    assert_matches_full_recompute(restored, [5, 7, 12])
+    assert CitationIndex.from_bytes(CitationIndex.from_works([1]).to_bytes()).work_citations is None
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+
+from services.memory_cache import ParsedPayloadCache
+
+def in_one_hour():
+    return datetime.now(timezone.utc) + timedelta(hours=1)
+
+def test_get_returns_payload_and_entry_id():
+    cache = ParsedPayloadCache(max_bytes=1000)
+    cache.put((1, "author_profile"), {"id": "A1"}, size_bytes=10, expires_at=in_one_hour(), cache_entry_id=7)
+    assert cache.get((1, "author_profile")) == ({"id": "A1"}, 7)
+    assert cache.get((2, "author_profile")) is None
+
+def test_expired_entries_are_dropped():
+    cache = ParsedPayloadCache(max_bytes=1000)
+    # Naive datetimes (as returned by SQLite) are treated as UTC
+    expired = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+    cache.put("k", [1, 2], size_bytes=10, expires_at=expired)
+    assert cache.get("k") is None
+    assert cache.total_bytes == 0
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    cache = ParsedPayloadCache(max_bytes=100)
+    for key in ("a", "b", "c", "d"):
+        cache.put(key, key, size_bytes=25, expires_at=in_one_hour())
+    cache.get("a") # "b" is now the least recently used
+    cache.put("e", "e", size_bytes=25, expires_at=in_one_hour())
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d", "e"))
+    assert cache.total_bytes == 100
+
+def test_oversized_payloads_are_not_cached_and_invalidate_removes():
+    cache = ParsedPayloadCache(max_bytes=100)
+    cache.put("big", "x", size_bytes=26, expires_at=in_one_hour())
+    cache.put("small", "y", size_bytes=5, expires_at=in_one_hour())
+    cache.invalidate("small")
+
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
@@ -0,0 +1,45 @@
+import pytest
+
+from services import metrics
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    """Keeps metrics created by these tests out of the app's registry."""
+    monkeypatch.setattr(metrics, "registry", [])
+
+def test_counter_renders_one_series_per_label_set():
+    counter = metrics.Counter("test_lookups_total", "Lookups.", ("data_type", "result"))
+    counter.inc(data_type="author_works", result="miss")
+    counter.inc(2, data_type="author_works", result="db_hit")
+    counter.inc(data_type='quote"d', result="miss")
+
+    assert counter.render().splitlines() == [
+        "# HELP test_lookups_total Lookups.",
+        "# TYPE test_lookups_total counter",
+        'test_lookups_total{data_type="author_works",result="db_hit"} 2',
+        'test_lookups_total{data_type="author_works",result="miss"} 1',
+        'test_lookups_total{data_type="quote\\"d",result="miss"} 1',
+    ]
+
+def test_counter_rejects_wrong_labels():
+    counter = metrics.Counter("test_total", "Test.", ("endpoint",))
+    with pytest.raises(ValueError):
+        counter.inc(status="200")
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, endpoint="/works")
+
+    samples = histogram.render().splitlines()[2:]
+    assert samples == [
+        'test_seconds_bucket{endpoint="/works",le="0.1"} 1',
+        'test_seconds_bucket{endpoint="/works",le="1"} 3',
+        'test_seconds_bucket{endpoint="/works",le="+Inf"} 4',
+        'test_seconds_sum{endpoint="/works"} 4.25',
+        'test_seconds_count{endpoint="/works"} 4',
+    ]
+
+def test_render_prometheus_joins_registered_metrics():
+    metrics.Gauge("test_bytes", "Bytes.").set(42)
+    assert metrics.render_prometheus() == "# HELP test_bytes Bytes.\n# TYPE test_bytes gauge\ntest_bytes 42\n"
@@ -0,0 +1,124 @@
+import pytest
+import json
+import time
+
+from services import openalex_service
+from services.openalex_backends import CassetteBackend, CassetteMissError, build_backend, create_standin_backend
+from services.rate_limiter import AsyncTokenBucket
+
+AUTHOR_ID = "A1"
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    authors = [
+        {"id": f"https://openalex.org/A{i}", "display_name": f"Author {i}", "works_count": 3, "cited_by_count": 10}
+        for i in range(1, 4)
+    ]
+    works = [
+        {
+            "id": f"https://openalex.org/W{i}",
+            "title": f"Work {i}",
+            "cited_by_count": i,
+            "updated_date": f"2024-01-{i + 1:02d}T00:00:00",
+            "authorships": [{"author": {"id": f"https://openalex.org/{AUTHOR_ID}"}}]
+        }
+        for i in range(1, 31)
+    ]
+    with open(tmp_path / "authors.jsonl", "w") as authors_file:
+        authors_file.writelines(json.dumps(author) + "\n" for author in authors)
+    with open(tmp_path / "works.jsonl", "w") as works_file:
+        works_file.writelines(json.dumps(work) + "\n" for work in works)
+    return str(tmp_path)
+
+@pytest.fixture
+def standin(mocker, fixtures_dir):
+    backend = create_standin_backend(fixtures_dir)
+    mocker.patch('services.openalex_service.client', new=backend)
+    mocker.patch('services.openalex_service.rate_limiter', new=AsyncTokenBucket(rate=10_000))
+    return backend
+
+@pytest.mark.asyncio
+async def test_standin_serves_author_with_select(standin):
+    response = await standin.get("/authors/A2", params={"select": "id,works_count"})
+    assert response.status_code == 200
+    assert response.json() == {"id": "https://openalex.org/A2", "works_count": 3}
+
+    missing = await standin.get("/authors/A9")
+    assert missing.status_code == 404
+
+@pytest.mark.asyncio
+async def test_standin_pages_filters_and_sorts_works(standin):
+    response = await standin.get("/works", params={
+        "filter": f"author.id:{AUTHOR_ID},from_updated_date:2024-01-20",
+        "sort": "cited_by_count:desc", "per_page": 5, "page": 2
+    })
+    data = response.json()
+    assert data["meta"]["count"] == 12 # W19..W30 were updated on or after 2024-01-20
+    assert [work["cited_by_count"] for work in data["results"]] == [25, 24, 23, 22, 21]
+
+@pytest.fixture
+def dated_standin(mocker, tmp_path):
+    """Works of A1 where only the least cited one dates the career, and some works have no year."""
+    works = [{"id": f"https://openalex.org/W{i}", "cited_by_count": 20, "publication_year": 2015} for i in range(20)]
+    works += [{"id": f"https://openalex.org/U{i}", "cited_by_count": 0, "publication_year": None} for i in range(260)]
+    works.append({"id": "https://openalex.org/W-first", "cited_by_count": 0, "publication_year": 1990})
+    for work in works:
+        work["authorships"] = [{"author": {"id": f"https://openalex.org/{AUTHOR_ID}"}}]
+    with open(tmp_path / "works.jsonl", "w") as works_file:
+        works_file.writelines(json.dumps(work) + "\n" for work in works)
+    backend = create_standin_backend(str(tmp_path))
+    mocker.patch('services.openalex_service.client', new=backend)
+    mocker.patch('services.openalex_service.rate_limiter', new=AsyncTokenBucket(rate=10_000))
+    return backend
+
+@pytest.mark.asyncio
+async def test_standin_sorts_missing_values_last(dated_standin):
+    for direction in ("asc", "desc"):
+        response = await dated_standin.get("/works", params={
+            "filter": f"author.id:{AUTHOR_ID}", "sort": f"publication_year:{direction}", "per_page": 200, "cursor": "*"
+        })
+        years = [work["publication_year"] for work in response.json()["results"]]
+        assert years[0] == (1990 if direction == "asc" else 2015)
+        assert years[:21] == sorted(years[:21], reverse=direction == "desc") and None not in years[:21]
+
+@pytest.mark.asyncio
+async def test_citation_head_includes_the_earliest_dated_work(dated_standin):
+    head = await openalex_service.get_author_citation_head_works(AUTHOR_ID, select="id,cited_by_count,publication_year")
+
+    assert len(head) == 201 # One page of the most cited works, then the earliest dated work
+    assert min(work["publication_year"] for work in head if work["publication_year"]) == 1990
+
+@pytest.mark.asyncio
+async def test_service_functions_run_against_standin(standin):
+    paged = await openalex_service.get_author_works_from_openalex(AUTHOR_ID, per_page=7, max_pages=10)
+    streamed = await openalex_service.get_author_works_from_openalex(AUTHOR_ID, per_page=7, max_pages=None)
+    authors = await openalex_service.get_openalex_authors_data_batch(["A1", "A3", "A7"])
+
+    assert [work["id"] for work in paged] == [work["id"] for work in streamed]
+    assert len(paged) == 30
+    assert sorted(authors) == ["A1", "A3"]
+
+@pytest.mark.asyncio
+async def test_standin_injects_latency(fixtures_dir):
+    backend = create_standin_backend(fixtures_dir, latency_seconds=0.05)
+    started = time.monotonic()
+    await backend.get("/authors/A1")
+    assert time.monotonic() - started >= 0.05
+
+@pytest.mark.asyncio
+async def test_cassette_records_then_replays(tmp_path, fixtures_dir):
+    cassette_dir = str(tmp_path / "cassettes")
+    recorder = CassetteBackend(cassette_dir, mode="record", inner=create_standin_backend(fixtures_dir))
+    recorded = await recorder.get("/authors/A1", params={"mailto": "someone@example.com"})
+
+    replayer = CassetteBackend(cassette_dir, mode="replay")
+    replayed = await replayer.get("/authors/A1", params={"mailto": "other@example.com"})
+
+    assert replayed.status_code == recorded.status_code == 200
+    assert replayed.json() == recorded.json()
+    with pytest.raises(CassetteMissError):
+        await replayer.get("/authors/A2")
+
+def test_build_backend_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        build_backend("carrier-pigeon")
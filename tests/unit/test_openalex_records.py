@@ -0,0 +1,58 @@
+import json
+import pytest
+
+from services import openalex_records
+from services.openalex_records import AuthorRecord, ConceptRecord, WorkRecord, YearCountRecord
+
+FULL_WORK = {
+    "id": "https://openalex.org/W1",
+    "cited_by_count": 12,
+    "publication_year": 2021,
+    "title": "Unused",
+    "authorships": [{"author": {"id": "https://openalex.org/A1"}}],
+    "counts_by_year": [{"year": 2023, "cited_by_count": 4}],
+}
+
+@pytest.fixture(params=["msgspec", "json"])
+def decoder(request, monkeypatch):
+    """Runs each test with the typed decoder (when installed) and with the json fallback."""
+    if request.param == "json":
+        monkeypatch.setattr(openalex_records, "msgspec", None)
+    elif openalex_records.msgspec is None:
+        pytest.skip("msgspec is not installed")
+    return request.param
+
+def test_decode_works_keeps_only_declared_fields(decoder):
+    works = openalex_records.decode_works(json.dumps([FULL_WORK, {"id": "https://openalex.org/W2"}]))
+
+    assert works == [
+        WorkRecord(
+            id="https://openalex.org/W1", cited_by_count=12, publication_year=2021,
+            counts_by_year=[YearCountRecord(year=2023, cited_by_count=4)]
+        ),
+        WorkRecord(id="https://openalex.org/W2"),
+    ]
+    assert not hasattr(works[0], "__dict__") # Slotted: no per-record attribute dict
+
+def test_decode_author_builds_concept_records(decoder):
+    author = openalex_records.decode_author(json.dumps({
+        "id": "https://openalex.org/A1", "works_count": 3, "extra": {"nested": [1, 2]},
+        "x_concepts": [{"id": "https://openalex.org/C1", "display_name": "Biology", "level": 0, "score": 51.2, "wikidata": "Q420"}],
+    }))
+
+    assert author.works_count == 3
+    assert author.cited_by_count is None
+    assert author.x_concepts == [ConceptRecord(id="https://openalex.org/C1", display_name="Biology", level=0, score=51.2)]
+
+def test_author_without_concepts_keeps_none(decoder):
+    assert openalex_records.decode_author('{"id": "A1"}').x_concepts is None
+    assert openalex_records.decode_author('{"id": "A1", "x_concepts": []}').x_concepts == []
+
+def test_from_dict_matches_decoder():
+    assert openalex_records.work_from_dict(FULL_WORK) == openalex_records.decode_work(json.dumps(FULL_WORK))
+    assert openalex_records.to_dict(openalex_records.work_from_dict(FULL_WORK)) == {
+        "id": "https://openalex.org/W1", "cited_by_count": 12, "publication_year": 2021,
+        "counts_by_year": [{"year": 2023, "works_count": None, "cited_by_count": 4}]
+    }
+    assert isinstance(openalex_records.author_from_dict({"x_concepts": [{"id": "C1"}]}).x_concepts[0], ConceptRecord)
+    assert isinstance(openalex_records.author_from_dict({"counts_by_year": [{"year": 2024}]}).counts_by_year[0], YearCountRecord)
@@ -0,0 +1,336 @@
+import pytest
+import asyncio
+from unittest.mock import MagicMock
+import httpx
+
+from services import cache_crud, openalex_service
+from services.rate_limiter import AsyncTokenBucket
+
+AUTHOR_ID = "A123"
+
+@pytest.fixture(autouse=True)
+def unthrottled_rate_limiter(mocker):
+    """Keeps the shared OpenAlex rate limiter from slowing these tests down."""
+    mocker.patch('services.openalex_service.rate_limiter', new=AsyncTokenBucket(rate=10_000))
+
+def make_works(count):
+    return [{"id": f"https://openalex.org/W{i}", "cited_by_count": i} for i in range(count)]
+
+class FakeWorksClient:
+    """Serves /works pages from an in-memory list and records the concurrency it saw."""
+    def __init__(self, works, delay=0.01):
+        self.works = works
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, url, params=None):
+        self.calls.append((url, dict(params or {})))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        per_page, page = params['per_page'], params['page']
+        response_mock = MagicMock(spec=httpx.Response)
+        response_mock.status_code = 200
+        response_mock.json.return_value = {
+            "results": self.works[(page - 1) * per_page:page * per_page],
+            "meta": {"count": len(self.works)}
+        }
+        return response_mock
+
+@pytest.mark.asyncio
+async def test_get_author_works_fetches_remaining_pages_concurrently_in_order(mocker):
+    fake_client = FakeWorksClient(make_works(95))
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    works = await openalex_service.get_author_works_from_openalex(
+        AUTHOR_ID, per_page=10, max_pages=20, max_concurrency=4
+    )
+
+    assert [w["id"] for w in works] == [w["id"] for w in make_works(95)]
+    assert len(fake_client.calls) == 10 # ceil(95 / 10) pages, no extra probe for an empty page
+    assert 1 < fake_client.max_in_flight <= 4
+
+@pytest.mark.asyncio
+async def test_get_author_works_respects_max_pages(mocker):
+    fake_client = FakeWorksClient(make_works(95))
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    works = await openalex_service.get_author_works_from_openalex(AUTHOR_ID, per_page=10, max_pages=3)
+
+    assert len(works) == 30
+    assert sorted(params['page'] for _, params in fake_client.calls) == [1, 2, 3]
+
+class FakeCursorClient:
+    """Serves /works through OpenAlex-style cursor paging."""
+    def __init__(self, works):
+        self.works = works
+        self.calls = []
+
+    async def get(self, url, params=None):
+        self.calls.append((url, dict(params or {})))
+        per_page = params['per_page']
+        offset = 0 if params['cursor'] == '*' else int(params['cursor'])
+        works = self.works
+        if params.get('sort'):
+            field, _, direction = params['sort'].partition(':')
+            works = sorted(works, key=lambda work: work[field], reverse=direction == 'desc')
+        page = works[offset:offset + per_page]
+        next_offset = offset + per_page
+        response_mock = MagicMock(spec=httpx.Response)
+        response_mock.status_code = 200
+        response_mock.json.return_value = {
+            "results": page,
+            "meta": {"count": len(self.works), "next_cursor": str(next_offset) if next_offset < len(self.works) else None}
+        }
+        return response_mock
+
+@pytest.mark.asyncio
+async def test_iter_author_works_yields_pages_using_cursor(mocker):
+    fake_client = FakeCursorClient(make_works(450))
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    pages = [page async for page in openalex_service.iter_author_works_from_openalex(
+        f"https://openalex.org/{AUTHOR_ID}", extra_filters=["is_paratext:false"]
+    )]
+
+    assert [len(page) for page in pages] == [200, 200, 50]
+    assert [params['cursor'] for _, params in fake_client.calls] == ['*', '200', '400']
+    assert fake_client.calls[0][1]['filter'] == f'author.id:{AUTHOR_ID},is_paratext:false'
+
+def make_dated_works(citation_counts):
+    return [
+        {"id": f"https://openalex.org/W{i}", "cited_by_count": count, "publication_year": 2000 + i % 20}
+        for i, count in enumerate(citation_counts)
+    ]
+
+@pytest.mark.asyncio
+async def test_citation_head_stops_at_first_page_below_its_rank(mocker):
+    # 1000 works, 100 of them cited 50 times: the first page already ends below rank 200
+    works = make_dated_works([50] * 100 + [1] * 900)
+    fake_client = FakeCursorClient(works)
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    head = await openalex_service.get_author_citation_head_works(AUTHOR_ID, select="id,cited_by_count,publication_year")
+
+    cited_pages = [params for _, params in fake_client.calls if params['sort'] == 'cited_by_count:desc']
+    assert len(cited_pages) == 1 # The 4 remaining pages are never requested
+    assert cited_pages[0]['per_page'] == 200
+    assert cited_pages[0]['select'] == "id,cited_by_count,publication_year"
+    assert min(work["publication_year"] for work in head) == 2000 # Earliest work included for the m-quotient
+
+@pytest.mark.asyncio
+async def test_citation_head_keeps_indices_of_the_full_list(mocker):
+    from services.bibliometric_utils import calculate_citation_metrics
+    counts = [5000, 900] + [300] * 250 + [12] * 300 + [3] * 400 + [0] * 100
+    works = make_dated_works(counts)
+    fake_client = FakeCursorClient(works)
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    head = await openalex_service.get_author_citation_head_works(AUTHOR_ID)
+
+    expected = calculate_citation_metrics(counts)
+    actual = calculate_citation_metrics([work["cited_by_count"] for work in head])
+    for key in ('h_index', 'i10_index', 'g_index'):
+        assert actual[key] == expected[key]
+    assert len(head) < len(works)
+
+@pytest.mark.asyncio
+async def test_get_author_works_without_page_limit_uses_cursor(mocker):
+    fake_client = FakeCursorClient(make_works(30))
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    works = await openalex_service.get_author_works_from_openalex(AUTHOR_ID, per_page=10, max_pages=None)
+
+    assert len(works) == 30
+    assert all('cursor' in params for _, params in fake_client.calls)
+
+@pytest.mark.asyncio
+async def test_get_openalex_authors_data_batch_chunks_or_filters(mocker):
+    calls = []
+
+    async def mock_get(url, params=None):
+        calls.append((url, dict(params)))
+        requested = params['filter'].split(':', 1)[1].split('|')
+        response_mock = MagicMock(spec=httpx.Response)
+        response_mock.status_code = 200
+        response_mock.json.return_value = {
+            "results": [{"id": f"https://openalex.org/{author_id}"} for author_id in requested if author_id != "A7"]
+        }
+        return response_mock
+
+    mocker.patch('services.openalex_service.client', new=MagicMock(get=mock_get))
+    ids = [f"A{i}" for i in range(10)] + ["https://openalex.org/A3"] # Duplicate in URL form
+
+    authors = await openalex_service.get_openalex_authors_data_batch(ids, batch_size=4)
+
+    assert len(calls) == 3 # 10 unique IDs in chunks of 4
+    assert all(url == "/authors" for url, _ in calls)
+    assert calls[0][1]['filter'] == 'openalex_id:A0|A1|A2|A3'
+    assert sorted(authors) == sorted(f"A{i}" for i in range(10) if i != 7)
+
+def test_projection_profiles_map_to_select_and_cache_keys():
+    assert openalex_service.select_fields("summary", "works") == "id,cited_by_count,publication_year"
+    assert openalex_service.select_fields(None, "works") is None
+    assert openalex_service.projected_data_type("author_works", "summary") == "author_works:summary"
+    assert openalex_service.projected_data_type("author_profile", None) == "author_profile"
+    assert openalex_service.citation_head_data_type("summary") == "author_works:summary_head"
+    assert openalex_service.works_list_options("author_works:summary_head") == ("summary", True)
+    assert openalex_service.works_list_options(openalex_service.citation_head_data_type(None)) == (None, True)
+    assert openalex_service.works_list_options("author_works") == (None, False)
+    assert cache_crud.work_projection("author_works:summary_head") == "summary" # Heads share the projection's works
+    with pytest.raises(ValueError):
+        openalex_service.select_fields("concepts", "works")
+
+@pytest.mark.asyncio
+async def test_get_author_works_passes_select(mocker):
+    fake_client = FakeWorksClient(make_works(5))
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    await openalex_service.get_author_works_from_openalex(
+        AUTHOR_ID, select=openalex_service.select_fields("summary", "works")
+    )
+
+    assert fake_client.calls[0][1]['select'] == "id,cited_by_count,publication_year"
+
+def make_response(status_code, payload=None, headers=None):
+    response_mock = MagicMock(spec=httpx.Response)
+    response_mock.status_code = status_code
+    response_mock.headers = httpx.Headers(headers or {})
+    response_mock.json.return_value = payload
+    return response_mock
+
+@pytest.mark.asyncio
+async def test_get_retries_429_honoring_retry_after(mocker):
+    responses = [make_response(429, headers={"Retry-After": "0.05"}), make_response(200, {"ok": True})]
+    mock_get = mocker.AsyncMock(side_effect=responses)
+    mocker.patch('services.openalex_service.client', new=MagicMock(get=mock_get))
+    limiter = AsyncTokenBucket(rate=10_000)
+    mocker.patch('services.openalex_service.rate_limiter', new=limiter)
+    pause = mocker.spy(limiter, 'pause')
+
+    response = await openalex_service._get("/works", params={})
+
+    assert response.status_code == 200
+    assert mock_get.call_count == 2
+    pause.assert_called_once_with(0.05)
+
+@pytest.mark.asyncio
+async def test_get_gives_up_after_max_retries(mocker):
+    mock_get = mocker.AsyncMock(return_value=make_response(503))
+    mocker.patch('services.openalex_service.client', new=MagicMock(get=mock_get))
+    mocker.patch('services.openalex_service.OPENALEX_MAX_RETRIES', 2)
+    mocker.patch('services.openalex_service._backoff_seconds', return_value=0.0)
+
+    response = await openalex_service._get("/works", params={})
+
+    assert response.status_code == 503
+    assert mock_get.call_count == 3
+
+@pytest.mark.asyncio
+async def test_get_does_not_retry_client_errors(mocker):
+    mock_get = mocker.AsyncMock(return_value=make_response(404))
+    mocker.patch('services.openalex_service.client', new=MagicMock(get=mock_get))
+
+    response = await openalex_service._get("/authors/A1", params={})
+
+    assert response.status_code == 404
+    assert mock_get.call_count == 1
+
+def test_retry_after_parsing():
+    assert openalex_service._retry_after_seconds("3") == 3.0
+    assert openalex_service._retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0 # In the past
+    assert openalex_service._retry_after_seconds(None) is None
+    assert openalex_service._retry_after_seconds("soon") is None
+
+def test_merge_works_by_id_replaces_and_appends():
+    cached = [{"id": "W1", "cited_by_count": 1}, {"id": "W2", "cited_by_count": 2}]
+    changed = [{"id": "W2", "cited_by_count": 5}, {"id": "W3", "cited_by_count": 0}]
+
+    merged = openalex_service.merge_works_by_id(cached, changed)
+
+    assert merged == [{"id": "W1", "cited_by_count": 1}, {"id": "W2", "cited_by_count": 5}, {"id": "W3", "cited_by_count": 0}]
+    assert cached[1]["cited_by_count"] == 2 # Input list is left untouched
+
+@pytest.mark.asyncio
+async def test_get_author_works_updated_since_filters_by_update_date(mocker):
+    from datetime import datetime
+    fake_client = FakeCursorClient(make_works(3))
+    mocker.patch('services.openalex_service.client', new=fake_client)
+
+    works = await openalex_service.get_author_works_updated_since(AUTHOR_ID, datetime(2024, 3, 9, 23, 30))
+
+    assert len(works) == 3
+    assert fake_client.calls[0][1]['filter'] == f'author.id:{AUTHOR_ID},from_updated_date:2024-03-09'
+
+@pytest.mark.asyncio
+async def test_stale_profile_is_served_and_refreshed_once_in_background(mocker):
+    researcher = MagicMock(id=1, openalex_id=AUTHOR_ID)
+    mocker.patch('services.cache_crud.get_cached_openalex_payload', return_value=None)
+    mocker.patch('services.cache_crud.get_stale_openalex_payload', return_value=({"id": AUTHOR_ID, "v": "old"}, 5))
+    store = mocker.patch('services.cache_crud.store_openalex_data')
+    background_session = MagicMock()
+    mocker.patch('services.openalex_service._session_factory', return_value=background_session)
+
+    async def fetch_fresh(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return {"id": AUTHOR_ID, "v": "new"}
+    fetch = mocker.patch('services.openalex_service.get_openalex_author_data', side_effect=fetch_fresh)
+
+    request_session = MagicMock()
+    results = await asyncio.gather(*(
+        openalex_service.fetch_and_cache_researcher_openalex_profile(request_session, researcher, allow_stale=True)
+        for _ in range(3)
+    ))
+    assert results == [{"id": AUTHOR_ID, "v": "old"}] * 3
+    assert len(openalex_service.revalidation_tasks) == 1
+
+    await asyncio.gather(*openalex_service.revalidation_tasks)
+    fetch.assert_called_once()
+    assert store.call_args[0][0] is background_session # Written through the task's own session
+    background_session.close.assert_called_once()
+    assert not openalex_service._revalidating_keys
+
+@pytest.mark.asyncio
+async def test_entry_past_max_staleness_is_fetched_in_foreground(mocker):
+    researcher = MagicMock(id=1, openalex_id=AUTHOR_ID)
+    mocker.patch('services.cache_crud.get_cached_openalex_payload', return_value=None)
+    mocker.patch('services.cache_crud.get_stale_openalex_payload', return_value=None)
+    store = mocker.patch('services.cache_crud.store_openalex_data')
+    mocker.patch('services.openalex_service.get_openalex_author_data', return_value={"id": AUTHOR_ID})
+    request_session = MagicMock()
+
+    result = await openalex_service.fetch_and_cache_researcher_openalex_profile(request_session, researcher, allow_stale=True)
+
+    assert result == {"id": AUTHOR_ID}
+    assert store.call_args[0][0] is request_session
+    assert not openalex_service.revalidation_tasks
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_is_contained(mocker):
+    mocker.patch('services.openalex_service._session_factory', return_value=MagicMock())
+
+    async def refresh(db):
+        raise httpx.ConnectError("down")
+
+    assert openalex_service.schedule_revalidation((1, "author_works"), refresh)
+    await asyncio.gather(*openalex_service.revalidation_tasks)
+    assert not openalex_service._revalidating_keys
+
+@pytest.mark.asyncio
+async def test_get_records_latency_and_retries_per_endpoint(mocker):
+    from services import metrics
+    responses = [MagicMock(status_code=503, headers={}), MagicMock(status_code=200, headers={})]
+    mocker.patch('services.openalex_service.client', new=MagicMock(get=mocker.AsyncMock(side_effect=responses)))
+    mocker.patch('services.openalex_service._backoff_seconds', return_value=0)
+    retries_before = metrics.upstream_retries.value(endpoint="/authors/{id}", reason="503")
+    requests_before = metrics.upstream_request_seconds.count(endpoint="/authors/{id}", status="200")
+
+    await openalex_service._get(f"/authors/{AUTHOR_ID}")
+
+    assert metrics.upstream_retries.value(endpoint="/authors/{id}", reason="503") == retries_before + 1
+    assert metrics.upstream_request_seconds.count(endpoint="/authors/{id}", status="200") == requests_before + 1
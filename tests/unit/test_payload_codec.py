@@ -0,0 +1,40 @@
+import json
+import pytest
+
+from services import payload_codec
+from services.payload_codec import decode_payload, encode_payload
+
+LARGE_PAYLOAD = json.dumps([{"id": f"https://openalex.org/W{i}", "cited_by_count": i} for i in range(200)])
+
+@pytest.mark.parametrize("codec", ["zlib", "identity"])
+def test_round_trip(codec):
+    stored, used_codec = encode_payload(LARGE_PAYLOAD, codec)
+    assert used_codec == codec
+    assert decode_payload(stored, used_codec) == LARGE_PAYLOAD
+
+def test_preferred_codec_compresses_large_payloads():
+    stored, codec = encode_payload(LARGE_PAYLOAD)
+    assert codec == payload_codec.preferred_codec()
+    assert len(stored) < len(LARGE_PAYLOAD) / 4
+    assert decode_payload(stored, codec) == LARGE_PAYLOAD
+
+def test_small_payloads_are_stored_uncompressed():
+    stored, codec = encode_payload('{"id": "A1"}')
+    assert codec == "identity"
+    assert stored == b'{"id": "A1"}'
+
+def test_decode_accepts_legacy_text_rows():
+    assert decode_payload('{"id": "A1"}', "identity") == '{"id": "A1"}'
+    assert decode_payload('{"id": "A1"}', None) == '{"id": "A1"}'
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        encode_payload(LARGE_PAYLOAD, "brotli")
+    with pytest.raises(ValueError):
+        decode_payload(b"", "brotli")
+
+def test_zstd_payload_without_zstandard_raises(monkeypatch):
+    monkeypatch.setattr(payload_codec, "zstandard", None)
+    assert payload_codec.preferred_codec() == "zlib"
+    with pytest.raises(RuntimeError):
+        decode_payload(b"\x28\xb5\x2f\xfd", "zstd")
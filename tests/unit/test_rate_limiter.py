@@ -0,0 +1,30 @@
+import pytest
+import time
+
+from services.rate_limiter import AsyncTokenBucket
+
+def test_reserve_allows_burst_then_spaces_requests():
+    bucket = AsyncTokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # Third and fourth callers queue behind each other at 1 / rate spacing
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+def test_pause_delays_next_reservation():
+    bucket = AsyncTokenBucket(rate=10, capacity=10)
+    bucket.pause(1.0)
+    assert bucket.reserve() == pytest.approx(1.1, abs=0.01)
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncTokenBucket(rate=0)
+
+@pytest.mark.asyncio
+async def test_acquire_enforces_rate():
+    bucket = AsyncTokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    # One token up front, then five more at 50 per second
+    assert time.monotonic() - started >= 0.09
@@ -0,0 +1,53 @@
+import pytest
+import asyncio
+
+from services.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_with_same_key_share_one_execution():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(single_flight.do(("r1", "author_profile"), fetch) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert not single_flight.is_in_flight(("r1", "author_profile"))
+
+@pytest.mark.asyncio
+async def test_different_keys_run_independently():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: fetch("a")),
+        single_flight.do("b", lambda: fetch("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_key_released():
+    single_flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        single_flight.do("k", failing), single_flight.do("k", failing), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await single_flight.do("k", lambda: asyncio.sleep(0, result="ok")) == "ok"
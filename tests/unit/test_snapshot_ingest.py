@@ -0,0 +1,65 @@
+import gzip
+import json
+
+from services import snapshot_ingest
+
+def write_partition(path, records):
+    with gzip.open(path, "wt", encoding="utf-8") as partition:
+        for record in records:
+            partition.write(json.dumps(record) + "\n")
+
+def work(work_id, author_ids, cited_by_count, updated_date):
+    return {
+        "id": f"https://openalex.org/{work_id}",
+        "cited_by_count": cited_by_count,
+        "updated_date": updated_date,
+        "authorships": [{"author": {"id": f"https://openalex.org/{author_id}"}} for author_id in author_ids]
+    }
+
+def test_filter_partition_spills_matching_works_per_researcher_and_keeps_latest(tmp_path):
+    snapshot_ingest._init_worker({"A1": 1, "A2": 2})
+    write_partition(tmp_path / "old.gz", [work("W1", ["A1", "A2"], 3, "2024-01-01"), work("W2", ["A9"], 50, "2024-01-01")])
+    write_partition(tmp_path / "new.gz", [work("W1", ["A1", "A2"], 7, "2024-02-01")])
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+
+    written = [
+        snapshot_ingest.filter_partition(("works", index, str(tmp_path / name), str(spill_dir), 2))
+        for index, name in enumerate(["old.gz", "new.gz"])
+    ]
+
+    assert written == [2, 2] # W1 once per co-author in each partition; W2 has none of our authors
+    bucket_of_researcher_1 = list(snapshot_ingest.iter_bucket(str(spill_dir), 1))
+    assert [researcher_id for researcher_id, _, _ in bucket_of_researcher_1] == [1]
+    _, authors, works = bucket_of_researcher_1[0]
+    assert authors == {}
+    assert works["https://openalex.org/W1"]["cited_by_count"] == 7
+
+def test_iter_bucket_yields_researchers_in_order_across_spill_files(tmp_path):
+    snapshot_ingest._init_worker({f"A{i}": i for i in range(1, 7)})
+    write_partition(tmp_path / "p0.gz", [work("W1", ["A5", "A1"], 1, "2024-01-01"), work("W2", ["A3"], 2, "2024-01-01")])
+    write_partition(tmp_path / "p1.gz", [work("W3", ["A3", "A6"], 3, "2024-01-01"), work("W4", ["A1"], 4, "2024-01-01")])
+    authors_path = tmp_path / "authors.gz"
+    write_partition(authors_path, [{"id": "https://openalex.org/A3", "works_count": 2}])
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    for index, name in enumerate(["p0.gz", "p1.gz"]):
+        snapshot_ingest.filter_partition(("works", index, str(tmp_path / name), str(spill_dir), 2))
+    snapshot_ingest.filter_partition(("authors", 0, str(authors_path), str(spill_dir), 2))
+
+    grouped = {
+        researcher_id: (sorted(authors), sorted(works))
+        for researcher_id, authors, works in snapshot_ingest.iter_bucket(str(spill_dir), 1)
+    }
+
+    assert list(grouped) == [1, 3, 5] # One group per researcher, in ID order
+    assert grouped[1] == ([], ["https://openalex.org/W1", "https://openalex.org/W4"])
+    assert grouped[3] == (["https://openalex.org/A3"], ["https://openalex.org/W2", "https://openalex.org/W3"])
+
+def test_find_partitions_accepts_snapshot_root(tmp_path):
+    partition_dir = tmp_path / "data" / "authors" / "updated_date=2024-01-01"
+    partition_dir.mkdir(parents=True)
+    write_partition(partition_dir / "part_000.gz", [])
+
+    assert snapshot_ingest.find_partitions(str(tmp_path), "authors") == [str(partition_dir / "part_000.gz")]
+    assert snapshot_ingest.find_partitions(str(tmp_path), "works") == []
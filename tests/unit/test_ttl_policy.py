@@ -0,0 +1,52 @@
+import json
+from datetime import timezone
+
+from database import models
+from services import cache_crud
+from services.ttl_policy import TTLPolicy, next_refresh_streak, parse_ttl_overrides
+
+def make_researcher(db, index):
+    user = models.User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name=str(index), openalex_id=f"A{index}")
+    db.add(researcher)
+    db.commit()
+    return researcher
+
+def test_base_ttl_falls_back_from_projected_to_unprojected_type():
+    policy = TTLPolicy(86400, parse_ttl_overrides("author_profile=604800, author_works:summary=3600"))
+
+    assert policy.ttl_for("author_profile:concepts") == 604800
+    assert policy.ttl_for("author_works:summary") == 3600
+    assert policy.ttl_for("author_works") == 86400
+
+def test_refresh_streak_counts_consecutive_unchanged_or_changed_refreshes():
+    assert next_refresh_streak(None, "a", 5) == 0
+    assert next_refresh_streak("a", "a", 0) == 1
+    assert next_refresh_streak("a", "a", 2) == 3
+    assert next_refresh_streak("a", "b", 3) == -1
+    assert next_refresh_streak("a", "b", -1) == -2
+
+def test_adaptive_ttl_grows_for_stable_payloads_and_shrinks_for_changing_ones():
+    policy = TTLPolicy(86400, adaptive=True, min_seconds=3600, max_seconds=4 * 86400, stable_after=2, factor=2)
+
+    assert [policy.ttl_for("author_profile", streak) for streak in (0, 1, 2, 3, 4)] == [
+        86400, 86400, 2 * 86400, 4 * 86400, 4 * 86400
+    ]
+    assert [policy.ttl_for("author_profile", streak) for streak in (-1, -2, -10)] == [43200, 21600, 3600]
+    assert TTLPolicy(86400, stable_after=2).ttl_for("author_profile", 5) == 86400 # Not adaptive
+
+def test_store_tracks_payload_hash_and_extends_ttl(db_session_test, mocker):
+    mocker.patch.object(cache_crud, "ttl_policy", TTLPolicy(1000, adaptive=True, min_seconds=10, max_seconds=10000, stable_after=1))
+    researcher = make_researcher(db_session_test, 1)
+
+    def store(data):
+        entry = cache_crud.store_openalex_data(db_session_test, researcher.id, "author_profile", json.dumps(data))
+        ttl = (entry.expires_at - entry.fetched_at).total_seconds()
+        return entry.refresh_streak, round(ttl)
+
+    assert store({"v": 1}) == (0, 1000)
+    assert store({"v": 1}) == (1, 2000)
+    assert store({"v": 1}) == (2, 4000)
+    assert store({"v": 2}) == (-1, 500)
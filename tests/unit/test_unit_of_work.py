@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import pytest
+
+from database import models
+from services import cache_crud, unit_of_work
+
+def make_researcher(db, index):
+    user = models.User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name=str(index), openalex_id=f"A{index}")
+    db.add(researcher)
+    db.commit()
+    return researcher
+
+def test_payload_is_read_once_per_unit_of_work(db_session_test, mocker):
+    researcher = make_researcher(db_session_test, 1)
+    entry = cache_crud.store_openalex_data(db_session_test, researcher.id, "author_profile", json.dumps({"id": "A1"}), 3600)
+    cache_crud.memory_cache.invalidate((researcher.id, "author_profile"))
+    read_row = mocker.spy(cache_crud, "get_cached_openalex_data")
+
+    with unit_of_work.unit_of_work():
+        first = cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_profile")
+        second = cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_profile")
+        assert cache_crud.get_cache_entry_id(db_session_test, researcher.id, "author_profile") == entry.id
+
+    assert first == second == ({"id": "A1"}, entry.id)
+    assert first[0] is second[0]
+    assert read_row.call_count == 1
+
+def test_writes_replace_the_memoized_payload(db_session_test):
+    researcher = make_researcher(db_session_test, 1)
+    cache_crud.store_openalex_data(db_session_test, researcher.id, "author_profile", json.dumps({"v": 1}), 3600)
+
+    with unit_of_work.unit_of_work():
+        assert cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_profile")[0] == {"v": 1}
+        cache_crud.store_openalex_data(db_session_test, researcher.id, "author_profile", json.dumps({"v": 2}), 3600)
+        assert cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_profile")[0] == {"v": 2}
+
+@pytest.mark.asyncio
+async def test_concurrent_units_of_work_are_isolated():
+    async def operation(researcher_id):
+        with unit_of_work.unit_of_work():
+            unit_of_work.remember(researcher_id, "author_profile", {"id": researcher_id}, None)
+            await asyncio.sleep(0)
+            return unit_of_work.recall(1, "author_profile"), unit_of_work.recall(2, "author_profile")
+
+    first, second = await asyncio.gather(operation(1), operation(2))
+
+    assert first == (({"id": 1}, None), None)
+    assert second == (None, ({"id": 2}, None))
+    assert unit_of_work.recall(1, "author_profile") is None
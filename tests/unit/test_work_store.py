@@ -0,0 +1,58 @@
+import json
+
+from database import models
+from services import cache_crud, cache_maintenance
+from services.openalex_records import WorkRecord
+
+def make_researcher(db, index):
+    user = models.User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    researcher = models.Researcher(user_id=user.id, first_name="R", last_name=str(index), openalex_id=f"A{index}")
+    db.add(researcher)
+    db.commit()
+    return researcher
+
+def work(work_id, cited_by_count):
+    return {"id": f"https://openalex.org/{work_id}", "cited_by_count": cited_by_count}
+
+def test_co_authored_works_are_stored_once_and_shared(db_session_test):
+    alice, bob = make_researcher(db_session_test, 1), make_researcher(db_session_test, 2)
+    cache_crud.store_author_works(db_session_test, alice.id, "author_works:summary", [work("W1", 3), work("W2", 5)], 3600)
+    cache_crud.store_author_works(db_session_test, bob.id, "author_works:summary", [work("W2", 5)], 3600)
+
+    assert db_session_test.query(models.OpenAlexWork).count() == 2
+    alice_works, _ = cache_crud.get_cached_openalex_payload(db_session_test, alice.id, "author_works:summary")
+    bob_works, _ = cache_crud.get_cached_openalex_payload(db_session_test, bob.id, "author_works:summary")
+    assert alice_works == [WorkRecord(**work("W1", 3)), WorkRecord(**work("W2", 5))] # Projected works decode to records
+    assert bob_works[0] is alice_works[1] # One parsed copy in memory
+
+    # Refreshing Bob's list updates the shared work for Alice too
+    cache_crud.store_author_works(db_session_test, bob.id, "author_works:summary", [work("W2", 8)], 3600)
+    alice_works, _ = cache_crud.get_cached_openalex_payload(db_session_test, alice.id, "author_works:summary")
+    assert alice_works[1].cited_by_count == 8
+
+def test_lists_written_before_the_work_store_are_read_inline(db_session_test):
+    researcher = make_researcher(db_session_test, 1)
+    cache_crud.store_openalex_data(db_session_test, researcher.id, "author_works", json.dumps([work("W1", 3)]), 3600)
+
+    assert cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_works")[0] == [work("W1", 3)]
+
+def test_missing_work_turns_the_list_into_a_cache_miss(db_session_test):
+    researcher = make_researcher(db_session_test, 1)
+    cache_crud.store_author_works(db_session_test, researcher.id, "author_works", [work("W1", 3)], 3600)
+    db_session_test.query(models.OpenAlexWork).delete()
+    db_session_test.commit()
+    cache_crud.memory_cache.clear()
+
+    assert cache_crud.get_cached_openalex_payload(db_session_test, researcher.id, "author_works") is None
+
+def test_sweeper_deletes_works_no_list_references(db_session_test):
+    researcher = make_researcher(db_session_test, 1)
+    cache_crud.store_author_works(db_session_test, researcher.id, "author_works", [work("W1", 3), work("W2", 5)], 3600)
+    cache_crud.store_author_works(db_session_test, researcher.id, "author_works", [work("W2", 5)], 3600)
+
+    deleted = cache_maintenance.delete_unreferenced_works(db_session_test)
+
+    assert deleted == 1
+    assert [w.work_id for w in db_session_test.query(models.OpenAlexWork)] == ["https://openalex.org/W2"]